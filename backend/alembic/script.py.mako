@@ -9,6 +9,8 @@ from typing import Sequence, Union
 
 from alembic import op
 import sqlalchemy as sa
+## Autogenerated columns use sqlmodel types; drop the import from hand-written revisions.
+import sqlmodel
 ${imports if imports else ""}
 
 # revision identifiers, used by Alembic.
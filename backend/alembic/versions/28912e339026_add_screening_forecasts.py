@@ -0,0 +1,42 @@
+"""Add screening forecasts
+
+Cached seat forecasts per upcoming screening, rewritten by the forecast job,
+and the FORECAST pricing rule kind that reads them.
+
+Revision ID: 28912e339026
+Revises: 7c818c330321
+Create Date: 2026-10-19 12:14:15.569669
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '28912e339026'
+down_revision: Union[str, Sequence[str], None] = '7c818c330321'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('screeningforecast',
+    sa.Column('screening_id', sa.Integer(), nullable=False),
+    sa.Column('capacity', sa.Integer(), nullable=False),
+    sa.Column('forecast_seats', sa.Float(), nullable=False),
+    sa.Column('fill_rate', sa.Float(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['screening_id'], ['screening.id'], ),
+    sa.PrimaryKeyConstraint('screening_id')
+    )
+    op.execute("ALTER TYPE pricingrulekind ADD VALUE IF NOT EXISTS 'FORECAST'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('screeningforecast')
+    # Postgres cannot drop an enum value; the unused FORECAST label is left in place.
+    op.execute("DELETE FROM pricingrule WHERE kind = 'FORECAST'")
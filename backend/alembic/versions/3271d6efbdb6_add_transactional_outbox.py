@@ -0,0 +1,46 @@
+"""Add transactional outbox
+
+Messages written in the same transaction as the change they announce (ticket
+issuance for new bookings). The partial index keeps batch claims to pending rows.
+
+Revision ID: 3271d6efbdb6
+Revises: a4f9b8165669
+Create Date: 2026-10-19 11:59:00.902495
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '3271d6efbdb6'
+down_revision: Union[str, Sequence[str], None] = 'a4f9b8165669'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('outboxmessage',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('topic', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'PROCESSED', 'FAILED', name='outboxstatus'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('last_error', sqlmodel.sql.sqltypes.AutoString(length=1000), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('available_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_outbox_pending', 'outboxmessage', ['available_at', 'id'], unique=False, postgresql_where=sa.text("status = 'PENDING'"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_outbox_pending', table_name='outboxmessage', postgresql_where=sa.text("status = 'PENDING'"))
+    op.drop_table('outboxmessage')
+    sa.Enum(name='outboxstatus').drop(op.get_bind(), checkfirst=True)
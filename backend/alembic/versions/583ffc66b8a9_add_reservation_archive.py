@@ -0,0 +1,66 @@
+"""Add reservation archive
+
+Cold copies of reservation and reservationseat for screenings that are over,
+filled by app.services.archive.ReservationArchiver. The tables are new and
+empty, so their indexes are built inline.
+
+Revision ID: 583ffc66b8a9
+Revises: 5f9aeb3f4331
+Create Date: 2026-10-19 11:32:32.557854
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '583ffc66b8a9'
+down_revision: Union[str, Sequence[str], None] = '5f9aeb3f4331'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The enum type already exists; the archive shares it with reservation.
+    status = postgresql.ENUM('BOOKED', 'CANCELLED', 'COMPLETED', 'EXPIRED', name='reservationstatus', create_type=False)
+    op.create_table('reservationarchive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('status', status, nullable=False),
+    sa.Column('total_price', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('screening_id', sa.Integer(), nullable=False),
+    sa.Column('cancelled_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('booking_reference', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=True),
+    sa.Column('notes', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+    sa.Column('archived_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['screening_id'], ['screening.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('booking_reference')
+    )
+    op.create_index('idx_reservation_archive_user_created', 'reservationarchive', ['user_id', 'created_at'], unique=False)
+    op.create_index(op.f('ix_reservationarchive_screening_id'), 'reservationarchive', ['screening_id'], unique=False)
+    op.create_table('reservationseatarchive',
+    sa.Column('reservation_id', sa.Integer(), nullable=False),
+    sa.Column('seat_id', sa.Integer(), nullable=False),
+    sa.Column('price_paid', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['reservation_id'], ['reservationarchive.id'], ),
+    sa.ForeignKeyConstraint(['seat_id'], ['seat.id'], ),
+    sa.PrimaryKeyConstraint('reservation_id', 'seat_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('reservationseatarchive')
+    op.drop_index(op.f('ix_reservationarchive_screening_id'), table_name='reservationarchive')
+    op.drop_index('idx_reservation_archive_user_created', table_name='reservationarchive')
+    op.drop_table('reservationarchive')
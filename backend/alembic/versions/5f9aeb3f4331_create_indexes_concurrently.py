@@ -0,0 +1,80 @@
+"""Create indexes concurrently
+
+Every secondary index from app/models/database.py, built with
+CREATE INDEX CONCURRENTLY so writes are not blocked while they build.
+Concurrent builds cannot run inside a transaction, hence the autocommit block.
+If a build is interrupted it leaves an INVALID index behind; drop it and rerun.
+
+Revision ID: 5f9aeb3f4331
+Revises: f721c32e3c58
+Create Date: 2026-10-19 11:31:47.530218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f9aeb3f4331'
+down_revision: Union[str, Sequence[str], None] = 'f721c32e3c58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES: list[tuple[str, str, list[str]]] = [
+    ('ix_genre_is_active', 'genre', ['is_active']),
+    ('idx_movie_title', 'movie', ['title']),
+    ('ix_movie_is_active', 'movie', ['is_active']),
+    ('idx_pricing_rule_kind_active', 'pricingrule', ['kind', 'is_active']),
+    ('ix_pricingrule_is_active', 'pricingrule', ['is_active']),
+    ('ix_pricingrule_kind', 'pricingrule', ['kind']),
+    ('idx_theatre_name', 'theatre', ['name']),
+    ('ix_theatre_is_active', 'theatre', ['is_active']),
+    ('idx_user_email_active', 'user', ['email', 'is_active']),
+    ('idx_user_username_active', 'user', ['username', 'is_active']),
+    ('ix_user_is_active', 'user', ['is_active']),
+    ('ix_user_role', 'user', ['role']),
+    ('idx_auditorium_theatre', 'auditorium', ['theatre_id']),
+    ('ix_auditorium_is_active', 'auditorium', ['is_active']),
+    ('ix_auditorium_theatre_id', 'auditorium', ['theatre_id']),
+    ('idx_revenue_rollup_movie_day', 'revenuerollup', ['movie_id', 'day']),
+    ('idx_revenue_rollup_theatre_day', 'revenuerollup', ['theatre_id', 'day']),
+    ('idx_screening_auditorium_time', 'screening', ['auditorium_id', 'start_time', 'end_time']),
+    ('idx_screening_movie_time', 'screening', ['movie_id', 'start_time']),
+    ('idx_screening_start_time', 'screening', ['start_time']),
+    ('ix_screening_auditorium_id', 'screening', ['auditorium_id']),
+    ('ix_screening_is_active', 'screening', ['is_active']),
+    ('ix_screening_movie_id', 'screening', ['movie_id']),
+    ('ix_screening_start_time', 'screening', ['start_time']),
+    ('idx_seat_auditorium', 'seat', ['auditorium_id']),
+    ('ix_seat_auditorium_id', 'seat', ['auditorium_id']),
+    ('ix_seat_is_active', 'seat', ['is_active']),
+    ('idx_reservation_screening', 'reservation', ['screening_id']),
+    ('idx_reservation_status', 'reservation', ['status']),
+    ('idx_reservation_user_status', 'reservation', ['user_id', 'status']),
+    ('ix_reservation_screening_id', 'reservation', ['screening_id']),
+    ('ix_reservation_status', 'reservation', ['status']),
+    ('ix_reservation_user_id', 'reservation', ['user_id']),
+    ('idx_reservation_seat_reservation', 'reservationseat', ['reservation_id']),
+    ('idx_reservation_seat_seat', 'reservationseat', ['seat_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name, table, columns,
+                unique=False,
+                if_not_exists=True,
+                postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,42 @@
+"""Add theatre location
+
+Optional latitude/longitude per theatre for nearest-theatre search. The
+in-memory index serves queries; the (latitude, longitude) index backs the
+bounding-box fallback.
+
+Revision ID: 7c818c330321
+Revises: 3271d6efbdb6
+Create Date: 2026-10-19 12:07:20.315055
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c818c330321'
+down_revision: Union[str, Sequence[str], None] = '3271d6efbdb6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('theatre', sa.Column('latitude', sa.Float(), nullable=True))
+    op.add_column('theatre', sa.Column('longitude', sa.Float(), nullable=True))
+    op.create_check_constraint('chk_theatre_latitude', 'theatre', 'latitude BETWEEN -90 AND 90')
+    op.create_check_constraint('chk_theatre_longitude', 'theatre', 'longitude BETWEEN -180 AND 180')
+    op.create_check_constraint('chk_theatre_location_complete', 'theatre', '(latitude IS NULL) = (longitude IS NULL)')
+    op.create_index('idx_theatre_location', 'theatre', ['latitude', 'longitude'], unique=False, postgresql_where=sa.text('latitude IS NOT NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_theatre_location', table_name='theatre', postgresql_where=sa.text('latitude IS NOT NULL'))
+    op.drop_constraint('chk_theatre_location_complete', 'theatre', type_='check')
+    op.drop_constraint('chk_theatre_longitude', 'theatre', type_='check')
+    op.drop_constraint('chk_theatre_latitude', 'theatre', type_='check')
+    op.drop_column('theatre', 'longitude')
+    op.drop_column('theatre', 'latitude')
@@ -0,0 +1,38 @@
+"""Add movie recommendations
+
+Precomputed similar movies per movie. Existing catalogs start empty; fill
+them once with POST /api/movies/similar/rebuild after upgrading.
+
+Revision ID: 855971c39a22
+Revises: bf1b07622684
+Create Date: 2026-10-19 11:36:00.520176
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '855971c39a22'
+down_revision: Union[str, Sequence[str], None] = 'bf1b07622684'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('movierecommendation',
+    sa.Column('movie_id', sa.Integer(), nullable=False),
+    sa.Column('similar_movie_ids', sa.ARRAY(sa.Integer()), nullable=False),
+    sa.Column('scores', sa.ARRAY(sa.Float()), nullable=False),
+    sa.Column('computed_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['movie_id'], ['movie.id'], ),
+    sa.PrimaryKeyConstraint('movie_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('movierecommendation')
@@ -0,0 +1,42 @@
+"""Store idempotency keys
+
+Idempotency-Key results, shared by every worker and kept across restarts;
+expired rows are purged by the idempotency_keys job.
+
+Revision ID: 90dcf2d5de5a
+Revises: 28912e339026
+Create Date: 2026-10-19 12:35:30.894586
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '90dcf2d5de5a'
+down_revision: Union[str, Sequence[str], None] = '28912e339026'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('idempotencykey',
+    sa.Column('scope', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('key', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('fingerprint', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('booking_reference', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('scope', 'key')
+    )
+    op.create_index(op.f('ix_idempotencykey_expires_at'), 'idempotencykey', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_idempotencykey_expires_at'), table_name='idempotencykey')
+    op.drop_table('idempotencykey')
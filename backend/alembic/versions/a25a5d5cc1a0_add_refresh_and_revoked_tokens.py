@@ -0,0 +1,59 @@
+"""Add refresh and revoked tokens
+
+Refresh tokens (hashed, grouped into rotation families) and the revocation
+list that backs logout and per-user token revocation.
+
+Revision ID: a25a5d5cc1a0
+Revises: 855971c39a22
+Create Date: 2026-10-19 11:40:15.702675
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a25a5d5cc1a0'
+down_revision: Union[str, Sequence[str], None] = '855971c39a22'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('revokedtoken',
+    sa.Column('key', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('revoked_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(op.f('ix_revokedtoken_expires_at'), 'revokedtoken', ['expires_at'], unique=False)
+    op.create_table('refreshtoken',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('token_hash', sqlmodel.sql.sqltypes.AutoString(length=64), nullable=False),
+    sa.Column('family_id', sqlmodel.sql.sqltypes.AutoString(length=32), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('used_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('revoked_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('token_hash')
+    )
+    op.create_index(op.f('ix_refreshtoken_family_id'), 'refreshtoken', ['family_id'], unique=False)
+    op.create_index(op.f('ix_refreshtoken_user_id'), 'refreshtoken', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_refreshtoken_user_id'), table_name='refreshtoken')
+    op.drop_index(op.f('ix_refreshtoken_family_id'), table_name='refreshtoken')
+    op.drop_table('refreshtoken')
+    op.drop_index(op.f('ix_revokedtoken_expires_at'), table_name='revokedtoken')
+    op.drop_table('revokedtoken')
@@ -0,0 +1,58 @@
+"""Add waitlist
+
+Per-screening FIFO waitlist. Partial indexes keep the queue scans to waiting
+entries and the hold sweep to offered ones, however many rows pile up.
+
+Revision ID: a4f9b8165669
+Revises: a25a5d5cc1a0
+Create Date: 2026-10-19 11:49:22.598346
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4f9b8165669'
+down_revision: Union[str, Sequence[str], None] = 'a25a5d5cc1a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('waitlistentry',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('screening_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('seats_requested', sa.Integer(), nullable=False),
+    sa.Column('status', sa.Enum('WAITING', 'OFFERED', 'CLAIMED', 'EXPIRED', 'LEFT', name='waitliststatus'), nullable=False),
+    sa.Column('held_seat_ids', sa.ARRAY(sa.Integer()), nullable=False),
+    sa.Column('offered_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('hold_expires_at', sa.DateTime(timezone=True), nullable=True),
+    sa.CheckConstraint('seats_requested > 0', name='chk_waitlist_seats_positive'),
+    sa.ForeignKeyConstraint(['screening_id'], ['screening.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_waitlist_hold_expiry', 'waitlistentry', ['hold_expires_at'], unique=False, postgresql_where=sa.text("status = 'OFFERED'"))
+    op.create_index('idx_waitlist_queue', 'waitlistentry', ['screening_id', 'id'], unique=False, postgresql_where=sa.text("status = 'WAITING'"))
+    op.create_index('idx_waitlist_queue_size', 'waitlistentry', ['screening_id', 'seats_requested', 'id'], unique=False, postgresql_where=sa.text("status = 'WAITING'"))
+    op.create_index(op.f('ix_waitlistentry_user_id'), 'waitlistentry', ['user_id'], unique=False)
+    op.create_index('uq_waitlist_active_user', 'waitlistentry', ['screening_id', 'user_id'], unique=True, postgresql_where=sa.text("status IN ('WAITING', 'OFFERED')"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_waitlist_active_user', table_name='waitlistentry', postgresql_where=sa.text("status IN ('WAITING', 'OFFERED')"))
+    op.drop_index(op.f('ix_waitlistentry_user_id'), table_name='waitlistentry')
+    op.drop_index('idx_waitlist_queue_size', table_name='waitlistentry', postgresql_where=sa.text("status = 'WAITING'"))
+    op.drop_index('idx_waitlist_queue', table_name='waitlistentry', postgresql_where=sa.text("status = 'WAITING'"))
+    op.drop_index('idx_waitlist_hold_expiry', table_name='waitlistentry', postgresql_where=sa.text("status = 'OFFERED'"))
+    op.drop_table('waitlistentry')
+    sa.Enum(name='waitliststatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,45 @@
+"""Add reservation history index
+
+Replaces idx_reservation_user_status with (user_id, status, created_at, id),
+which serves keyset pagination of a user's history from the index alone.
+The old index is a prefix of the new one, so nothing loses its access path.
+
+Revision ID: bf1b07622684
+Revises: 583ffc66b8a9
+Create Date: 2026-10-19 11:34:01.655625
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'bf1b07622684'
+down_revision: Union[str, Sequence[str], None] = '583ffc66b8a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_reservation_user_status_created', 'reservation', ['user_id', 'status', 'created_at', 'id'],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True
+        )
+        op.drop_index('idx_reservation_user_status', table_name='reservation', if_exists=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_reservation_user_status', 'reservation', ['user_id', 'status'],
+            unique=False,
+            if_not_exists=True,
+            postgresql_concurrently=True
+        )
+        op.drop_index('idx_reservation_user_status_created', table_name='reservation', if_exists=True, postgresql_concurrently=True)
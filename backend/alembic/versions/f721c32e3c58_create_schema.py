@@ -0,0 +1,193 @@
+"""Create schema
+
+Tables, keys, unique and check constraints. Secondary indexes are built
+online in the next revision.
+
+Revision ID: f721c32e3c58
+Revises: a9bebf5f7f51
+Create Date: 2026-10-19 11:30:02.114873
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f721c32e3c58'
+down_revision: Union[str, Sequence[str], None] = 'a9bebf5f7f51'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _base_columns() -> list[sa.Column]:
+    return [
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(timezone=True), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(sa.schema.CreateSequence(sa.Sequence('booking_reference_block_seq')))
+
+    op.create_table('genre',
+    *_base_columns(),
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('movie',
+    *_base_columns(),
+    sa.Column('title', sqlmodel.sql.sqltypes.AutoString(length=200), nullable=False),
+    sa.Column('description', sqlmodel.sql.sqltypes.AutoString(length=2000), nullable=False),
+    sa.Column('duration_minutes', sa.Integer(), nullable=False),
+    sa.Column('poster_url', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.CheckConstraint('duration_minutes > 0', name='chk_movie_duration_positive'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('pricingrule',
+    *_base_columns(),
+    sa.Column('kind', sa.Enum('SEAT_TYPE', 'HOUR', 'WEEKDAY', 'OCCUPANCY', name='pricingrulekind'), nullable=False),
+    sa.Column('key', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+    sa.Column('multiplier', sa.Numeric(precision=6, scale=3), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.CheckConstraint('multiplier > 0', name='chk_pricing_rule_multiplier_positive'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('theatre',
+    *_base_columns(),
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(length=200), nullable=False),
+    sa.Column('address', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('user',
+    *_base_columns(),
+    sa.Column('username', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+    sa.Column('email', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('hashed_password', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('role', sa.Enum('USER', 'ADMIN', name='userrole'), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # Unique indexes enforce uniqueness, so they belong with the tables.
+    op.create_index(op.f('ix_user_email'), 'user', ['email'], unique=True)
+    op.create_index(op.f('ix_user_username'), 'user', ['username'], unique=True)
+    op.create_table('auditorium',
+    *_base_columns(),
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('capacity', sa.Integer(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('theatre_id', sa.Integer(), nullable=False),
+    sa.CheckConstraint('capacity >= 0', name='chk_auditorium_capacity_non_negative'),
+    sa.ForeignKeyConstraint(['theatre_id'], ['theatre.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('theatre_id', 'name', name='uq_auditorium_theatre_name')
+    )
+    op.create_table('moviegenre',
+    sa.Column('movie_id', sa.Integer(), nullable=False),
+    sa.Column('genre_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['genre_id'], ['genre.id'], ),
+    sa.ForeignKeyConstraint(['movie_id'], ['movie.id'], ),
+    sa.PrimaryKeyConstraint('movie_id', 'genre_id')
+    )
+    op.create_table('revenuerollup',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('movie_id', sa.Integer(), nullable=False),
+    sa.Column('theatre_id', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.Column('tickets_sold', sa.Integer(), nullable=False),
+    sa.Column('reservation_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['movie_id'], ['movie.id'], ),
+    sa.ForeignKeyConstraint(['theatre_id'], ['theatre.id'], ),
+    sa.PrimaryKeyConstraint('day', 'movie_id', 'theatre_id')
+    )
+    op.create_table('screening',
+    *_base_columns(),
+    sa.Column('movie_id', sa.Integer(), nullable=False),
+    sa.Column('auditorium_id', sa.Integer(), nullable=False),
+    sa.Column('start_time', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('end_time', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('base_price', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('available_seats', sa.Integer(), nullable=False),
+    sa.CheckConstraint('base_price > 0', name='chk_screening_price_positive'),
+    sa.CheckConstraint('end_time > start_time', name='chk_screening_end_after_start'),
+    sa.ForeignKeyConstraint(['auditorium_id'], ['auditorium.id'], ),
+    sa.ForeignKeyConstraint(['movie_id'], ['movie.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('seat',
+    *_base_columns(),
+    sa.Column('row_label', sqlmodel.sql.sqltypes.AutoString(length=5), nullable=False),
+    sa.Column('seat_number', sa.Integer(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('seat_type', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=True),
+    sa.Column('auditorium_id', sa.Integer(), nullable=False),
+    sa.CheckConstraint('seat_number > 0', name='chk_seat_number_positive'),
+    sa.ForeignKeyConstraint(['auditorium_id'], ['auditorium.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('auditorium_id', 'row_label', 'seat_number', name='uq_seat_auditorium_position')
+    )
+    op.create_table('reservation',
+    *_base_columns(),
+    sa.Column('status', sa.Enum('BOOKED', 'CANCELLED', 'COMPLETED', 'EXPIRED', name='reservationstatus'), nullable=False),
+    sa.Column('total_price', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('screening_id', sa.Integer(), nullable=False),
+    sa.Column('cancelled_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('booking_reference', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=True),
+    sa.Column('notes', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=True),
+    sa.CheckConstraint('total_price >= 0', name='chk_reservation_total_non_negative'),
+    sa.ForeignKeyConstraint(['screening_id'], ['screening.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('booking_reference')
+    )
+    op.create_table('screeningoccupancy',
+    sa.Column('screening_id', sa.Integer(), nullable=False),
+    sa.Column('capacity', sa.Integer(), nullable=False),
+    sa.Column('seats_sold', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Numeric(precision=12, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['screening_id'], ['screening.id'], ),
+    sa.PrimaryKeyConstraint('screening_id')
+    )
+    op.create_table('reservationseat',
+    sa.Column('reservation_id', sa.Integer(), nullable=False),
+    sa.Column('seat_id', sa.Integer(), nullable=False),
+    sa.Column('price_paid', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.CheckConstraint('price_paid >= 0', name='chk_reservation_seat_price_non_negative'),
+    sa.ForeignKeyConstraint(['reservation_id'], ['reservation.id'], ),
+    sa.ForeignKeyConstraint(['seat_id'], ['seat.id'], ),
+    sa.PrimaryKeyConstraint('reservation_id', 'seat_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('reservationseat')
+    op.drop_table('screeningoccupancy')
+    op.drop_table('reservation')
+    op.drop_table('seat')
+    op.drop_table('screening')
+    op.drop_table('revenuerollup')
+    op.drop_table('moviegenre')
+    op.drop_table('auditorium')
+    op.drop_index(op.f('ix_user_username'), table_name='user')
+    op.drop_index(op.f('ix_user_email'), table_name='user')
+    op.drop_table('user')
+    op.drop_table('theatre')
+    op.drop_table('pricingrule')
+    op.drop_table('movie')
+    op.drop_table('genre')
+    sa.Enum(name='reservationstatus').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='userrole').drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name='pricingrulekind').drop(op.get_bind(), checkfirst=True)
+    op.execute(sa.schema.DropSequence(sa.Sequence('booking_reference_block_seq')))
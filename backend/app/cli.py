@@ -0,0 +1,70 @@
+"""
+Administrative commands that are too long-running for a request.
+
+Run from the backend directory:
+
+    DATABASE_URL=... python -m app.cli import-users users.csv [--conflicts conflicts.csv]
+
+import-users creates the users of a CSV with username, email and password
+columns (see UserProvisioner), hashing passwords on USER_IMPORT_HASH_WORKERS
+processes (every core by default), and writes the rows that were not
+created, with their line and reason, to --conflicts or stdout.
+"""
+from sqlmodel import Session
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import asyncio
+import csv
+import multiprocessing
+import os
+import sys
+
+from app.core import settings
+from app.database import Database
+from app.services import UserProvisioner
+
+
+def import_users(path: str, conflicts_path: str | None) -> None:
+    with open(path, encoding="utf-8-sig", newline="") as file:
+        text = file.read()
+    workers = settings.USER_IMPORT_HASH_WORKERS or os.cpu_count() or 1
+    Database.connect(settings.DATABASE_URL)
+    try:
+        # spawn, not fork: the parent holds pooled connections.
+        with (
+            ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool,
+            Session(Database.get_engine()) as session
+        ):
+            result = asyncio.run(UserProvisioner(session).provision(text, settings.USER_IMPORT_MAX_ROWS, pool))
+    finally:
+        Database.disconnect()
+
+    output = open(conflicts_path, "w", newline="") if conflicts_path else sys.stdout
+    try:
+        writer = csv.writer(output)
+        writer.writerow(["line", "username", "email", "reason"])
+        writer.writerows([c.line, c.username, c.email, c.reason] for c in result.conflicts)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(
+        f"{result.received} rows, {result.created} created, {len(result.conflicts)} conflicts "
+        f"in {result.elapsed_seconds}s ({result.hash_seconds}s hashing)",
+        file=sys.stderr
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    users = commands.add_parser("import-users", help="create users from a CSV file")
+    users.add_argument("path")
+    users.add_argument("--conflicts", help="CSV file for the rows not created; stdout by default")
+    args = parser.parse_args()
+
+    if args.command == "import-users":
+        import_users(args.path, args.conflicts)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,16 @@
 from .config import settings
+from .tokens import KeyRing, VerifiedTokenCache
 from .security import SecurityUtils
+from .idempotency import IdempotencyStore
+from .rate_limit import LoginThrottle
+from .references import BookingReferenceGenerator, booking_references
+from .revocation import BloomFilter, TokenRevocationList
+from .scheduler import Scheduler
 from .rbac import require_role
 
 
-__all__ = ["settings", "SecurityUtils", "require_role"]
+__all__ = [
+    "settings", "KeyRing", "VerifiedTokenCache", "SecurityUtils", "IdempotencyStore", "LoginThrottle",
+    "BookingReferenceGenerator", "booking_references",
+    "BloomFilter", "TokenRevocationList", "Scheduler", "require_role"
+]
@@ -0,0 +1,296 @@
+from collections import OrderedDict
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from abc import ABC, abstractmethod
+from typing import Protocol
+import hashlib
+import zlib
+
+try:
+    import brotli
+except ImportError:  # optional: pip install moviereservationsystem[compression]
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install moviereservationsystem[compression]
+    zstandard = None
+
+
+COMPRESSIBLE_TYPES: tuple[str, ...] = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+class EncoderStream(Protocol):
+    def chunk(self, data: bytes) -> bytes:
+        """Compress `data` and flush, so the output can be sent at once."""
+        ...
+
+    def finish(self) -> bytes:
+        ...
+
+
+class Encoder(ABC):
+    """One content-coding: whole-body compression plus an incremental stream."""
+
+    name: str
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        ...
+
+    @abstractmethod
+    def stream(self) -> EncoderStream:
+        ...
+
+
+class _ZlibStream:
+
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class GzipEncoder(Encoder):
+    name = "gzip"
+
+    def __init__(self, level: int = 6) -> None:
+        self._level = level
+
+    def compress(self, data: bytes) -> bytes:
+        stream = _ZlibStream(self._level)
+        return stream.chunk(data) + stream.finish()
+
+    def stream(self) -> _ZlibStream:
+        return _ZlibStream(self._level)
+
+
+class _BrotliStream:
+
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality) # type: ignore
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class BrotliEncoder(Encoder):
+    name = "br"
+
+    def __init__(self, quality: int = 5) -> None:
+        self._quality = quality
+
+    def compress(self, data: bytes) -> bytes:
+        return brotli.compress(data, quality=self._quality) # type: ignore
+
+    def stream(self) -> _BrotliStream:
+        return _BrotliStream(self._quality)
+
+
+class _ZstdStream:
+
+    def __init__(self, level: int) -> None:
+        # A compression context serves one stream at a time: every response gets its own.
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj() # type: ignore
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK) # type: ignore
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class ZstdEncoder(Encoder):
+    name = "zstd"
+
+    def __init__(self, level: int = 3) -> None:
+        self._level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=self._level).compress(data) # type: ignore
+
+    def stream(self) -> _ZstdStream:
+        return _ZstdStream(self._level)
+
+
+def available_encoders() -> list[Encoder]:
+    """Encoders usable in this environment, most preferred first."""
+    encoders: list[Encoder] = []
+    if zstandard is not None:
+        encoders.append(ZstdEncoder())
+    if brotli is not None:
+        encoders.append(BrotliEncoder())
+    encoders.append(GzipEncoder())
+    return encoders
+
+
+def negotiate(accept_encoding: str, encoders: list[Encoder]) -> Encoder | None:
+    """Pick the encoder with the highest q-value; server preference breaks ties."""
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name] = q
+
+    best: Encoder | None = None
+    best_q = 0.0
+    for encoder in encoders:
+        q = weights.get(encoder.name, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoder, q
+    return best
+
+
+class CompressedBodyCache:
+    """LRU of compressed bodies keyed by encoding and a digest of the uncompressed body."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self._entries: OrderedDict[tuple[str, bytes], bytes] = OrderedDict()
+        self._max_bytes = max_bytes
+        self._size = 0
+
+    def get_or_compress(self, encoder: Encoder, body: bytes) -> bytes:
+        key = (encoder.name, hashlib.blake2b(body, digest_size=16).digest())
+        cached = self._entries.get(key)
+        if cached is not None:
+            self._entries.move_to_end(key)
+            return cached
+
+        compressed = encoder.compress(body)
+        if len(compressed) <= self._max_bytes:
+            self._entries[key] = compressed
+            self._size += len(compressed)
+            while self._size > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+        return compressed
+
+
+class CompressionMiddleware:
+    """
+    Negotiated gzip/brotli/zstd response compression.
+
+    Single-body responses are compressed once they reach `minimum_size`; streaming
+    responses are compressed chunk by chunk and flushed so clients see data as it
+    is produced. Successful GET responses under `cache_paths` are served from a
+    cache of compressed bodies, so repeated catalog pages cost a hash, not a deflate.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        cache_paths: list[str] | None = None,
+        cache_max_bytes: int = 32 * 1024 * 1024
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache_paths = tuple(cache_paths or ())
+        self.encoders = available_encoders()
+        self.cache = CompressedBodyCache(cache_max_bytes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoder = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.encoders)
+        if encoder is None:
+            await self.app(scope, receive, send)
+            return
+
+        cacheable = bool(self.cache_paths) and scope["method"] == "GET" and scope["path"].startswith(self.cache_paths)
+        responder = _CompressionResponder(self, encoder, send, cacheable)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+
+    def __init__(self, middleware: CompressionMiddleware, encoder: Encoder, send: Send, cacheable: bool) -> None:
+        self.middleware = middleware
+        self.encoder = encoder
+        self.downstream = send
+        self.cacheable = cacheable
+        self.start: Message | None = None
+        self.stream: EncoderStream | None = None
+        self.passthrough = False
+
+    def _eligible(self, headers: MutableHeaders) -> bool:
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(raw=message["headers"])
+            self.passthrough = not self._eligible(headers)
+            if self.passthrough:
+                await self.downstream(message)
+            else:
+                headers.add_vary_header("Accept-Encoding")
+                self.start = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.downstream(message)
+            return
+
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if self.start is not None and not more_body:
+            # Whole body in one message: compress it in one go if it is worth it.
+            start, self.start = self.start, None
+            headers = MutableHeaders(raw=start["headers"])
+            if len(body) < self.middleware.minimum_size:
+                await self.downstream(start)
+                await self.downstream(message)
+                return
+            if self.cacheable and start["status"] == 200:
+                compressed = self.middleware.cache.get_or_compress(self.encoder, body)
+            else:
+                compressed = self.encoder.compress(body)
+            headers["Content-Encoding"] = self.encoder.name
+            headers["Content-Length"] = str(len(compressed))
+            await self.downstream(start)
+            await self.downstream({"type": "http.response.body", "body": compressed})
+            return
+
+        if self.start is not None:
+            # First chunk of a streaming body: switch to incremental compression.
+            start, self.start = self.start, None
+            headers = MutableHeaders(raw=start["headers"])
+            headers["Content-Encoding"] = self.encoder.name
+            if "content-length" in headers:
+                del headers["content-length"]
+            self.stream = self.encoder.stream()
+            await self.downstream(start)
+
+        data = self.stream.chunk(body) if body else b"" # type: ignore
+        if not more_body:
+            data += self.stream.finish() # type: ignore
+        if data or not more_body:
+            await self.downstream({"type": "http.response.body", "body": data, "more_body": more_body})
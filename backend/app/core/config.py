@@ -7,8 +7,105 @@ class Settings(BaseSettings):
 
     # Secret
     JWT_SECRET: str = ""
-    JWT_TOKEN_EXPIRE_MINUTES: int = 0
+    JWT_TOKEN_EXPIRE_MINUTES: int = 0  # access tokens; keep short, clients renew with a refresh token
     JWT_ALGORITHM: str = ""
+    JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = 14
+    JWT_KEYS_FILE: str = ""  # JSON key ring (EdDSA/ES256/...); JWT_SECRET alone when empty
+    JWT_KEYS_RELOAD_SECONDS: float = 10.0
+    JWT_VERIFIED_CACHE_SIZE: int = 10_000  # 0 disables the verified-token cache
+    JWT_VERIFIED_CACHE_TTL_SECONDS: float = 60.0
+
+    # Token revocation (per-process Bloom filter synced from the revokedtoken table)
+    TOKEN_REVOCATION_SYNC_SECONDS: float = 2.0
+    TOKEN_REVOCATION_FALSE_POSITIVE_RATE: float = 0.001
+
+    # Bulk user import (requests take small files only; large ones go through app.cli)
+    USER_IMPORT_MAX_ROWS: int = 100_000
+    USER_IMPORT_HTTP_MAX_ROWS: int = 100  # hashed in the shared OUTBOX_RENDER_WORKERS pool, not on every core
+    USER_IMPORT_BATCH_SIZE: int = 5000
+    USER_IMPORT_HASH_WORKERS: int = 0  # processes hashing passwords from the command line; 0 uses every core
+
+    # Pricing
+    PRICING_TIMEZONE: str = "UTC"
+    PRICING_RULES_REFRESH_SECONDS: float = 5.0
+
+    # Booking references (required; the key must never change once references are issued)
+    BOOKING_REFERENCE_KEY: str = ""
+    BOOKING_REFERENCE_BLOCK_SIZE: int = 1024
+
+    # Login throttling (token buckets per username and per client IP)
+    LOGIN_RATE_USERNAME_CAPACITY: int = 5
+    LOGIN_RATE_USERNAME_REFILL_PER_MINUTE: float = 2.0
+    LOGIN_RATE_IP_CAPACITY: int = 20
+    LOGIN_RATE_IP_REFILL_PER_MINUTE: float = 10.0
+    RATE_LIMIT_REDIS_URL: str = ""  # shared backend across workers; in-process buckets when empty
+
+    # Response compression
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_CACHE_PATHS: list[str] = ["/api/movies", "/api/genres", "/api/theatres"]
+    COMPRESSION_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+
+    # Genre registry
+    GENRE_REGISTRY_REFRESH_SECONDS: float = 5.0
+
+    # Similar movies
+    RECOMMENDATIONS_TOP_K: int = 10
+
+    # Theatre geo search (in-memory grid; the DB bounding-box index when disabled)
+    GEO_INDEX_ENABLED: bool = True
+    GEO_INDEX_CELL_DEGREES: float = 0.25
+    GEO_INDEX_REFRESH_SECONDS: float = 5.0
+
+    # Occupancy forecasts (interval 0 disables the background refresh)
+    FORECAST_INTERVAL_SECONDS: float = 15 * 60
+    FORECAST_HISTORY_DAYS: int = 365
+    FORECAST_SHRINKAGE: float = 10.0  # screenings of evidence an effect needs to count half
+    FORECAST_FIT_ROUNDS: int = 3
+
+    # Schedule optimizer
+    SCHEDULE_SLOT_MINUTES: int = 15  # screenings start on this grid
+    SCHEDULE_DEFAULT_POPULARITY: float = 0.4  # for movies without sales history
+    SCHEDULE_REPEAT_DECAY: float = 0.8  # each further showing of a movie on a day sells this much less
+    SCHEDULE_SEARCH_SECONDS: float = 2.0
+
+    # Screening lifecycle: complete past reservations, deactivate past screenings, reconcile seat counts
+    LIFECYCLE_INTERVAL_SECONDS: float = 60.0  # 0 disables the job
+    LIFECYCLE_BATCH_SIZE: int = 5000
+    LIFECYCLE_RECONCILE_CHUNK_SIZE: int = 500
+
+    # Reservation archive (interval 0 disables the background job)
+    RESERVATION_ARCHIVE_AFTER_DAYS: int = 30
+    RESERVATION_ARCHIVE_BATCH_SIZE: int = 5000
+    RESERVATION_ARCHIVE_INTERVAL_SECONDS: float = 60 * 60
+
+    # Waitlist (sweep 0 disables expiring holds in the background)
+    WAITLIST_HOLD_MINUTES: float = 10.0
+    WAITLIST_SWEEP_SECONDS: float = 15.0
+    NOTIFICATIONS_QUEUE_SIZE: int = 100  # per connected client; oldest events are dropped beyond this
+
+    # Outbox dispatcher (poll 0 disables it; workers 0 renders tickets in the dispatcher thread)
+    OUTBOX_POLL_SECONDS: float = 1.0
+    OUTBOX_BATCH_SIZE: int = 50
+    OUTBOX_MAX_ATTEMPTS: int = 8
+    OUTBOX_RETRY_BASE_SECONDS: float = 5.0  # doubles with every failed attempt
+    OUTBOX_RENDER_WORKERS: int = 2  # process pool shared by ticket rendering and schedule search; 0 runs them in-process
+
+    # Tickets (the signing key is required; door scanners hold it to check ticket codes offline)
+    TICKET_SIGNING_KEY: str = ""
+    TICKET_SENDER: str = "app.services.tickets:FileTicketSender"  # module:class with a send(ticket, svg) method
+    TICKET_OUTPUT_DIR: str = "var/tickets"
+    TICKET_FROM_ADDRESS: str = "tickets@moviereservationsystem.local"
+
+    # Request profiling (off: the middleware is not installed at all)
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0  # share of all requests profiled; admins can also send X-Profile: 1
+    PROFILING_INTERVAL_MS: float = 1.0
+    PROFILING_OUTPUT_DIR: str = "var/profiles"
+    PROFILING_MAX_PROFILES: int = 200  # oldest profiles are deleted beyond this
+
+    # Idempotency (purge 0 leaves expired keys in the table)
+    IDEMPOTENCY_TTL_SECONDS: float = 24 * 60 * 60
+    IDEMPOTENCY_PURGE_SECONDS: float = 15 * 60
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,104 @@
+from sqlmodel import Session, select
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+import hashlib
+
+from app.core.config import settings
+from app.database import Database
+from app.models import IdempotencyKey
+from app.utils.exceptions import IdempotencyKeyReuseException
+
+
+class IdempotencyStore:
+    """
+    Remembers the booking reference produced for each `Idempotency-Key`, in
+    the `idempotencykey` table, so a retry replays the first result on any
+    worker and after a restart.
+
+    The key is claimed in the operation's own transaction, before the
+    operation runs, and committed with its result. A duplicate arriving while
+    the original is in flight blocks on the claim until the original commits,
+    then replays it. If the original fails, its claim rolls back with it and
+    the duplicate runs the operation instead. Keys expire after
+    `IDEMPOTENCY_TTL_SECONDS`.
+    """
+
+    @staticmethod
+    def _replay(session: Session, scope: str, key: str, fingerprint: str, now: datetime) -> str | None:
+        statement = select(IdempotencyKey.fingerprint, IdempotencyKey.booking_reference).where(
+            IdempotencyKey.scope == scope,
+            IdempotencyKey.key == key,
+            IdempotencyKey.expires_at > now # type: ignore
+        )
+        entry = session.exec(statement).first()
+        if entry is None:
+            return None
+        if entry[0] != fingerprint:
+            raise IdempotencyKeyReuseException()
+        return entry[1]
+
+    @staticmethod
+    def _claim(session: Session, scope: str, key: str, fingerprint: str, now: datetime) -> bool:
+        """Insert the key, or take over an expired one. Waits for a claim by another transaction."""
+        table = IdempotencyKey.__table__ # type: ignore
+        expires_at = now + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+        stmt = pg_insert(table).values(
+            scope=scope, key=key, fingerprint=fingerprint, booking_reference="", created_at=now, expires_at=expires_at
+        )
+        claimed = session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["scope", "key"],
+                set_={
+                    "fingerprint": stmt.excluded.fingerprint,
+                    "booking_reference": stmt.excluded.booking_reference,
+                    "created_at": stmt.excluded.created_at,
+                    "expires_at": stmt.excluded.expires_at,
+                },
+                where=table.c.expires_at <= now
+            ).returning(table.c.key)
+        ).first()
+        return claimed is not None
+
+    @classmethod
+    def run(cls, session: Session, scope: str, key: str, request: str, operation: Callable[[], str]) -> str:
+        """
+        Run `operation` once per key and return its booking reference.
+
+        `operation` must leave its changes uncommitted: they are committed
+        together with the key, or rolled back together with it.
+        """
+        fingerprint = hashlib.sha256(request.encode()).hexdigest()
+        while True:
+            now = datetime.now(timezone.utc)
+            reference = cls._replay(session, scope, key, fingerprint, now)
+            if reference is not None:
+                return reference
+            if not cls._claim(session, scope, key, fingerprint, now):
+                # Claimed and committed by another request since the lookup: replay it.
+                session.rollback()
+                continue
+
+            try:
+                reference = operation()
+                session.execute(
+                    update(IdempotencyKey)
+                    .where(IdempotencyKey.scope == scope, IdempotencyKey.key == key) # type: ignore
+                    .values(booking_reference=reference)
+                )
+                session.commit()
+            except BaseException:
+                session.rollback()
+                raise
+            return reference
+
+    @staticmethod
+    def purge_expired() -> int:
+        """Delete expired keys. Returns how many were deleted."""
+        with Session(Database.get_engine()) as session:
+            result = session.execute(
+                delete(IdempotencyKey).where(IdempotencyKey.expires_at <= datetime.now(timezone.utc)) # type: ignore
+            )
+            session.commit()
+        return result.rowcount # type: ignore
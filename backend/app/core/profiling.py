@@ -0,0 +1,231 @@
+from collections import Counter
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from datetime import datetime, timezone
+from pathlib import Path
+from types import FrameType
+from loguru import logger
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+
+from app.core.config import settings
+from app.core.security import SecurityUtils
+from app.core.revocation import TokenRevocationList
+from app.models import UserRole, ProfileSummary, ProfileResponse
+
+PROFILE_HEADER: str = "x-profile"
+PROFILE_ID_HEADER: str = "X-Profile-Id"
+PROFILE_ID_PATTERN: re.Pattern[str] = re.compile(r"^[0-9]{8}T[0-9]{12}-[0-9a-f]{8}$")
+
+# What a sample was doing is named by the innermost frame from one of these packages.
+CATEGORIES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("bcrypt", ("passlib", "bcrypt")),
+    ("db", ("sqlalchemy", "sqlmodel", "psycopg2")),
+    ("serialization", ("pydantic", "pydantic_core", "fastapi.encoders", "json", "starlette.responses")),
+    ("application", ("app",)),
+)
+BREAKDOWN: tuple[str, ...] = (*(name for name, _ in CATEGORIES), "waiting")
+
+
+def _category(module: str) -> str | None:
+    for name, packages in CATEGORIES:
+        for package in packages:
+            if module == package or module.startswith(package + "."):
+                return name
+    return None
+
+
+class _ActiveProfile:
+    """Samples of one request: the stacks seen while its own frame was on its thread's stack."""
+
+    def __init__(self, profile_id: str, root: FrameType, thread_id: int) -> None:
+        self.id = profile_id
+        self.root = root
+        self.thread_id = thread_id
+        self.ticks = 0
+        self.stacks: Counter[str] = Counter()
+        self.categories: Counter[str] = Counter()
+
+    def record(self, frame: FrameType | None) -> None:
+        self.ticks += 1
+        names: list[str] = []
+        category: str | None = None
+        while frame is not None and frame is not self.root:
+            module = frame.f_globals.get("__name__", "")
+            if category is None:
+                category = _category(module)
+            names.append(f"{module}:{frame.f_code.co_name}")
+            frame = frame.f_back
+        if frame is None:
+            return  # the thread is running something else; this request is waiting
+        self.categories[category or "application"] += 1
+        self.stacks[";".join(reversed(names)) or "(request)"] += 1
+
+
+class RequestProfiler:
+    """
+    A sampling profiler for individual requests.
+
+    One background thread, alive only while a request is being profiled,
+    reads every thread's current frame each PROFILING_INTERVAL_MS. A sample
+    counts for a request only if the request's own frame is on the stack.
+    Other requests interleaved on the event loop are therefore left out, and
+    the time the request spends awaiting shows up as waiting.
+    """
+
+    _active: dict[str, _ActiveProfile] = {}
+    _lock: threading.Lock = threading.Lock()
+    _thread: threading.Thread | None = None
+
+    @classmethod
+    def begin(cls, profile: _ActiveProfile) -> None:
+        with cls._lock:
+            cls._active[profile.id] = profile
+            if cls._thread is None:
+                cls._thread = threading.Thread(target=cls._sample, name="request-profiler", daemon=True)
+                cls._thread.start()
+
+    @classmethod
+    def end(cls, profile: _ActiveProfile) -> None:
+        with cls._lock:
+            cls._active.pop(profile.id, None)
+
+    @classmethod
+    def _sample(cls) -> None:
+        interval = settings.PROFILING_INTERVAL_MS / 1000
+        while True:
+            with cls._lock:
+                if not cls._active:
+                    cls._thread = None
+                    return
+                frames = sys._current_frames()
+                for profile in cls._active.values():
+                    profile.record(frames.get(profile.thread_id))
+                del frames
+            time.sleep(interval)
+
+
+class ProfileStore:
+    """Profiles as JSON files, newest kept, written atomically."""
+
+    def __init__(self, directory: str, max_profiles: int = 200) -> None:
+        self._directory = Path(directory)
+        self._max_profiles = max_profiles
+
+    @staticmethod
+    def new_id() -> str:
+        """Sortable by time: newest profiles have the greatest ids."""
+        return f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}"
+
+    def save(self, profile: ProfileResponse) -> None:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        path = self._directory / f"{profile.id}.json"
+        partial = path.with_suffix(".json.part")
+        partial.write_text(profile.model_dump_json())
+        os.replace(partial, path)
+        stored = sorted(self._directory.glob("*.json"))
+        for stale in stored[:max(0, len(stored) - self._max_profiles)]:
+            stale.unlink(missing_ok=True)
+
+    def load(self, profile_id: str) -> ProfileResponse | None:
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        path = self._directory / f"{profile_id}.json"
+        if not path.exists():
+            return None
+        return ProfileResponse.model_validate_json(path.read_text())
+
+    def list(self, limit: int = 50) -> list[ProfileSummary]:
+        """Newest first."""
+        if not self._directory.exists():
+            return []
+        paths = sorted(self._directory.glob("*.json"), reverse=True)[:limit]
+        return [ProfileSummary.model_validate_json(path.read_text()) for path in paths]
+
+
+class ProfilingMiddleware:
+    """
+    Profiles the requests an admin asks for with `X-Profile: 1`, plus a
+    random `sample_rate` share of all requests. Profiled responses carry
+    `X-Profile-Id`; the profile is stored once the response is sent.
+    Installed only when PROFILING_ENABLED, so it costs nothing otherwise.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        sample_rate: float = 0.0,
+        output_dir: str = "var/profiles",
+        max_profiles: int = 200
+    ) -> None:
+        self.app = app
+        self.sample_rate = sample_rate
+        self.store = ProfileStore(output_dir, max_profiles)
+
+    @staticmethod
+    def _requested_by_admin(headers: Headers) -> bool:
+        if headers.get(PROFILE_HEADER) != "1":
+            return False
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return False
+        try:
+            data = SecurityUtils.decode_token(token)
+        except Exception:
+            return False
+        return data.role == UserRole.ADMIN and not TokenRevocationList.is_revoked(data.jti, data.sub, data.iat)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        if not (sampled or self._requested_by_admin(Headers(scope=scope))):
+            await self.app(scope, receive, send)
+            return
+
+        profile = _ActiveProfile(ProfileStore.new_id(), sys._getframe(), threading.get_ident())
+        status_code = 500
+
+        async def send_with_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(raw=message["headers"]).append(PROFILE_ID_HEADER, profile.id)
+            await send(message)
+
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        RequestProfiler.begin(profile)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            RequestProfiler.end(profile)
+            wall_ms = (time.perf_counter() - started) * 1000
+            self._store(profile, scope, status_code, started_at, wall_ms)
+
+    def _store(self, profile: _ActiveProfile, scope: Scope, status_code: int, started_at: datetime, wall_ms: float) -> None:
+        samples = sum(profile.categories.values())
+        # Each tick stands for an equal share of the wall time.
+        share = wall_ms / profile.ticks if profile.ticks else 0.0
+        counts = {**profile.categories, "waiting": profile.ticks - samples}
+        try:
+            self.store.save(ProfileResponse(
+                id=profile.id,
+                method=scope["method"],
+                path=scope["path"],
+                status_code=status_code,
+                started_at=started_at,
+                wall_ms=round(wall_ms, 3),
+                samples=samples,
+                breakdown_ms={name: round(counts.get(name, 0) * share, 3) for name in BREAKDOWN},
+                interval_ms=settings.PROFILING_INTERVAL_MS,
+                stacks=dict(profile.stacks.most_common()),
+            ))
+        except OSError as e:
+            logger.error(f"Failed to store profile {profile.id}: {e}")
@@ -0,0 +1,144 @@
+from collections import Counter, OrderedDict
+from loguru import logger
+import threading
+import time
+
+try:
+    import redis
+except ImportError:  # optional: pip install moviereservationsystem[redis]
+    redis = None
+
+from app.core.config import settings
+from app.utils.exceptions import TooManyRequestsException
+
+
+class LocalRateLimitBackend:
+    """In-process token buckets. Also the stand-in when no shared backend is configured."""
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._max_keys = max_keys
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """Take one token. Returns 0 if allowed, else seconds until a token is available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (float(capacity), now))
+            tokens = min(float(capacity), tokens + (now - updated_at) * refill_per_second)
+            wait = 0.0 if tokens >= 1.0 else (1.0 - tokens) / refill_per_second
+            if not wait:
+                tokens -= 1.0
+            self._buckets[key] = (tokens, now)
+            # Least recently touched buckets are the most refilled; drop them first.
+            while len(self._buckets) > self._max_keys:
+                self._buckets.popitem(last=False)
+            return wait
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class RedisRateLimitBackend:
+    """
+    Token buckets shared by every worker, updated atomically by a Lua script.
+
+    While Redis is unreachable, buckets fall back to this process's own, so a
+    throttle outage never becomes a login outage.
+    """
+
+    _SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local refill = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated_at = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated_at) * refill)
+    local wait = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+    else
+        wait = (1 - tokens) / refill
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / refill) + 1)
+    return tostring(wait)
+    """
+
+    def __init__(self, url: str) -> None:
+        self._client = redis.Redis.from_url(url) # type: ignore
+        self._consume = self._client.register_script(self._SCRIPT)
+        self._fallback = LocalRateLimitBackend()
+        self._degraded = False
+
+    def consume(self, key: str, capacity: int, refill_per_second: float) -> float:
+        """Take one token. Returns 0 if allowed, else seconds until a token is available."""
+        try:
+            wait = float(self._consume(keys=[f"ratelimit:{key}"], args=[capacity, refill_per_second, time.time()]))
+        except redis.exceptions.RedisError as e: # type: ignore
+            if not self._degraded:
+                logger.warning(f"Rate limit Redis unavailable ({e}); using in-process buckets until it is back.")
+                self._degraded = True
+            return self._fallback.consume(key, capacity, refill_per_second)
+        if self._degraded:
+            logger.info("Rate limit Redis is back; using shared buckets again.")
+            self._degraded = False
+        return wait
+
+    def reset(self) -> None:
+        self._fallback.reset()
+        for key in self._client.scan_iter("ratelimit:*"):
+            self._client.delete(key)
+
+
+def _create_backend() -> LocalRateLimitBackend | RedisRateLimitBackend:
+    if not settings.RATE_LIMIT_REDIS_URL:
+        return LocalRateLimitBackend()
+    if redis is None:
+        logger.warning("RATE_LIMIT_REDIS_URL is set but redis is not installed; using in-process buckets.")
+        return LocalRateLimitBackend()
+    return RedisRateLimitBackend(settings.RATE_LIMIT_REDIS_URL)
+
+
+class LoginThrottle:
+    """
+    Token-bucket throttling for login attempts, keyed by client IP and by username.
+
+    Runs before any DB lookup or bcrypt verify, so a credential-stuffing burst
+    costs one bucket update per attempt instead of a password hash.
+    """
+
+    _backend: LocalRateLimitBackend | RedisRateLimitBackend = _create_backend()
+    _counters: Counter[str] = Counter()
+
+    @classmethod
+    def check(cls, username: str, client_ip: str | None) -> None:
+        """Consume a token from both buckets, or raise 429 with Retry-After."""
+        buckets = [
+            ("ip", f"login:ip:{client_ip}", settings.LOGIN_RATE_IP_CAPACITY, settings.LOGIN_RATE_IP_REFILL_PER_MINUTE),
+            ("username", f"login:user:{username.lower()}", settings.LOGIN_RATE_USERNAME_CAPACITY, settings.LOGIN_RATE_USERNAME_REFILL_PER_MINUTE),
+        ]
+        for name, key, capacity, per_minute in buckets:
+            if name == "ip" and client_ip is None:
+                continue
+            wait = cls._backend.consume(key, capacity, per_minute / 60.0)
+            if wait:
+                cls._counters[f"rejected_{name}"] += 1
+                raise TooManyRequestsException(wait)
+        cls._counters["allowed"] += 1
+
+    @classmethod
+    def stats(cls) -> dict[str, int]:
+        """Allowed and rejected attempt counters for this process."""
+        return {
+            "allowed": cls._counters["allowed"],
+            "rejected_ip": cls._counters["rejected_ip"],
+            "rejected_username": cls._counters["rejected_username"],
+        }
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._backend.reset()
+        cls._counters.clear()
@@ -1,14 +1,19 @@
 from fastapi import Depends
+from fastapi.security import OAuth2PasswordBearer
 from app.models import UserRole, UserResponse
-from app.services import AuthService
+from app.services import AuthServiceDep
 from app.utils.exceptions import UnauthorizedException
 
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
+
 
 def require_role(*allowed_roles: UserRole):
     """Dependency generator for role-based access."""
     async def _role_checker(
-        current_user: UserResponse = Depends(AuthService.get_current_user)
+        service: AuthServiceDep,
+        token: str = Depends(oauth2_scheme)
     ) -> UserResponse:
+        current_user = await service.get_current_user(token)
         if current_user.role not in allowed_roles:
             raise UnauthorizedException()
         return current_user
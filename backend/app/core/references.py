@@ -0,0 +1,117 @@
+from typing import Callable
+import hashlib
+import threading
+
+from app.core.config import settings
+from app.database import Database
+from app.models import booking_reference_block_seq
+
+# Crockford base32: no I, L, O or U, so references survive being read aloud or retyped.
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_DECODE = {c: i for i, c in enumerate(ALPHABET)} | {"I": 1, "L": 1, "O": 0}
+
+_HALF_BITS = 20
+_HALF_MASK = (1 << _HALF_BITS) - 1
+_BODY_LENGTH = 8  # 8 base32 digits = 40 bits
+
+
+def _luhn_mod_32(digits: list[int]) -> int:
+    """Luhn mod N check value; catches every single-symbol error and most transpositions."""
+    factor, total = 2, 0
+    for digit in reversed(digits):
+        addend = factor * digit
+        total += addend // 32 + addend % 32
+        factor = 1 if factor == 2 else 2
+    return (32 - total % 32) % 32
+
+
+class BookingReferenceGenerator:
+    """
+    Issues unique, short, check-digited booking references like `7KQ2-M9XD-4`.
+
+    Each process reserves a block of sequence numbers with one `nextval` and
+    hands them out from memory, so uniqueness never depends on a retry against
+    the unique constraint. Numbers are passed through a keyed Feistel
+    permutation of the 40-bit space so consecutive references are not guessable.
+    """
+
+    def __init__(self, allocate_block: Callable[[], int], block_size: int, key: str) -> None:
+        self._allocate_block = allocate_block
+        self._block_size = block_size
+        self._configured = bool(key)
+        self._key = hashlib.blake2b(key.encode()).digest()
+        self._next = 0
+        self._end = 0
+        self._lock = threading.Lock()
+
+    def _round(self, value: int, index: int) -> int:
+        digest = hashlib.blake2b(
+            value.to_bytes(3, "big"), digest_size=3, key=self._key, salt=index.to_bytes(16, "big")
+        ).digest()
+        return int.from_bytes(digest, "big") & _HALF_MASK
+
+    def _permute(self, number: int) -> int:
+        left, right = number >> _HALF_BITS, number & _HALF_MASK
+        for index in range(4):
+            left, right = right, left ^ self._round(right, index)
+        return (left << _HALF_BITS) | right
+
+    def _next_number(self) -> int:
+        with self._lock:
+            if self._next >= self._end:
+                block = self._allocate_block()
+                self._next = block * self._block_size
+                self._end = self._next + self._block_size
+                if self._end > 1 << (2 * _HALF_BITS):
+                    raise RuntimeError("Booking reference space exhausted.")
+            number = self._next
+            self._next += 1
+            return number
+
+    @staticmethod
+    def encode(value: int) -> str:
+        """Encode a 40-bit value as `XXXX-XXXX-C`."""
+        digits = [(value >> (5 * i)) & 31 for i in reversed(range(_BODY_LENGTH))]
+        body = "".join(ALPHABET[d] for d in digits)
+        return f"{body[:4]}-{body[4:]}-{ALPHABET[_luhn_mod_32(digits)]}"
+
+    @staticmethod
+    def normalize(reference: str) -> str | None:
+        """Canonical form of a user-typed reference, or None if it fails the check digit."""
+        symbols = reference.strip().upper().replace("-", "").replace(" ", "")
+        if len(symbols) != _BODY_LENGTH + 1 or any(c not in _DECODE for c in symbols):
+            return None
+        digits = [_DECODE[c] for c in symbols]
+        if _luhn_mod_32(digits[:-1]) != digits[-1]:
+            return None
+        value = 0
+        for digit in digits[:-1]:
+            value = (value << 5) | digit
+        return BookingReferenceGenerator.encode(value)
+
+    @classmethod
+    def is_valid(cls, reference: str) -> bool:
+        """Check the format and check digit without touching the database."""
+        return cls.normalize(reference) is not None
+
+    def require_key(self) -> None:
+        """Refuse to work without a configured key: with a known one, references reveal their sequence numbers."""
+        if not self._configured:
+            raise ValueError("No booking reference key: set BOOKING_REFERENCE_KEY.")
+
+    def generate(self) -> str:
+        """Next unique booking reference."""
+        self.require_key()
+        return self.encode(self._permute(self._next_number()))
+
+
+def _allocate_block_from_db() -> int:
+    with Database.get_engine().connect() as connection:
+        return connection.execute(booking_reference_block_seq.next_value()).scalar_one()
+
+
+booking_references: BookingReferenceGenerator = BookingReferenceGenerator(
+    _allocate_block_from_db,
+    block_size=settings.BOOKING_REFERENCE_BLOCK_SIZE,
+    key=settings.BOOKING_REFERENCE_KEY,
+)
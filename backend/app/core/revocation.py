@@ -0,0 +1,114 @@
+from sqlmodel import Session, select
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+import hashlib
+import math
+import threading
+
+from app.core.config import settings
+from app.database import Database
+from app.models import RevokedToken
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings; k probes by double hashing one BLAKE2b digest."""
+
+    def __init__(self, capacity: int, false_positive_rate: float) -> None:
+        capacity = max(capacity, 1)
+        self.size = max(64, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class TokenRevocationList:
+    """
+    Revoked access tokens: a per-process Bloom filter in front of the `revokedtoken` table.
+
+    A miss in the filter means "definitely not revoked" and costs no I/O, which
+    is the answer for nearly every request. A hit is confirmed against the table.
+    The filter is rebuilt from the table every `TOKEN_REVOCATION_SYNC_SECONDS`,
+    so revocations made by other workers apply within that interval; revocations
+    made in this process apply at once.
+    """
+
+    _filter: BloomFilter = BloomFilter(1024, settings.TOKEN_REVOCATION_FALSE_POSITIVE_RATE)
+    _local: set[str] = set()
+    _lock: threading.Lock = threading.Lock()
+
+    @staticmethod
+    def _ttl() -> timedelta:
+        """How long a revocation entry matters: the lifetime of an access token."""
+        return timedelta(minutes=max(settings.JWT_TOKEN_EXPIRE_MINUTES, 1))
+
+    @classmethod
+    def _revoke(cls, session: Session, key: str, expires_at: datetime) -> None:
+        now = datetime.now(timezone.utc)
+        stmt = pg_insert(RevokedToken.__table__).values(key=key, revoked_at=now, expires_at=expires_at) # type: ignore
+        session.execute(stmt.on_conflict_do_update(
+            index_elements=["key"],
+            set_={"revoked_at": stmt.excluded.revoked_at, "expires_at": stmt.excluded.expires_at}
+        ))
+        with cls._lock:
+            cls._filter.add(key)
+            cls._local.add(key)
+
+    @classmethod
+    def revoke_token(cls, session: Session, jti: str, expires_at: datetime | None = None) -> None:
+        """Revoke one access token. The caller commits."""
+        cls._revoke(session, f"jti:{jti}", expires_at or datetime.now(timezone.utc) + cls._ttl())
+
+    @classmethod
+    def revoke_user(cls, session: Session, user_id: int) -> None:
+        """Revoke every access token issued to a user so far. The caller commits."""
+        cls._revoke(session, f"sub:{user_id}", datetime.now(timezone.utc) + cls._ttl())
+
+    @classmethod
+    def is_revoked(cls, jti: str | None, sub: str | None, issued_at: float | None) -> bool:
+        """Whether an access token is revoked. Touches the database only on a filter hit."""
+        candidates = [key for key in (f"jti:{jti}", f"sub:{sub}") if key in cls._filter]
+        if not candidates:
+            return False
+
+        with Session(Database.get_engine()) as session:
+            entries = session.exec(select(RevokedToken).where(RevokedToken.key.in_(candidates))).all() # type: ignore
+        for entry in entries:
+            if entry.key.startswith("jti:"):
+                return True
+            if issued_at is None or issued_at <= entry.revoked_at.timestamp():
+                return True
+        return False
+
+    @classmethod
+    def sync(cls) -> int:
+        """Rebuild the filter from the live entries and purge expired ones. Returns the entry count."""
+        now = datetime.now(timezone.utc)
+        with Session(Database.get_engine()) as session:
+            session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now)) # type: ignore
+            session.commit()
+            keys = session.exec(select(RevokedToken.key)).all()
+
+        rebuilt = BloomFilter(max(1024, len(keys) * 2), settings.TOKEN_REVOCATION_FALSE_POSITIVE_RATE)
+        for key in keys:
+            rebuilt.add(key)
+        with cls._lock:
+            # Keys revoked here may not have been committed when the table was read.
+            for key in cls._local:
+                rebuilt.add(key)
+            cls._local.clear()
+            cls._filter = rebuilt
+        return len(keys)
@@ -0,0 +1,105 @@
+from pydantic import BaseModel
+from typing import Any, Callable
+from loguru import logger
+import asyncio
+import hashlib
+import threading
+
+from app.database import Database
+
+
+class ScheduledJob(BaseModel):
+    name: str
+    interval: float
+    func: Callable[[], Any]
+    leader_only: bool
+
+
+class Scheduler:
+    """
+    Runs periodic jobs of this process on the event loop, each in a thread.
+
+    Jobs that must not run on several workers at once are `leader_only`: the
+    worker holding the job's Postgres advisory lock is its leader and the
+    others skip their turn. The locks are taken on one connection kept out of
+    the pool, so a worker that dies loses its leadership with the connection
+    and the next worker to try takes over.
+    """
+
+    _jobs: dict[str, ScheduledJob] = {}
+    _tasks: list[asyncio.Task] = []
+    _connection: Any = None
+    _leading: set[str] = set()
+    _lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def register(cls, name: str, interval: float, func: Callable[[], Any], leader_only: bool = True) -> None:
+        """Run `func` every `interval` seconds once started; an interval of 0 leaves the job out."""
+        if interval > 0:
+            cls._jobs[name] = ScheduledJob(name=name, interval=interval, func=func, leader_only=leader_only)
+        else:
+            cls._jobs.pop(name, None)
+
+    @staticmethod
+    def _lock_key(name: str) -> int:
+        return int.from_bytes(hashlib.blake2b(f"scheduler:{name}".encode(), digest_size=8).digest(), "big", signed=True)
+
+    @classmethod
+    def _drop_connection(cls) -> None:
+        if cls._connection is not None:
+            try:
+                cls._connection.close()
+            except Exception:
+                pass
+        cls._connection = None
+        cls._leading.clear()
+
+    @classmethod
+    def is_leader(cls, name: str) -> bool:
+        """Whether this worker leads `name`, trying to take over if nobody does."""
+        with cls._lock:
+            try:
+                if cls._connection is None or cls._connection.closed:
+                    cls._drop_connection()
+                    raw = Database.get_engine().raw_connection()
+                    connection = raw.driver_connection
+                    raw.detach()
+                    connection.autocommit = True # type: ignore
+                    cls._connection = connection
+                with cls._connection.cursor() as cursor:
+                    if name in cls._leading:
+                        cursor.execute("SELECT 1")  # leadership lives as long as this connection does
+                        return True
+                    cursor.execute("SELECT pg_try_advisory_lock(%s)", (cls._lock_key(name),))
+                    if cursor.fetchone()[0]:
+                        cls._leading.add(name)
+                        logger.info(f"Leading scheduled job {name}")
+                        return True
+                    return False
+            except Exception as e:
+                logger.error(f"Lost the scheduler connection: {e}")
+                cls._drop_connection()
+                return False
+
+    @classmethod
+    async def _run(cls, job: ScheduledJob) -> None:
+        while True:
+            try:
+                if not job.leader_only or await asyncio.to_thread(cls.is_leader, job.name):
+                    await asyncio.to_thread(job.func)
+            except Exception as e:
+                logger.error(f"Scheduled job {job.name} failed: {e}")
+            await asyncio.sleep(job.interval)
+
+    @classmethod
+    def start(cls) -> None:
+        """Start every registered job on the running event loop."""
+        cls._tasks = [asyncio.create_task(cls._run(job)) for job in cls._jobs.values()]
+
+    @classmethod
+    def stop(cls) -> None:
+        for task in cls._tasks:
+            task.cancel()
+        cls._tasks = []
+        with cls._lock:
+            cls._drop_connection()  # releases every advisory lock held
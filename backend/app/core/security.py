@@ -1,19 +1,39 @@
 from passlib.context import CryptContext
-from jose import jwt
 from datetime import datetime, timedelta, timezone
+import hashlib
+import secrets
+import uuid
 
 from app.core import settings
+from app.core.tokens import KeyRing, VerifiedTokenCache
 from app.models import Token, TokenData
 
 
 class SecurityUtils:
 
     _pwd_context: CryptContext = CryptContext(schemes=["bcrypt"])
+    _key_ring: KeyRing | None = None
+    _verified: VerifiedTokenCache = VerifiedTokenCache(
+        settings.JWT_VERIFIED_CACHE_SIZE, settings.JWT_VERIFIED_CACHE_TTL_SECONDS
+    )
+    _verified_version: int = 0
+
+    @classmethod
+    def key_ring(cls) -> KeyRing:
+        """The JWT key ring, loaded on first use."""
+        if cls._key_ring is None:
+            cls._key_ring = KeyRing(settings.JWT_KEYS_FILE, settings.JWT_KEYS_RELOAD_SECONDS)
+        return cls._key_ring
 
     @classmethod
     def hash_password(cls, password: str) -> str:
         """Hash a password using the `bcrypt` algorithm."""
         return cls._pwd_context.hash(password)
+
+    @classmethod
+    def hash_passwords(cls, passwords: list[str]) -> list[str]:
+        """Hash a batch of passwords; runs in worker processes during bulk imports."""
+        return [cls._pwd_context.hash(password) for password in passwords]
     
     @classmethod
     def verify_password(cls, password: str, hashed_password: str) -> bool:
@@ -22,22 +42,51 @@ class SecurityUtils:
     
     @classmethod
     def create_access_token(cls, payload: TokenData, expires_minutes: int | None = None) -> Token:
-        """Creates a JWT access token."""
+        """Creates a JWT access token with a unique `jti`, so it can be revoked on its own."""
+        now = datetime.now(timezone.utc)
+        expires_minutes = expires_minutes or settings.JWT_TOKEN_EXPIRE_MINUTES
         to_encode = payload.model_dump()
         to_encode.update({
-            "exp": datetime.now(timezone.utc) + timedelta(minutes=expires_minutes or settings.JWT_TOKEN_EXPIRE_MINUTES)
+            "jti": uuid.uuid4().hex,
+            "iat": now.timestamp(),
+            "exp": int((now + timedelta(minutes=expires_minutes)).timestamp())
         })
         token = Token(
-            access_token=jwt.encode(
-                to_encode,
-                key=settings.JWT_SECRET,
-                algorithm=settings.JWT_ALGORITHM
-                )
+            access_token=cls.key_ring().encode(to_encode),
+            expires_in=expires_minutes * 60
             )
         return token
+
+    @classmethod
+    def create_refresh_token(cls) -> tuple[str, str]:
+        """Creates an opaque refresh token. Returns (token, hash); only the hash is stored."""
+        token = secrets.token_urlsafe(48)
+        return token, cls.hash_refresh_token(token)
+
+    @classmethod
+    def hash_refresh_token(cls, token: str) -> str:
+        """SHA-256 of a refresh token. They are random, so a slow hash buys nothing."""
+        return hashlib.sha256(token.encode()).hexdigest()
     
     @classmethod
     def decode_token(cls, token: str) -> TokenData:
-        """Decodes the encoded JWT token."""
-        data = TokenData(**jwt.decode(token, key=settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM]))
+        """
+        Decodes the encoded JWT token. Tokens verified recently are served from
+        a short-TTL cache; a key ring reload empties it.
+        """
+        key_ring = cls.key_ring()
+        if not cls._verified.enabled:
+            return TokenData(**key_ring.decode(token))
+
+        key = VerifiedTokenCache.key_of(token)
+        if cls._verified_version == key_ring.version:
+            data = cls._verified.get(key)
+            if data is not None:
+                return data
+        claims = key_ring.decode(token)
+        if cls._verified_version != key_ring.version:
+            cls._verified.clear()
+            cls._verified_version = key_ring.version
+        data = TokenData(**claims)
+        cls._verified.put(key, data, claims.get("exp"))
         return data
@@ -1,3 +1,4 @@
 from .database import Database, SessionDep
+from .loader import DataLoader
 
-__all__ = ["Database", "SessionDep"]
+__all__ = ["Database", "SessionDep", "DataLoader"]
@@ -1,8 +1,12 @@
-from sqlmodel import SQLModel, Session, create_engine, text
+from sqlmodel import Session, create_engine, text
 from sqlalchemy import Engine
+from alembic.script import ScriptDirectory
 from loguru import logger
 from fastapi import Depends
 from typing import Annotated
+from pathlib import Path
+
+MIGRATIONS_DIR: Path = Path(__file__).resolve().parents[2] / "alembic"
 
 
 class Database:
@@ -34,15 +38,33 @@ class Database:
             cls._engine = None
     
     @classmethod
-    def initialize(cls) -> None:
-        """Initialize the database by creating the tables."""
+    def verify_schema(cls) -> None:
+        """
+        Check that the database is at the latest Alembic revision.
+
+        Costs one query, so workers can start without touching the catalog.
+        Run `alembic upgrade head` to bring the schema up to date.
+        """
         if not cls._engine:
-            raise RuntimeError(f"Cannot initialize. Database not connected.")
+            raise RuntimeError(f"Cannot verify schema. Database not connected.")
+        expected = ScriptDirectory(str(MIGRATIONS_DIR)).get_current_head()
         try:
-            SQLModel.metadata.create_all(cls._engine)
-            logger.success("Initialized database tables.")
+            with cls._engine.connect() as conn:
+                current = conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
         except Exception as e:
-            logger.error(f"Failed to initialize database tables: {e}")
+            raise RuntimeError(f"Database has no schema revision; run `alembic upgrade head`: {e}")
+        if current != expected:
+            raise RuntimeError(
+                f"Database schema is at revision {current}, expected {expected}; run `alembic upgrade head`."
+            )
+        logger.success(f"Database schema is at revision {current}.")
+
+    @classmethod
+    def get_engine(cls) -> Engine:
+        """Get the engine, for work that manages its own sessions."""
+        if cls._engine is None:
+            raise RuntimeError(f"Cannot get engine. Database not connected.")
+        return cls._engine
 
     @classmethod
     def get_session(cls):
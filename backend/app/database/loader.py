@@ -0,0 +1,53 @@
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import Session, selectinload
+from typing import Any
+
+SESSION_INFO_KEY = "data_loader"
+
+
+class DataLoader:
+    """
+    Request-scoped batching of relationship loads.
+
+    The first `load(obj, "relationship")` for a class resolves that relationship
+    for every instance of the class in the session that has not loaded it yet, in
+    one query. The rest of the response build then reads loaded attributes, so a
+    list of N movies costs one genre query instead of N lazy loads. The loader
+    lives on the session, which FastAPI already scopes to the request.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+        self.batches = 0
+
+    @classmethod
+    def for_session(cls, session: Session) -> "DataLoader":
+        """Get the loader of a session, creating it on first use."""
+        loader = session.info.get(SESSION_INFO_KEY)
+        if loader is None:
+            loader = session.info[SESSION_INFO_KEY] = cls(session)
+        return loader
+
+    def _pending(self, model: type, relationship: str) -> list[Any]:
+        """Identities of `model` instances in the session that have not loaded `relationship`."""
+        return [
+            state.identity[0]
+            for state in self._session.identity_map.all_states()
+            if state.class_ is model and state.identity and relationship in state.unloaded
+        ]
+
+    def load(self, instance: Any, relationship: str) -> Any:
+        """Get a relationship of `instance`, batching the load with its siblings."""
+        state = inspect(instance)
+        if relationship in state.unloaded and state.session is self._session:
+            model = state.class_
+            keys = self._pending(model, relationship)
+            primary_key = inspect(model).primary_key[0]
+            statement = (
+                select(model)
+                .where(primary_key.in_(keys))
+                .options(selectinload(getattr(model, relationship)))
+            )
+            self._session.execute(statement).scalars().all()
+            self.batches += 1
+        return getattr(instance, relationship)
@@ -3,17 +3,40 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
-from app.core import settings
+from app.core import settings, TokenRevocationList, IdempotencyStore, Scheduler, booking_references
+from app.core.compression import CompressionMiddleware
+from app.core.profiling import ProfilingMiddleware
 from app.database import Database
 from app.routes import router
+from app.services import (
+    ReservationArchiver, WaitlistPromoter, Notifier, OutboxDispatcher, ScreeningLifecycle, OccupancyForecaster,
+    TicketIssuer
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """"""
+    booking_references.require_key()
+    TicketIssuer.require_key()
     Database.connect(settings.DATABASE_URL)
-    Database.initialize()
+    Database.verify_schema()
+    TokenRevocationList.sync()
+    Notifier.start()
+    # Every worker keeps its own revocation filter and dispatches its share of the outbox;
+    # the other jobs run on one leader at a time.
+    Scheduler.register("token_revocation", settings.TOKEN_REVOCATION_SYNC_SECONDS, TokenRevocationList.sync, leader_only=False)
+    Scheduler.register("outbox", settings.OUTBOX_POLL_SECONDS, OutboxDispatcher.dispatch_pending, leader_only=False)
+    Scheduler.register("waitlist_holds", settings.WAITLIST_SWEEP_SECONDS, WaitlistPromoter.expire_holds)
+    Scheduler.register("screening_lifecycle", settings.LIFECYCLE_INTERVAL_SECONDS, ScreeningLifecycle.run)
+    Scheduler.register("occupancy_forecast", settings.FORECAST_INTERVAL_SECONDS, OccupancyForecaster.refresh)
+    Scheduler.register("reservation_archive", settings.RESERVATION_ARCHIVE_INTERVAL_SECONDS, ReservationArchiver.archive)
+    Scheduler.register("idempotency_keys", settings.IDEMPOTENCY_PURGE_SECONDS, IdempotencyStore.purge_expired)
+    Scheduler.start()
     yield
+    Scheduler.stop()
+    OutboxDispatcher.shutdown()
+    Notifier.stop()
     Database.disconnect()
 
 
@@ -29,7 +52,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Missing-IDs", "X-Profile-Id"],
+)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    cache_paths=settings.COMPRESSION_CACHE_PATHS,
+    cache_max_bytes=settings.COMPRESSION_CACHE_MAX_BYTES,
 )
+if settings.PROFILING_ENABLED:
+    # Outermost, so a profile covers the whole request; not installed at all when disabled.
+    app.add_middleware(
+        ProfilingMiddleware,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        output_dir=settings.PROFILING_OUTPUT_DIR,
+        max_profiles=settings.PROFILING_MAX_PROFILES,
+    )
 app.include_router(router)
 
 
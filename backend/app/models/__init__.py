@@ -1,25 +1,57 @@
-from .auth import UserRole, Token, TokenData, LoginForm
-from .user import UserCreate, UserUpdate, UserResponse
+from .auth import UserRole, Token, TokenData, LoginForm, LoginThrottleStats, RefreshRequest, LogoutRequest
+from .user import UserCreate, UserUpdate, UserResponse, UserImportConflict, UserImportResult
 from .database import (
     BaseSQLModel,
-    User, Movie, Genre, MovieGenre, Theatre,
-    Auditorium, Screening, Seat, Reservation, ReservationSeat
+    RefreshToken, RevokedToken,
+    User, Movie, Genre, MovieGenre, MovieRecommendation, Theatre,
+    Auditorium, Screening, Seat, Reservation, ReservationSeat,
+    ReservationArchive, ReservationSeatArchive, WaitlistEntry, IdempotencyKey, OutboxMessage,
+    RevenueRollup, ScreeningOccupancy, ScreeningForecast, PricingRule,
+    booking_reference_block_seq
 )
 from .genre import GenreCreate, GenreUpdate, GenreResponse
-from .movie import MovieCreate, MovieUpdate, MovieResponse
-from .theatre import TheatreCreate, TheatreUpdate, TheatreResponse
+from .movie import MovieCreate, MovieUpdate, MovieResponse, SimilarMovie, SimilarMoviesResponse
+from .theatre import TheatreCreate, TheatreUpdate, TheatreResponse, NearbyScreening, NearbyTheatre
+from .reservation import (
+    ReservationStatus, ReservationCreate, ReservationResponse, CartCheckout, CartCheckoutResponse,
+    ReservationHistoryItem, ReservationHistoryPage, ArchiveResult
+)
+from .screening import ScreeningCancel, ScreeningCancellationResult, LifecycleResult
+from .waitlist import WAITLIST_MAX_SEATS, WaitlistStatus, WaitlistJoin, WaitlistEntryResponse, WaitlistClaim
+from .outbox import OutboxStatus, IssuedTicket
+from .scheduling import ScheduleMovie, ScheduleRequest, ScheduledScreening, ScheduleResult
+from .pricing import PricingRuleKind, PricingRuleCreate, PricingRuleResponse, SeatPriceResponse
+from .profiling import ProfileSummary, ProfileResponse
+from .analytics import RevenueSummary, DailyRevenue, OccupancyResponse, BackfillResult, ForecastResponse, ForecastResult
 
 __all__ = [
     "BaseSQLModel",
-    "UserRole", "Token", "TokenData", "LoginForm", # Auth
+    "UserRole", "Token", "TokenData", "LoginForm", "LoginThrottleStats", # Auth
+    "RefreshRequest", "LogoutRequest", "RefreshToken", "RevokedToken", # Tokens
     "User", "UserCreate", "UserUpdate", "UserResponse", # User
+    "UserImportConflict", "UserImportResult", # User import
     "Movie", "MovieCreate", "MovieUpdate", "MovieResponse", # Movie
     "Genre", "GenreCreate", "GenreUpdate", "GenreResponse", # Genre
     "MovieGenre", # "Links"
-    "Theatre", "TheatreCreate", "TheatreUpdate", "TheatreResponse", # "Theatre"
+    "MovieRecommendation", "SimilarMovie", "SimilarMoviesResponse", # Recommendations
+    "Theatre", "TheatreCreate", "TheatreUpdate", "TheatreResponse", "NearbyScreening", "NearbyTheatre", # "Theatre"
     "Auditorium", # "Auditorium"
-    "Screening", # "Screening"
+    "Screening", "ScreeningCancel", "ScreeningCancellationResult", "LifecycleResult", # "Screening"
     "Seat", # "Seat"
     "Reservation", # "Reservation"
-    "ReservationSeat" # "Reservation seat"
+    "ReservationSeat", # "Reservation seat"
+    "ReservationArchive", "ReservationSeatArchive", "ArchiveResult", # Reservation archive
+    "booking_reference_block_seq", # Booking reference blocks
+    "WAITLIST_MAX_SEATS", "WaitlistEntry", "WaitlistStatus", "WaitlistJoin", "WaitlistEntryResponse", "WaitlistClaim", # Waitlist
+    "IdempotencyKey", # Idempotency
+    "OutboxMessage", "OutboxStatus", "IssuedTicket", # Outbox
+    "ReservationStatus", "ReservationCreate", "ReservationResponse", # Reservation
+    "ReservationHistoryItem", "ReservationHistoryPage", # Reservation history
+    "CartCheckout", "CartCheckoutResponse", # Cart
+    "RevenueRollup", "ScreeningOccupancy", "ScreeningForecast", # Analytics
+    "RevenueSummary", "DailyRevenue", "OccupancyResponse", "BackfillResult", # Analytics
+    "ForecastResponse", "ForecastResult", # Forecasts
+    "ScheduleMovie", "ScheduleRequest", "ScheduledScreening", "ScheduleResult", # Scheduling
+    "ProfileSummary", "ProfileResponse", # Profiling
+    "PricingRule", "PricingRuleKind", "PricingRuleCreate", "PricingRuleResponse", "SeatPriceResponse", # Pricing
 ]
@@ -0,0 +1,50 @@
+from pydantic import BaseModel
+from decimal import Decimal
+from datetime import date, datetime
+
+
+class RevenueSummary(BaseModel):
+    start: date
+    end: date
+    movie_id: int | None = None
+    theatre_id: int | None = None
+    revenue: Decimal
+    tickets_sold: int
+    reservation_count: int
+
+
+class DailyRevenue(BaseModel):
+    day: date
+    revenue: Decimal
+    tickets_sold: int
+    reservation_count: int
+
+
+class OccupancyResponse(BaseModel):
+    screening_id: int
+    capacity: int
+    seats_sold: int
+    revenue: Decimal
+    occupancy_rate: float
+
+
+class BackfillResult(BaseModel):
+    chunks: int
+    revenue_rows: int
+    occupancy_rows: int
+    elapsed_seconds: float
+
+
+class ForecastResponse(BaseModel):
+    screening_id: int
+    capacity: int
+    forecast_seats: float | None = None
+    fill_rate: float | None = None
+    computed_at: datetime | None = None
+
+
+class ForecastResult(BaseModel):
+    history_screenings: int
+    forecasts: int
+    fit_seconds: float
+    elapsed_seconds: float
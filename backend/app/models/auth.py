@@ -11,11 +11,29 @@ class UserRole(StrEnum):
 class Token(BaseModel):
     access_token: str
     token_type: str = "bearer"
+    expires_in: int | None = None
+    refresh_token: str | None = None
 
 
 class TokenData(BaseModel):
     sub: str | None = None
     role: UserRole | None = None
+    jti: str | None = None
+    iat: float | None = None
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str = Field(max_length=128)
+
+
+class LogoutRequest(BaseModel):
+    refresh_token: str | None = Field(default=None, max_length=128)
+
+
+class LoginThrottleStats(BaseModel):
+    allowed: int
+    rejected_ip: int
+    rejected_username: int
 
 
 class LoginForm(BaseModel):
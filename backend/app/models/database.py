@@ -1,11 +1,15 @@
 from sqlmodel import SQLModel, Field, Relationship, UniqueConstraint, Index
-from sqlalchemy import DateTime, Numeric, CheckConstraint
+from sqlalchemy import ARRAY, DateTime, Float, Integer, Numeric, CheckConstraint, Sequence, Text, text
+from sqlalchemy.dialects.postgresql import JSONB
 from pydantic import EmailStr, field_validator
 from decimal import Decimal
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 from typing import Any, List, Optional
 from .auth import UserRole
 from .reservation import ReservationStatus
+from .pricing import PricingRuleKind
+from .waitlist import WaitlistStatus
+from .outbox import OutboxStatus
 
 
 # ---------- Base ----------
@@ -64,6 +68,34 @@ class User(BaseSQLModel, table=True):
     )
 
 
+# ---------- Tokens ----------
+class RefreshToken(BaseSQLModel, table=True):
+    """
+    One rotation of a refresh token. Only the SHA-256 of the token is stored.
+    Every rotation of a login shares a `family_id`, so reuse of a spent token
+    can revoke the whole chain.
+    """
+    user_id: int = Field(foreign_key="user.id", index=True)
+    token_hash: str = Field(unique=True, max_length=64)
+    family_id: str = Field(index=True, max_length=32)
+    expires_at: datetime = Field(sa_type=DateTime(timezone=True)) # type: ignore
+    used_at: Optional[datetime] = Field(default=None, sa_type=DateTime(timezone=True)) # type: ignore
+    revoked_at: Optional[datetime] = Field(default=None, sa_type=DateTime(timezone=True)) # type: ignore
+
+
+class RevokedToken(SQLModel, table=True):
+    """
+    Authoritative revocation list for access tokens.
+
+    `key` is `jti:<token id>` for a single token or `sub:<user id>` for every
+    token of a user issued up to `revoked_at`. Rows can go once `expires_at`
+    passes, since no token they match is still valid by then.
+    """
+    key: str = Field(primary_key=True, max_length=64)
+    revoked_at: datetime = Field(sa_type=DateTime(timezone=True)) # type: ignore
+    expires_at: datetime = Field(sa_type=DateTime(timezone=True), index=True) # type: ignore
+
+
 # ---------- Movies & Genres ----------
 class MovieGenre(SQLModel, table=True):
     movie_id: int = Field(foreign_key="movie.id", primary_key=True)
@@ -94,6 +126,10 @@ class Movie(BaseSQLModel, table=True):
         back_populates="movie",
         sa_relationship_kwargs={"lazy": "select"}
     )
+    # Link rows only; genre names come from the in-memory GenreRegistry.
+    genre_links: List["MovieGenre"] = Relationship(
+        sa_relationship_kwargs={"lazy": "select", "viewonly": True}
+    )
 
 
 class Genre(BaseSQLModel, table=True):
@@ -108,14 +144,32 @@ class Genre(BaseSQLModel, table=True):
     )
 
 
+class MovieRecommendation(SQLModel, table=True):
+    """Top similar movies of one movie by genre overlap, precomputed so serving is a key lookup."""
+    movie_id: int = Field(foreign_key="movie.id", primary_key=True)
+    similar_movie_ids: List[int] = Field(default_factory=list, sa_type=ARRAY(Integer)) # type: ignore
+    scores: List[float] = Field(default_factory=list, sa_type=ARRAY(Float)) # type: ignore
+    computed_at: datetime = Field(
+        sa_type=DateTime(timezone=True), # type: ignore
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+
+
 # ---------- Theatres & Auditoriums ----------
 class Theatre(BaseSQLModel, table=True):
     __table_args__ = (
         Index('idx_theatre_name', 'name'),
+        # Bounding-box fallback for geo search: a latitude band, then longitude within it.
+        Index('idx_theatre_location', 'latitude', 'longitude', postgresql_where=text("latitude IS NOT NULL")),
+        CheckConstraint('latitude BETWEEN -90 AND 90', name='chk_theatre_latitude'),
+        CheckConstraint('longitude BETWEEN -180 AND 180', name='chk_theatre_longitude'),
+        CheckConstraint('(latitude IS NULL) = (longitude IS NULL)', name='chk_theatre_location_complete'),
     )
     
     name: str = Field(max_length=200)
     address: Optional[str] = Field(default=None, max_length=500)  # Added address
+    latitude: Optional[float] = Field(default=None, sa_type=Float) # type: ignore
+    longitude: Optional[float] = Field(default=None, sa_type=Float) # type: ignore
     is_active: bool = Field(default=True, index=True)
 
     # Relationships
@@ -224,9 +278,14 @@ class Seat(BaseSQLModel, table=True):
 
 
 # ---------- Reservations ----------
+# Each value reserves a block of booking references for one process (see app.core.references).
+booking_reference_block_seq = Sequence("booking_reference_block_seq", metadata=SQLModel.metadata)
+
+
 class Reservation(BaseSQLModel, table=True):
     __table_args__ = (
-        Index('idx_reservation_user_status', 'user_id', 'status'),
+        # Covers keyset pagination of a user's history: (user, status) equality, then newest first.
+        Index('idx_reservation_user_status_created', 'user_id', 'status', 'created_at', 'id'),
         Index('idx_reservation_screening', 'screening_id'),
         Index('idx_reservation_status', 'status'),
         CheckConstraint('total_price >= 0', name='chk_reservation_total_non_negative'),
@@ -286,3 +345,179 @@ class ReservationSeat(SQLModel, table=True):
     # Relationships
     reservation: "Reservation" = Relationship(back_populates="seats")
     seat: "Seat" = Relationship(back_populates="reservations")
+
+
+# ---------- Waitlist ----------
+class WaitlistEntry(BaseSQLModel, table=True):
+    """
+    A user queued for a sold-out screening, FIFO by id.
+
+    Promotion moves an entry to OFFERED and holds `held_seat_ids` for it until
+    `hold_expires_at`; held seats count as taken for everybody else.
+    """
+    __table_args__ = (
+        # Only waiting entries, so neither promotion nor positions scan past ones.
+        Index('idx_waitlist_queue', 'screening_id', 'id', postgresql_where=text("status = 'WAITING'")),
+        Index(
+            'idx_waitlist_queue_size', 'screening_id', 'seats_requested', 'id',
+            postgresql_where=text("status = 'WAITING'")
+        ),
+        Index('idx_waitlist_hold_expiry', 'hold_expires_at', postgresql_where=text("status = 'OFFERED'")),
+        Index(
+            'uq_waitlist_active_user', 'screening_id', 'user_id',
+            unique=True, postgresql_where=text("status IN ('WAITING', 'OFFERED')")
+        ),
+        CheckConstraint('seats_requested > 0', name='chk_waitlist_seats_positive'),
+    )
+
+    screening_id: int = Field(foreign_key="screening.id")
+    user_id: int = Field(foreign_key="user.id", index=True)
+    seats_requested: int = Field(gt=0)
+    status: WaitlistStatus = Field(default=WaitlistStatus.WAITING)
+    held_seat_ids: List[int] = Field(default_factory=list, sa_type=ARRAY(Integer)) # type: ignore
+    offered_at: Optional[datetime] = Field(default=None, sa_type=DateTime(timezone=True)) # type: ignore
+    hold_expires_at: Optional[datetime] = Field(default=None, sa_type=DateTime(timezone=True)) # type: ignore
+
+
+# ---------- Idempotency ----------
+class IdempotencyKey(SQLModel, table=True):
+    """
+    The result of a request sent with an `Idempotency-Key`, committed with it.
+
+    `scope` is the user and operation the key was used for, `fingerprint` a
+    hash of the request. `booking_reference` is what a replay returns; a cart
+    checkout stores its references comma-separated. Rows can go once
+    `expires_at` passes.
+    """
+    scope: str = Field(primary_key=True, max_length=64)
+    key: str = Field(primary_key=True, max_length=255)
+    fingerprint: str = Field(max_length=64)
+    booking_reference: str = Field(sa_type=Text) # type: ignore
+    created_at: datetime = Field(
+        sa_type=DateTime(timezone=True), # type: ignore
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+    expires_at: datetime = Field(sa_type=DateTime(timezone=True), index=True) # type: ignore
+
+
+# ---------- Outbox ----------
+class OutboxMessage(SQLModel, table=True):
+    """
+    Work to do once a transaction commits, written in that same transaction.
+
+    A message exists if and only if the change that produced it committed;
+    the dispatcher delivers it at least once, retrying with backoff.
+    """
+    __table_args__ = (
+        # Only pending messages, so claiming a batch never scans processed ones.
+        Index('idx_outbox_pending', 'available_at', 'id', postgresql_where=text("status = 'PENDING'")),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    topic: str = Field(max_length=50)
+    payload: dict[str, Any] = Field(default_factory=dict, sa_type=JSONB) # type: ignore
+    status: OutboxStatus = Field(default=OutboxStatus.PENDING)
+    attempts: int = Field(default=0)
+    last_error: Optional[str] = Field(default=None, max_length=1000)
+    created_at: datetime = Field(
+        sa_type=DateTime(timezone=True), # type: ignore
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+    available_at: datetime = Field(
+        sa_type=DateTime(timezone=True), # type: ignore
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+    processed_at: Optional[datetime] = Field(default=None, sa_type=DateTime(timezone=True)) # type: ignore
+
+
+# ---------- Reservation archive ----------
+class ReservationArchive(BaseSQLModel, table=True):
+    """Reservations of screenings that are over, moved out of the hot tables by the archiver."""
+    __table_args__ = (
+        Index('idx_reservation_archive_user_created', 'user_id', 'created_at'),
+    )
+
+    id: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    status: ReservationStatus
+    total_price: Decimal = Field(sa_type=Numeric(10, 2)) # type: ignore
+    user_id: int = Field(foreign_key="user.id")
+    screening_id: int = Field(foreign_key="screening.id", index=True)
+    cancelled_at: Optional[datetime] = Field(
+        default=None,
+        sa_type=DateTime(timezone=True) # type: ignore
+    )
+    booking_reference: Optional[str] = Field(default=None, unique=True, max_length=20)
+    notes: Optional[str] = Field(default=None, max_length=500)
+    archived_at: datetime = Field(
+        sa_type=DateTime(timezone=True), # type: ignore
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+
+    # Relationships
+    seats: List["ReservationSeatArchive"] = Relationship(back_populates="reservation")
+
+
+class ReservationSeatArchive(SQLModel, table=True):
+    reservation_id: int = Field(foreign_key="reservationarchive.id", primary_key=True)
+    seat_id: int = Field(foreign_key="seat.id", primary_key=True)
+    price_paid: Decimal = Field(sa_type=Numeric(10, 2)) # type: ignore
+
+    # Relationships
+    reservation: "ReservationArchive" = Relationship(back_populates="seats")
+
+
+# ---------- Analytics ----------
+class RevenueRollup(SQLModel, table=True):
+    """Revenue per movie, theatre and screening day, maintained incrementally."""
+    __table_args__ = (
+        Index('idx_revenue_rollup_movie_day', 'movie_id', 'day'),
+        Index('idx_revenue_rollup_theatre_day', 'theatre_id', 'day'),
+    )
+
+    day: date = Field(primary_key=True)
+    movie_id: int = Field(foreign_key="movie.id", primary_key=True)
+    theatre_id: int = Field(foreign_key="theatre.id", primary_key=True)
+    revenue: Decimal = Field(
+        default=Decimal("0"),
+        sa_type=Numeric(12, 2), # type: ignore
+        description="Sum of total_price over booked and completed reservations"
+    )
+    tickets_sold: int = Field(default=0)
+    reservation_count: int = Field(default=0)
+
+
+class ScreeningOccupancy(SQLModel, table=True):
+    """Seats sold per screening, maintained incrementally."""
+    screening_id: int = Field(foreign_key="screening.id", primary_key=True)
+    capacity: int = Field(default=0, ge=0)
+    seats_sold: int = Field(default=0)
+    revenue: Decimal = Field(
+        default=Decimal("0"),
+        sa_type=Numeric(12, 2) # type: ignore
+    )
+
+
+class ScreeningForecast(SQLModel, table=True):
+    """Seats an upcoming screening is expected to sell, recomputed in the background."""
+    screening_id: int = Field(foreign_key="screening.id", primary_key=True)
+    capacity: int = Field(default=0, ge=0)
+    forecast_seats: float = Field(default=0.0, ge=0)
+    fill_rate: float = Field(default=0.0, ge=0, le=1)
+    computed_at: datetime = Field(sa_type=DateTime(timezone=True)) # type: ignore
+
+
+# ---------- Pricing ----------
+class PricingRule(BaseSQLModel, table=True):
+    __table_args__ = (
+        Index('idx_pricing_rule_kind_active', 'kind', 'is_active'),
+        CheckConstraint('multiplier > 0', name='chk_pricing_rule_multiplier_positive'),
+    )
+
+    kind: PricingRuleKind = Field(index=True)
+    key: str = Field(max_length=20)  # seat type, hour range "18-23", weekday "5", occupancy or forecast "0.8"
+    multiplier: Decimal = Field(
+        sa_type=Numeric(6, 3), # type: ignore
+        gt=0,
+        description="Factor applied to the base price when the rule matches"
+    )
+    is_active: bool = Field(default=True, index=True)
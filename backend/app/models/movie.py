@@ -65,3 +65,14 @@ class MovieResponse(BaseModel):
 
     created_at: datetime
     updated_at: datetime
+
+
+class SimilarMovie(BaseModel):
+    movie_id: int
+    score: float
+
+
+class SimilarMoviesResponse(BaseModel):
+    movie_id: int
+    similar: list[SimilarMovie]
+    computed_at: datetime | None
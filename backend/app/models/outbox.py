@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from datetime import datetime
+from decimal import Decimal
+from enum import StrEnum
+
+
+class OutboxStatus(StrEnum):
+    PENDING = "pending"
+    PROCESSED = "processed"
+    FAILED = "failed"  # gave up after OUTBOX_MAX_ATTEMPTS
+
+
+class IssuedTicket(BaseModel):
+    """Everything printed on a ticket and its confirmation message."""
+    booking_reference: str
+    username: str
+    email: str
+    movie_title: str
+    theatre_name: str
+    auditorium_name: str
+    start_time: datetime
+    seats: list[str]
+    total_price: Decimal
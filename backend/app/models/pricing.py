@@ -0,0 +1,64 @@
+from pydantic import BaseModel, Field, model_validator
+from decimal import Decimal
+from datetime import datetime
+from enum import StrEnum
+from typing import Any
+
+
+class PricingRuleKind(StrEnum):
+    SEAT_TYPE = "seat_type"
+    HOUR = "hour"
+    WEEKDAY = "weekday"
+    OCCUPANCY = "occupancy"
+    FORECAST = "forecast"
+
+
+class PricingRuleCreate(BaseModel):
+    kind: PricingRuleKind
+    key: str = Field(max_length=20)
+    multiplier: Decimal = Field(gt=0, max_digits=6, decimal_places=3)
+
+    @model_validator(mode="after")
+    def validate_key(self) -> "PricingRuleCreate":
+        if self.kind == PricingRuleKind.HOUR:
+            start, _, end = self.key.partition("-")
+            if not all(part.isdigit() and int(part) < 24 for part in (start, end or start)):
+                raise ValueError("Hour rules take an hour '18' or a range '18-23'")
+        elif self.kind == PricingRuleKind.WEEKDAY:
+            if not (self.key.isdigit() and int(self.key) < 7):
+                raise ValueError("Weekday rules take 0 (Monday) to 6 (Sunday)")
+        elif self.kind in (PricingRuleKind.OCCUPANCY, PricingRuleKind.FORECAST):
+            try:
+                threshold = float(self.key)
+            except ValueError:
+                threshold = -1.0
+            if not 0.0 <= threshold <= 1.0:
+                raise ValueError("Occupancy and forecast rules take a threshold between 0 and 1")
+        return self
+
+    class Config:
+        json_schema_extra: dict[str, Any] = {
+            "example": {
+                "kind": "hour",
+                "key": "18-23",
+                "multiplier": "1.2"
+            }
+        }
+
+
+class PricingRuleResponse(BaseModel):
+    id: int
+    kind: PricingRuleKind
+    key: str
+    multiplier: Decimal
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+
+
+class SeatPriceResponse(BaseModel):
+    seat_id: int
+    seat_identifier: str
+    seat_type: str | None
+    price: Decimal
+    is_available: bool
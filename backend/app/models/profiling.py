@@ -0,0 +1,20 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+
+class ProfileSummary(BaseModel):
+    id: str
+    method: str
+    path: str
+    status_code: int
+    started_at: datetime
+    wall_ms: float
+    samples: int
+    breakdown_ms: dict[str, float] = Field(
+        description="Wall time split into db, serialization, bcrypt, application and waiting"
+    )
+
+
+class ProfileResponse(ProfileSummary):
+    interval_ms: float
+    stacks: dict[str, int] = Field(description="Samples per call stack, outermost frame first, frames joined by ';'")
@@ -1,4 +1,8 @@
+from pydantic import BaseModel, Field
+from decimal import Decimal
+from datetime import datetime
 from enum import StrEnum
+from typing import Any
 
 
 class ReservationStatus(StrEnum):
@@ -7,3 +11,74 @@ class ReservationStatus(StrEnum):
     COMPLETED = "completed"
     EXPIRED = "expired"
 
+
+class ReservationCreate(BaseModel):
+    screening_id: int
+    seat_ids: list[int] = Field(min_length=1, max_length=20)
+    notes: str | None = Field(default=None, max_length=500)
+
+    class Config:
+        json_schema_extra: dict[str, Any] = {
+            "example": {
+                "screening_id": 1,
+                "seat_ids": [12, 13],
+                "notes": "Aisle seats please"
+            }
+        }
+
+
+class CartCheckout(BaseModel):
+    items: list[ReservationCreate] = Field(min_length=1, max_length=10, description="One item per screening")
+
+    class Config:
+        json_schema_extra: dict[str, Any] = {
+            "example": {
+                "items": [
+                    {"screening_id": 1, "seat_ids": [12, 13]},
+                    {"screening_id": 2, "seat_ids": [40, 41]}
+                ]
+            }
+        }
+
+
+class ReservationResponse(BaseModel):
+    id: int
+    booking_reference: str | None
+    status: ReservationStatus
+    screening_id: int
+    user_id: int
+    total_price: Decimal
+    seat_ids: list[int]
+    created_at: datetime
+    cancelled_at: datetime | None
+
+
+class CartCheckoutResponse(BaseModel):
+    reservations: list[ReservationResponse]
+    total_price: Decimal
+
+
+class ReservationHistoryItem(BaseModel):
+    id: int
+    booking_reference: str | None
+    status: ReservationStatus
+    total_price: Decimal
+    created_at: datetime
+    screening_id: int
+    start_time: datetime
+    movie_title: str
+    theatre_name: str
+    auditorium_name: str
+    seats: list[str]
+
+
+class ReservationHistoryPage(BaseModel):
+    items: list[ReservationHistoryItem]
+    next_cursor: str | None
+
+
+class ArchiveResult(BaseModel):
+    cutoff: datetime
+    reservations: int
+    seats: int
+    elapsed_seconds: float
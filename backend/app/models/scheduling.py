@@ -0,0 +1,60 @@
+from pydantic import BaseModel, Field, model_validator
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any
+
+
+class ScheduleMovie(BaseModel):
+    movie_id: int
+    popularity: float | None = Field(
+        default=None, gt=0, le=1, description="Expected share of seats sold at prime time; from history when omitted"
+    )
+    base_price: Decimal | None = Field(default=None, gt=0, max_digits=10, decimal_places=2)
+
+
+class ScheduleRequest(BaseModel):
+    week_start: date
+    movies: list[ScheduleMovie] = Field(min_length=1, max_length=50)
+    auditorium_ids: list[int] | None = Field(default=None, description="Defaults to every active auditorium")
+    opens_at: time = time(10, 0)
+    closes_at: time = Field(default=time(0, 0), description="Screenings end by then; before opens_at means the next day")
+    cleaning_minutes: int = Field(default=20, ge=0, le=120)
+    base_price: Decimal = Field(gt=0, max_digits=10, decimal_places=2)
+    dry_run: bool = False
+
+    @model_validator(mode="after")
+    def validate_movies(self) -> "ScheduleRequest":
+        if len({movie.movie_id for movie in self.movies}) != len(self.movies):
+            raise ValueError("Each movie can appear only once")
+        return self
+
+    class Config:
+        json_schema_extra: dict[str, Any] = {
+            "example": {
+                "week_start": "2030-01-07",
+                "movies": [{"movie_id": 1}, {"movie_id": 2, "popularity": 0.8}],
+                "opens_at": "10:00",
+                "closes_at": "00:00",
+                "cleaning_minutes": 20,
+                "base_price": "12.50"
+            }
+        }
+
+
+class ScheduledScreening(BaseModel):
+    movie_id: int
+    auditorium_id: int
+    start_time: datetime
+    end_time: datetime
+    expected_seats: float
+
+
+class ScheduleResult(BaseModel):
+    theatre_id: int
+    week_start: date
+    screenings: list[ScheduledScreening]
+    expected_seats_sold: float
+    greedy_expected_seats_sold: float
+    iterations: int
+    created: int
+    elapsed_seconds: float
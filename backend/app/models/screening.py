@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+
+
+class ScreeningCancel(BaseModel):
+    reason: str | None = Field(default=None, max_length=200)
+
+
+class ScreeningCancellationResult(BaseModel):
+    screening_id: int
+    reservations: int
+    seats: int
+    refunds_queued: int
+    waitlist_entries: int
+    elapsed_seconds: float
+
+
+class LifecycleResult(BaseModel):
+    reservations_completed: int
+    screenings_deactivated: int
+    screenings_reconciled: int
+    elapsed_seconds: float
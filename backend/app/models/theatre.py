@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from datetime import datetime
 from typing import Any
 
@@ -6,6 +6,14 @@ from typing import Any
 class BaseTheatre(BaseModel):
     name: str = Field(max_length=200)
     address: str | None = Field(default=None, max_length=500)
+    latitude: float | None = Field(default=None, ge=-90, le=90)
+    longitude: float | None = Field(default=None, ge=-180, le=180)
+
+    @model_validator(mode="after")
+    def validate_location(self) -> "BaseTheatre":
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValueError("Give both latitude and longitude, or neither")
+        return self
 
 
 class TheatreCreate(BaseTheatre):
@@ -14,7 +22,9 @@ class TheatreCreate(BaseTheatre):
         json_schema_extra: dict[str, Any] = {
             "example": {
                 "name": "Towers Theatre",
-                "address": "123 Main Street, Downtown, Johannesburg, South Africa"
+                "address": "123 Main Street, Downtown, Johannesburg, South Africa",
+                "latitude": -26.2041,
+                "longitude": 28.0473
             }
         }
 
@@ -22,12 +32,22 @@ class TheatreCreate(BaseTheatre):
 class TheatreUpdate(BaseModel):
     name: str | None = Field(default=None, max_length=200)
     address: str | None = Field(default=None, max_length=500)
+    latitude: float | None = Field(default=None, ge=-90, le=90)
+    longitude: float | None = Field(default=None, ge=-180, le=180)
+
+    @model_validator(mode="after")
+    def validate_location(self) -> "TheatreUpdate":
+        if (self.latitude is None) != (self.longitude is None):
+            raise ValueError("Give both latitude and longitude, or neither")
+        return self
 
     class Config:
         json_schema_extra: dict[str, Any] = {
             "example": {
                 "name": "Cineplex Grand",
-                "address": "456 Ocean Drive, Cape Town, South Africa"
+                "address": "456 Ocean Drive, Cape Town, South Africa",
+                "latitude": -33.9249,
+                "longitude": 18.4241
             }
         }
 
@@ -39,3 +59,19 @@ class TheatreResponse(BaseTheatre):
     created_at: datetime
     updated_at: datetime
     deleted_at: datetime | None
+
+
+class NearbyScreening(BaseModel):
+    id: int
+    movie_id: int
+    auditorium_name: str
+    start_time: datetime
+    end_time: datetime
+    available_seats: int
+
+
+class NearbyTheatre(TheatreResponse):
+    distance_km: float
+    screenings: list[NearbyScreening] = Field(
+        default_factory=list, description="Matching showtimes, when searching by movie"
+    )
@@ -55,3 +55,18 @@ class AdminUserUpdate(BaseModel):
                 "is_active": False,
             }
         }
+
+
+class UserImportConflict(BaseModel):
+    line: int = PField(description="Line of the CSV file, the header being line 1")
+    username: str | None = None
+    email: str | None = None
+    reason: str
+
+
+class UserImportResult(BaseModel):
+    received: int
+    created: int
+    conflicts: list[UserImportConflict]
+    hash_seconds: float
+    elapsed_seconds: float
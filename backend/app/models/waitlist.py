@@ -0,0 +1,44 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from enum import StrEnum
+from typing import Any
+
+
+WAITLIST_MAX_SEATS: int = 20
+
+
+class WaitlistStatus(StrEnum):
+    WAITING = "waiting"
+    OFFERED = "offered"  # promoted: seats are held until hold_expires_at
+    CLAIMED = "claimed"
+    EXPIRED = "expired"
+    LEFT = "left"
+
+
+class WaitlistJoin(BaseModel):
+    screening_id: int
+    seats: int = Field(default=1, ge=1, le=WAITLIST_MAX_SEATS)
+
+    class Config:
+        json_schema_extra: dict[str, Any] = {
+            "example": {
+                "screening_id": 1,
+                "seats": 2
+            }
+        }
+
+
+class WaitlistEntryResponse(BaseModel):
+    id: int
+    screening_id: int
+    user_id: int
+    seats_requested: int
+    status: WaitlistStatus
+    position: int | None = Field(default=None, description="Waiters ahead of this entry, while waiting")
+    held_seat_ids: list[int]
+    hold_expires_at: datetime | None
+    created_at: datetime
+
+
+class WaitlistClaim(BaseModel):
+    notes: str | None = Field(default=None, max_length=500)
@@ -4,6 +4,12 @@ from .user import router as user_router
 from .genre import router as genre_router
 from .movie import router as movie_router
 from .theatre import router as theatre_router
+from .screening import router as screening_router
+from .reservation import router as reservation_router
+from .waitlist import router as waitlist_router
+from .pricing import router as pricing_router
+from .analytics import router as analytics_router
+from .profiles import router as profiles_router
 
 router = APIRouter(prefix="/api")
 router.include_router(auth_router)
@@ -11,3 +17,9 @@ router.include_router(user_router)
 router.include_router(genre_router)
 router.include_router(movie_router)
 router.include_router(theatre_router)
+router.include_router(screening_router)
+router.include_router(reservation_router)
+router.include_router(waitlist_router)
+router.include_router(pricing_router)
+router.include_router(analytics_router)
+router.include_router(profiles_router)
@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Depends, BackgroundTasks, Query
+from datetime import date
+from app.core import require_role
+from app.models import UserRole, RevenueSummary, DailyRevenue, OccupancyResponse, ForecastResponse
+from app.services import AnalyticsServiceDep, RevenueRollups, OccupancyForecaster
+
+router = APIRouter(
+    prefix="/analytics",
+    tags=["Analytics"],
+    dependencies=[Depends(require_role(UserRole.ADMIN))]
+)
+
+
+@router.get("/revenue", response_model=RevenueSummary, status_code=200)
+async def get_revenue(
+    service: AnalyticsServiceDep,
+    start: date,
+    end: date,
+    movie_id: int | None = None,
+    theatre_id: int | None = None
+) -> RevenueSummary:
+    """Total revenue between two screening days (inclusive)."""
+    return await service.get_revenue(start, end, movie_id, theatre_id)
+
+
+@router.get("/revenue/daily", response_model=list[DailyRevenue], status_code=200)
+async def get_daily_revenue(
+    service: AnalyticsServiceDep,
+    start: date,
+    end: date,
+    movie_id: int | None = None,
+    theatre_id: int | None = None
+) -> list[DailyRevenue]:
+    """Revenue per screening day between two days (inclusive)."""
+    return await service.get_daily_revenue(start, end, movie_id, theatre_id)
+
+
+@router.get("/occupancy/{screening_id}", response_model=OccupancyResponse, status_code=200)
+async def get_screening_occupancy(screening_id: int, service: AnalyticsServiceDep) -> OccupancyResponse:
+    """Seats sold versus capacity for one screening."""
+    return await service.get_screening_occupancy(screening_id)
+
+
+@router.get("/forecast/{screening_id}", response_model=ForecastResponse, status_code=200)
+async def get_screening_forecast(screening_id: int, service: AnalyticsServiceDep) -> ForecastResponse:
+    """Seats an upcoming screening is expected to sell; empty until the forecasts next refresh."""
+    return await service.get_screening_forecast(screening_id)
+
+
+@router.post("/forecast/refresh", response_model=None, status_code=202)
+async def refresh_forecasts(background_tasks: BackgroundTasks) -> None:
+    """Refit the occupancy model and recompute every upcoming screening's forecast in the background."""
+    background_tasks.add_task(OccupancyForecaster.refresh)
+
+
+@router.post("/backfill", response_model=None, status_code=202)
+async def backfill_rollups(
+    background_tasks: BackgroundTasks,
+    chunks: int = Query(8, ge=1, le=256),
+    workers: int = Query(4, ge=1, le=32)
+) -> None:
+    """Rebuild the analytics rollups from the reservations table in the background."""
+    background_tasks.add_task(RevenueRollups.backfill, chunks, workers)
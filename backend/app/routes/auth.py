@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
-from app.models import Token, UserResponse
+from app.core import LoginThrottle, require_role
+from app.models import Token, UserResponse, UserRole, LoginThrottleStats, RefreshRequest, LogoutRequest
 from app.services import AuthServiceDep
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -11,11 +12,40 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 @router.post("/login", response_model=Token, status_code=201)
 async def login(
+    request: Request,
     service: AuthServiceDep,
     form: OAuth2PasswordRequestForm = Depends(),
 ) -> Token:
-    """Authenticate a user and return an access token."""
-    return await service.login_for_access_token(form.username, form.password)
+    """Authenticate a user and return an access and a refresh token."""
+    client_ip = request.client.host if request.client else None
+    return await service.login_for_access_token(form.username, form.password, client_ip)
+
+
+@router.post("/refresh", response_model=Token, status_code=201)
+async def refresh(payload: RefreshRequest, service: AuthServiceDep) -> Token:
+    """Exchange a refresh token for a new access and refresh token. Each refresh token works once."""
+    return await service.refresh_tokens(payload.refresh_token)
+
+
+@router.post("/logout", status_code=204)
+async def logout(
+    service: AuthServiceDep,
+    payload: LogoutRequest | None = None,
+    token: str = Depends(oauth2_scheme),
+) -> None:
+    """Revoke the current access token and, if given, its refresh token."""
+    await service.logout(token, payload.refresh_token if payload else None)
+
+
+@router.get(
+    "/login/stats",
+    response_model=LoginThrottleStats,
+    status_code=200,
+    dependencies=[Depends(require_role(UserRole.ADMIN))]
+)
+async def get_login_stats() -> LoginThrottleStats:
+    """Allowed and throttled login attempts seen by this worker."""
+    return LoginThrottleStats(**LoginThrottle.stats())
 
 
 @router.get("/me", response_model=UserResponse, status_code=200)
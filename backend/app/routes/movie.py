@@ -1,6 +1,9 @@
-from fastapi import APIRouter, Query
-from app.services import MovieServiceDep
-from app.models import MovieCreate, MovieUpdate, MovieResponse
+from fastapi import APIRouter, Depends, Query, Response
+import asyncio
+from app.core import require_role
+from app.services import MovieServiceDep, RecommendationServiceDep, SimilarMovies
+from app.models import MovieCreate, MovieUpdate, MovieResponse, SimilarMoviesResponse, UserRole
+from .params import IdList, report_missing
 
 router = APIRouter(prefix="/movies", tags=["Movies"])
 
@@ -14,13 +17,39 @@ async def create_movie(payload: MovieCreate, service: MovieServiceDep) -> MovieR
 @router.get("/", response_model=list[MovieResponse], status_code=200)
 async def get_all_movies(
     service: MovieServiceDep,
+    response: Response,
+    ids: IdList,
     offset: int = Query(0),
     limit: int = Query(100, le=1000)
 ) -> list[MovieResponse]:
-    """Get all movies in the database (limit is 1000)"""
+    """
+    Get all movies in the database (limit is 1000).
+    With `ids`, get those movies in request order; IDs not found are listed in X-Missing-IDs.
+    """
+    if ids is not None:
+        movies, missing = await service.get_movies_by_ids(ids)
+        report_missing(response, missing)
+        return movies
     return await service.get_all_movies(offset, limit)
 
 
+@router.post(
+    "/similar/rebuild",
+    response_model=None,
+    status_code=204,
+    dependencies=[Depends(require_role(UserRole.ADMIN))]
+)
+async def rebuild_similar_movies() -> None:
+    """Recompute the similar movies of the whole catalog."""
+    await asyncio.to_thread(SimilarMovies.rebuild)
+
+
+@router.get("/{movie_id}/similar", response_model=SimilarMoviesResponse, status_code=200)
+async def get_similar_movies(movie_id: int, service: RecommendationServiceDep) -> SimilarMoviesResponse:
+    """Get movies similar to this one by genre overlap, best first."""
+    return await service.get_similar_movies(movie_id)
+
+
 @router.get("/{movie_id}", response_model=MovieResponse, status_code=200)
 async def get_one_movie(movie_id: int, service: MovieServiceDep) -> MovieResponse:
     """Get one movie by its ID."""
@@ -0,0 +1,27 @@
+from fastapi import Depends, Query, Response
+from typing import Annotated
+from app.utils.exceptions import BadRequestException
+from app.utils.helpers import parse_id_list
+
+MISSING_IDS_HEADER = "X-Missing-IDs"
+
+
+def id_list(
+    ids: str | None = Query(None, description="Comma separated IDs to fetch in one request, e.g. 1,2,3")
+) -> list[int] | None:
+    """Parse the `ids` query parameter used by batch fetch endpoints."""
+    if ids is None:
+        return None
+    try:
+        return parse_id_list(ids)
+    except ValueError as e:
+        raise BadRequestException(str(e))
+
+
+def report_missing(response: Response, missing: list[int]) -> None:
+    """Report IDs that were requested but not found."""
+    if missing:
+        response.headers[MISSING_IDS_HEADER] = ",".join(str(i) for i in missing)
+
+
+IdList = Annotated[list[int] | None, Depends(id_list)]
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends
+from app.core import require_role
+from app.models import UserRole, PricingRuleCreate, PricingRuleResponse
+from app.services import PricingServiceDep
+
+router = APIRouter(
+    prefix="/pricing",
+    tags=["Pricing"],
+    dependencies=[Depends(require_role(UserRole.ADMIN))]
+)
+
+
+@router.post("/rules", response_model=PricingRuleResponse, status_code=201)
+async def create_pricing_rule(payload: PricingRuleCreate, service: PricingServiceDep) -> PricingRuleResponse:
+    """Create a pricing rule."""
+    return await service.create_rule(payload)
+
+
+@router.get("/rules", response_model=list[PricingRuleResponse], status_code=200)
+async def get_pricing_rules(service: PricingServiceDep) -> list[PricingRuleResponse]:
+    """Get all active pricing rules."""
+    return await service.get_all_rules()
+
+
+@router.delete("/rules/{rule_id}", response_model=None, status_code=204)
+async def delete_pricing_rule(rule_id: int, service: PricingServiceDep) -> None:
+    """Soft delete a pricing rule."""
+    await service.delete_rule(rule_id)
@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
+from app.core import settings, require_role
+from app.core.profiling import ProfileStore
+from app.models import UserRole, ProfileSummary, ProfileResponse
+from app.utils.exceptions import NotFoundException
+
+router = APIRouter(
+    prefix="/profiles",
+    tags=["Profiling"],
+    dependencies=[Depends(require_role(UserRole.ADMIN))]
+)
+
+
+def _load(profile_id: str) -> ProfileResponse:
+    profile = ProfileStore(settings.PROFILING_OUTPUT_DIR).load(profile_id)
+    if profile is None:
+        raise NotFoundException("Profile not found")
+    return profile
+
+
+@router.get("/", response_model=list[ProfileSummary], status_code=200)
+async def get_profiles(limit: int = Query(50, ge=1, le=1000)) -> list[ProfileSummary]:
+    """Stored request profiles, newest first."""
+    return ProfileStore(settings.PROFILING_OUTPUT_DIR).list(limit)
+
+
+@router.get("/{profile_id}", response_model=ProfileResponse, status_code=200)
+async def get_profile(profile_id: str) -> ProfileResponse:
+    """One profile with its time breakdown and sampled stacks."""
+    return _load(profile_id)
+
+
+@router.get("/{profile_id}/collapsed", response_class=PlainTextResponse, status_code=200)
+async def get_collapsed_stacks(profile_id: str) -> str:
+    """The sampled stacks in collapsed format, for flamegraph.pl or speedscope."""
+    return "".join(f"{stack} {count}\n" for stack, count in _load(profile_id).stacks.items())
@@ -0,0 +1,90 @@
+from fastapi import APIRouter, Depends, Header, Query
+from typing import Annotated
+import asyncio
+from app.core import require_role
+from app.models import (
+    UserRole, UserResponse, ReservationStatus, ReservationCreate, ReservationResponse,
+    ReservationHistoryPage, ArchiveResult, CartCheckout, CartCheckoutResponse
+)
+from app.services import ReservationServiceDep, ReservationArchiver
+
+router = APIRouter(prefix="/reservations", tags=["Reservations"])
+
+CurrentUser = Annotated[UserResponse, Depends(require_role(UserRole.USER, UserRole.ADMIN))]
+IdempotencyKey = Annotated[str | None, Header(alias="Idempotency-Key", max_length=255)]
+
+
+@router.post("/", response_model=ReservationResponse, status_code=201)
+async def create_reservation(
+    payload: ReservationCreate,
+    service: ReservationServiceDep,
+    user: CurrentUser,
+    idempotency_key: IdempotencyKey = None
+) -> ReservationResponse:
+    """Book seats for a screening. Retries with the same Idempotency-Key replay the first result."""
+    return await service.create_reservation(user, payload, idempotency_key)
+
+
+@router.post("/checkout", response_model=CartCheckoutResponse, status_code=201)
+async def checkout_cart(
+    payload: CartCheckout,
+    service: ReservationServiceDep,
+    user: CurrentUser,
+    idempotency_key: IdempotencyKey = None
+) -> CartCheckoutResponse:
+    """Book seats across several screenings at once; either every item is booked or none is."""
+    return await service.checkout_cart(user, payload, idempotency_key)
+
+
+@router.get("/", response_model=ReservationHistoryPage, status_code=200)
+async def get_my_reservations(
+    service: ReservationServiceDep,
+    user: CurrentUser,
+    status: ReservationStatus | None = None,
+    cursor: str | None = Query(None, description="`next_cursor` of the previous page"),
+    limit: int = Query(20, ge=1, le=100)
+) -> ReservationHistoryPage:
+    """Get the current user's reservations with movie, theatre, showtime and seats, newest first."""
+    return await service.get_user_reservations(user, status, cursor, limit)
+
+
+@router.post(
+    "/archive",
+    response_model=ArchiveResult,
+    status_code=200,
+    dependencies=[Depends(require_role(UserRole.ADMIN))]
+)
+async def archive_reservations() -> ArchiveResult:
+    """Move reservations of screenings that are over into the archive now."""
+    return await asyncio.to_thread(ReservationArchiver.archive)
+
+
+@router.get("/by-reference/{booking_reference}", response_model=ReservationResponse, status_code=200)
+async def get_reservation_by_reference(
+    booking_reference: str,
+    service: ReservationServiceDep,
+    user: CurrentUser
+) -> ReservationResponse:
+    """Get one reservation by its booking reference."""
+    return await service.get_user_reservation_by_reference(user, booking_reference)
+
+
+@router.get("/{reservation_id}", response_model=ReservationResponse, status_code=200)
+async def get_one_reservation(
+    reservation_id: int,
+    service: ReservationServiceDep,
+    user: CurrentUser
+) -> ReservationResponse:
+    """Get one reservation by its ID."""
+    return await service.get_one_reservation(user, reservation_id)
+
+
+@router.post("/{reservation_id}/cancel", response_model=ReservationResponse, status_code=200)
+async def cancel_reservation(
+    reservation_id: int,
+    service: ReservationServiceDep,
+    user: CurrentUser,
+    idempotency_key: IdempotencyKey = None
+) -> ReservationResponse:
+    """Cancel a reservation. Retries with the same Idempotency-Key replay the first result."""
+    return await service.cancel_reservation(user, reservation_id, idempotency_key)
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends
+from app.core import require_role
+from app.models import UserRole, SeatPriceResponse, ScreeningCancel, ScreeningCancellationResult
+from app.services import ScreeningServiceDep
+
+router = APIRouter(prefix="/screenings", tags=["Screenings"])
+
+
+@router.get("/{screening_id}/seats", response_model=list[SeatPriceResponse], status_code=200)
+async def get_seat_map(screening_id: int, service: ScreeningServiceDep) -> list[SeatPriceResponse]:
+    """Get the seat map of a screening with prices and availability."""
+    return await service.get_seat_map(screening_id)
+
+
+@router.post(
+    "/{screening_id}/cancel",
+    response_model=ScreeningCancellationResult,
+    status_code=200,
+    dependencies=[Depends(require_role(UserRole.ADMIN))]
+)
+async def cancel_screening(
+    screening_id: int,
+    service: ScreeningServiceDep,
+    payload: ScreeningCancel | None = None
+) -> ScreeningCancellationResult:
+    """Cancel a screening: every booking is cancelled and refunded, waitlisted users are told."""
+    return await service.cancel_screening(screening_id, payload.reason if payload else None)
@@ -1,6 +1,9 @@
-from fastapi import APIRouter, Query
-from app.models import TheatreCreate, TheatreUpdate, TheatreResponse
-from app.services import TheatreServiceDep
+from fastapi import APIRouter, Depends, Query, Response
+from datetime import datetime
+from app.core import require_role
+from app.models import UserRole, TheatreCreate, TheatreUpdate, TheatreResponse, NearbyTheatre, ScheduleRequest, ScheduleResult
+from app.services import TheatreServiceDep, ScheduleServiceDep
+from .params import IdList, report_missing
 
 router = APIRouter(prefix="/theatres", tags=["Theatres"])
 
@@ -14,20 +17,47 @@ async def create_theatre(payload: TheatreCreate, service: TheatreServiceDep) ->
 @router.get("/", response_model=list[TheatreResponse], status_code=200)
 async def get_theatres(
     service: TheatreServiceDep,
+    response: Response,
+    ids: IdList,
     offset: int = Query(0),
     limit: int = Query(100, le=1000)
     ) -> list[TheatreResponse]:
-    """Get all theatres."""
+    """
+    Get all theatres.
+    With `ids`, get those theatres in request order; IDs not found are listed in X-Missing-IDs.
+    """
+    if ids is not None:
+        theatres, missing = await service.get_theatres_by_ids(ids)
+        report_missing(response, missing)
+        return theatres
     return await service.get_all_theatres(offset, limit)
 
 
+@router.get("/nearby", response_model=list[NearbyTheatre], status_code=200)
+async def get_nearby_theatres(
+    service: TheatreServiceDep,
+    lat: float = Query(ge=-90, le=90),
+    lon: float = Query(ge=-180, le=180),
+    limit: int = Query(10, ge=1, le=50),
+    radius_km: float | None = Query(None, gt=0),
+    movie_id: int | None = Query(None, description="Only theatres showing this movie"),
+    starts_after: datetime | None = Query(None, description="Showtime window start; defaults to now"),
+    starts_before: datetime | None = Query(None, description="Showtime window end, e.g. midnight for 'tonight'")
+) -> list[NearbyTheatre]:
+    """
+    Get the theatres nearest to a point, nearest first, optionally within `radius_km`.
+    With `movie_id`, only theatres showing the movie in the window, with their showtimes.
+    """
+    return await service.find_nearby(lat, lon, limit, radius_km, movie_id, starts_after, starts_before)
+
+
 @router.get("/{theatre_id}", response_model=TheatreResponse, status_code=200)
 async def get_one_theatre(
     theatre_id: int,
     service: TheatreServiceDep,
-    ) -> list[TheatreResponse]:
-    """Get all theatres."""
-    return await service.get_all_theatres(theatre_id)
+    ) -> TheatreResponse:
+    """Get one theatre by its ID."""
+    return await service.get_one_theatre(theatre_id)
 
 
 @router.put("/{theatre_id}", response_model=TheatreResponse, status_code=200)
@@ -44,3 +74,17 @@ async def update_theatre(
 async def delete_theatre(theatre_id: int, service: TheatreServiceDep) -> None:
     """Soft delete an existing theatre."""
     await service.delete_theatre(theatre_id)
+
+
+@router.post(
+    "/{theatre_id}/schedule",
+    response_model=ScheduleResult,
+    status_code=200,
+    dependencies=[Depends(require_role(UserRole.ADMIN))]
+)
+async def schedule_week(theatre_id: int, payload: ScheduleRequest, service: ScheduleServiceDep) -> ScheduleResult:
+    """
+    Plan a week of screenings across the theatre's auditoriums to maximize expected seats sold.
+    With `dry_run`, the plan is returned without creating the screenings.
+    """
+    return await service.plan_week(theatre_id, payload)
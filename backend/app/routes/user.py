@@ -1,6 +1,9 @@
-from fastapi import APIRouter, Query
-from app.models import UserCreate, UserUpdate, UserResponse
-from app.services import UserServiceDep
+from fastapi import APIRouter, Depends, Query, Response, UploadFile
+from app.core import require_role
+from app.models import UserRole, UserCreate, UserUpdate, UserResponse, UserImportResult
+from app.services import UserServiceDep, UserProvisionerDep
+from app.utils.exceptions import BadRequestException
+from .params import IdList, report_missing
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -14,6 +17,24 @@ async def create_user(
     return await service.create_user(payload)
 
 
+@router.post(
+    "/import",
+    response_model=UserImportResult,
+    status_code=200,
+    dependencies=[Depends(require_role(UserRole.ADMIN))]
+)
+async def import_users(file: UploadFile, provisioner: UserProvisionerDep) -> UserImportResult:
+    """
+    Create users from a CSV with `username`, `email` and `password` columns.
+    Rows that could not be created are listed with their line and reason.
+    """
+    try:
+        text = (await file.read()).decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise BadRequestException("The CSV must be UTF-8")
+    return await provisioner.provision(text)
+
+
 @router.get("/{user_id}", response_model=UserResponse, status_code=200)
 async def get_one_user(
     user_id: int,
@@ -26,11 +47,20 @@ async def get_one_user(
 @router.get("/", response_model=list[UserResponse], status_code=200)
 async def get_users(
     service: UserServiceDep,
+    response: Response,
+    ids: IdList,
     active_only: bool = True,
     offset: int = Query(0, ge=0),
     limit: int = Query(100, le=1000)
 ) -> list[UserResponse]:
-    """Get users."""
+    """
+    Get users.
+    With `ids`, get those users in request order; IDs not found are listed in X-Missing-IDs.
+    """
+    if ids is not None:
+        users, missing = await service.get_users_by_ids(ids)
+        report_missing(response, missing)
+        return users
     return await service.get_all_users(active_only, offset, limit)
 
 
@@ -0,0 +1,85 @@
+from fastapi import APIRouter, Depends, Header, Request
+from fastapi.responses import StreamingResponse
+from typing import Annotated, AsyncGenerator
+import asyncio
+import json
+from app.core import require_role
+from app.database import SessionDep
+from app.models import (
+    UserRole, UserResponse, ReservationResponse, WaitlistJoin, WaitlistEntryResponse, WaitlistClaim
+)
+from app.services import WaitlistServiceDep, ReservationServiceDep, Notifier
+
+router = APIRouter(prefix="/waitlist", tags=["Waitlist"])
+
+CurrentUser = Annotated[UserResponse, Depends(require_role(UserRole.USER, UserRole.ADMIN))]
+IdempotencyKey = Annotated[str | None, Header(alias="Idempotency-Key", max_length=255)]
+
+KEEPALIVE_SECONDS: float = 15.0
+
+
+@router.post("/", response_model=WaitlistEntryResponse, status_code=201)
+async def join_waitlist(
+    payload: WaitlistJoin,
+    service: WaitlistServiceDep,
+    user: CurrentUser
+) -> WaitlistEntryResponse:
+    """Join the waitlist of a sold-out screening."""
+    return await service.join(user, payload)
+
+
+@router.get("/events", status_code=200)
+async def waitlist_events(request: Request, session: SessionDep, user: CurrentUser) -> StreamingResponse:
+    """
+    Server-sent events for the current user: `waitlist.offered` when seats are
+    held for them, `waitlist.expired` when a hold lapses. Replaces polling.
+    """
+    session.close()  # the stream is long-lived; don't keep the auth lookup's connection checked out
+    queue = Notifier.subscribe(user.id)
+
+    async def _stream() -> AsyncGenerator[str, None]:
+        try:
+            yield ": connected\n\n"
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(queue.get(), KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {message['event']}\ndata: {json.dumps(message['data'])}\n\n"
+        finally:
+            Notifier.unsubscribe(user.id, queue)
+
+    return StreamingResponse(_stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+
+@router.get("/{entry_id}", response_model=WaitlistEntryResponse, status_code=200)
+async def get_waitlist_entry(
+    entry_id: int,
+    service: WaitlistServiceDep,
+    user: CurrentUser
+) -> WaitlistEntryResponse:
+    """Get one of the current user's waitlist entries and its place in the queue."""
+    return await service.get_entry(user, entry_id)
+
+
+@router.post("/{entry_id}/claim", response_model=ReservationResponse, status_code=201)
+async def claim_waitlist_hold(
+    entry_id: int,
+    service: ReservationServiceDep,
+    user: CurrentUser,
+    payload: WaitlistClaim | None = None,
+    idempotency_key: IdempotencyKey = None
+) -> ReservationResponse:
+    """Book the seats held for a promoted waitlist entry before the hold expires."""
+    return await service.claim_waitlist_hold(user, entry_id, payload.notes if payload else None, idempotency_key)
+
+
+@router.delete("/{entry_id}", status_code=204)
+async def leave_waitlist(
+    entry_id: int,
+    service: WaitlistServiceDep,
+    user: CurrentUser
+) -> None:
+    """Leave the waitlist; a held offer goes to the next in line."""
+    await service.leave(user, entry_id)
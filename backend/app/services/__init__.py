@@ -1,13 +1,43 @@
 from .auth import AuthService, AuthServiceDep
 from .user import UserService, UserServiceDep
-from .genre import GenreService, GenreServiceDep
+from .provisioning import UserProvisioner, UserProvisionerDep
+from .genre import GenreRegistry, GenreService, GenreServiceDep
 from .movie import MovieService, MovieServiceDep
-from .theatre import TheatreService, TheatreServiceDep
+from .recommendation import SimilarMovies, RecommendationService, RecommendationServiceDep
+from .theatre import TheatreLocator, TheatreService, TheatreServiceDep
+from .pricing import PricingEngine, PricingService, PricingServiceDep
+from .screening import ScreeningService, ScreeningServiceDep
+from .notifications import Notifier
+from .outbox import OutboxDispatcher
+from .tickets import TicketSender, FileTicketSender, TicketIssuer
+from .refunds import RefundIssuer
+from .waitlist import WaitlistPromoter, WaitlistService, WaitlistServiceDep
+from .reservation import ReservationService, ReservationServiceDep
+from .analytics import AnalyticsService, AnalyticsServiceDep, RevenueRollups
+from .archive import ReservationArchiver
+from .lifecycle import ScreeningLifecycle
+from .forecast import OccupancyModel, OccupancyForecaster
+from .scheduling import ScheduleOptimizer, ScheduleService, ScheduleServiceDep
 
 __all__ = [
     "AuthService", "AuthServiceDep", # Auth
     "UserService", "UserServiceDep", # User
-    "GenreService", "GenreServiceDep", # Genre
+    "UserProvisioner", "UserProvisionerDep", # User import
+    "GenreRegistry", "GenreService", "GenreServiceDep", # Genre
     "MovieService", "MovieServiceDep", # Movie
-    "TheatreService", "TheatreServiceDep", # Theatre
+    "SimilarMovies", "RecommendationService", "RecommendationServiceDep", # Recommendations
+    "TheatreLocator", "TheatreService", "TheatreServiceDep", # Theatre
+    "PricingEngine", "PricingService", "PricingServiceDep", # Pricing
+    "ScreeningService", "ScreeningServiceDep", # Screening
+    "Notifier", # Notifications
+    "OutboxDispatcher", # Outbox
+    "TicketSender", "FileTicketSender", "TicketIssuer", # Tickets
+    "RefundIssuer", # Refunds
+    "WaitlistPromoter", "WaitlistService", "WaitlistServiceDep", # Waitlist
+    "ReservationService", "ReservationServiceDep", # Reservation
+    "AnalyticsService", "AnalyticsServiceDep", "RevenueRollups", # Analytics
+    "ReservationArchiver", # Archive
+    "ScreeningLifecycle", # Lifecycle
+    "OccupancyModel", "OccupancyForecaster", # Forecasts
+    "ScheduleOptimizer", "ScheduleService", "ScheduleServiceDep", # Scheduling
 ]
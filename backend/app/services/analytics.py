@@ -0,0 +1,329 @@
+from fastapi import Depends
+from sqlmodel import Session, select, func
+from sqlalchemy import Date, cast, delete, event, inspect, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.sql import Select
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Annotated, Any
+from loguru import logger
+import time
+
+from app.database import Database, SessionDep
+from app.models import (
+    Auditorium, Screening, Reservation, ReservationSeat, ReservationStatus,
+    ReservationArchive, ReservationSeatArchive,
+    RevenueRollup, ScreeningOccupancy, ScreeningForecast,
+    RevenueSummary, DailyRevenue, OccupancyResponse, BackfillResult, ForecastResponse
+)
+from app.utils.exceptions import NotFoundException
+
+# Reservations in these states count towards revenue and occupancy.
+COUNTED_STATUSES: frozenset[ReservationStatus] = frozenset({
+    ReservationStatus.BOOKED,
+    ReservationStatus.COMPLETED,
+})
+
+# Backfill reads reservations from the hot tables and from the archive.
+ROLLUP_SOURCES: tuple[tuple[Any, Any], ...] = (
+    (Reservation, ReservationSeat),
+    (ReservationArchive, ReservationSeatArchive),
+)
+
+_screening_day = cast(Screening.start_time, Date)
+
+
+class RevenueRollups:
+    """
+    Maintains `RevenueRollup` and `ScreeningOccupancy`.
+
+    Rollups are adjusted in the same transaction as the reservation change,
+    from an `after_flush` hook, so they never drift from the source rows.
+    A reservation is expected to be flushed together with its seats.
+    """
+
+    @staticmethod
+    def _seat_counts(*criteria: Any, source: tuple[Any, Any] = (Reservation, ReservationSeat)):
+        reservation, reservation_seat = source
+        return (
+            select(reservation_seat.reservation_id, func.count().label("tickets"))
+            .join(reservation, reservation.id == reservation_seat.reservation_id) # type: ignore
+            .join(Screening, Screening.id == reservation.screening_id) # type: ignore
+            .where(*criteria)
+            .group_by(reservation_seat.reservation_id)
+            .subquery()
+        )
+
+    @classmethod
+    def _revenue_source(cls, *criteria: Any, sign: int = 1, source: tuple[Any, Any] = (Reservation, ReservationSeat)) -> Select:
+        reservation, _ = source
+        seats = cls._seat_counts(*criteria, source=source)
+        return (
+            select(
+                _screening_day,
+                Screening.movie_id,
+                Auditorium.theatre_id,
+                func.sum(reservation.total_price) * sign,
+                func.sum(func.coalesce(seats.c.tickets, 0)) * sign,
+                func.count() * sign,
+            )
+            .select_from(reservation)
+            .join(Screening, Screening.id == reservation.screening_id) # type: ignore
+            .join(Auditorium, Auditorium.id == Screening.auditorium_id) # type: ignore
+            .outerjoin(seats, seats.c.reservation_id == reservation.id)
+            .where(*criteria)
+            .group_by(_screening_day, Screening.movie_id, Auditorium.theatre_id)
+        )
+
+    @classmethod
+    def _occupancy_source(cls, *criteria: Any, sign: int = 1, source: tuple[Any, Any] = (Reservation, ReservationSeat)) -> Select:
+        reservation, _ = source
+        seats = cls._seat_counts(*criteria, source=source)
+        return (
+            select(
+                reservation.screening_id,
+                func.max(Auditorium.capacity),
+                func.sum(func.coalesce(seats.c.tickets, 0)) * sign,
+                func.sum(reservation.total_price) * sign,
+            )
+            .select_from(reservation)
+            .join(Screening, Screening.id == reservation.screening_id) # type: ignore
+            .join(Auditorium, Auditorium.id == Screening.auditorium_id) # type: ignore
+            .outerjoin(seats, seats.c.reservation_id == reservation.id)
+            .where(*criteria)
+            .group_by(reservation.screening_id)
+        )
+
+    @classmethod
+    def _upsert_revenue(cls, source: Select):
+        table = RevenueRollup.__table__ # type: ignore
+        stmt = pg_insert(table).from_select(
+            ["day", "movie_id", "theatre_id", "revenue", "tickets_sold", "reservation_count"],
+            source
+        )
+        return stmt.on_conflict_do_update(
+            index_elements=["day", "movie_id", "theatre_id"],
+            set_={
+                "revenue": table.c.revenue + stmt.excluded.revenue,
+                "tickets_sold": table.c.tickets_sold + stmt.excluded.tickets_sold,
+                "reservation_count": table.c.reservation_count + stmt.excluded.reservation_count,
+            }
+        )
+
+    @classmethod
+    def _upsert_occupancy(cls, source: Select):
+        table = ScreeningOccupancy.__table__ # type: ignore
+        stmt = pg_insert(table).from_select(
+            ["screening_id", "capacity", "seats_sold", "revenue"],
+            source
+        )
+        return stmt.on_conflict_do_update(
+            index_elements=["screening_id"],
+            set_={
+                "capacity": stmt.excluded.capacity,
+                "seats_sold": table.c.seats_sold + stmt.excluded.seats_sold,
+                "revenue": table.c.revenue + stmt.excluded.revenue,
+            }
+        )
+
+    @staticmethod
+    def _collect_transitions(session: Session) -> tuple[set[int], set[int]]:
+        """Split flushed reservations into ones that started and stopped counting."""
+        entered: set[int] = set()
+        left: set[int] = set()
+
+        for obj in session.new:
+            if isinstance(obj, Reservation) and obj.status in COUNTED_STATUSES:
+                entered.add(obj.id) # type: ignore
+
+        for obj in session.dirty:
+            if not isinstance(obj, Reservation):
+                continue
+            history = inspect(obj).attrs.status.history
+            if not history.deleted:
+                continue
+            was_counted = history.deleted[0] in COUNTED_STATUSES
+            is_counted = obj.status in COUNTED_STATUSES
+            if is_counted and not was_counted:
+                entered.add(obj.id) # type: ignore
+            elif was_counted and not is_counted:
+                left.add(obj.id) # type: ignore
+
+        return entered, left
+
+    @classmethod
+    def apply(cls, session: Session, entered: set[int], left: set[int]) -> None:
+        """Add or subtract the given reservations from the rollups."""
+        connection = session.connection()
+        for ids, sign in ((entered, 1), (left, -1)):
+            if not ids:
+                continue
+            criteria = Reservation.id.in_(ids) # type: ignore
+            connection.execute(cls._upsert_revenue(cls._revenue_source(criteria, sign=sign)))
+            connection.execute(cls._upsert_occupancy(cls._occupancy_source(criteria, sign=sign)))
+
+    @staticmethod
+    def on_status_set(target: Reservation, value: Any, oldvalue: Any, initiator: Any) -> None:
+        """No-op; registered with `active_history` so the previous status is always in history."""
+
+    @classmethod
+    def on_after_flush(cls, session: Session, flush_context: Any) -> None:
+        """`after_flush` hook: attribute history is still available here."""
+        entered, left = cls._collect_transitions(session)
+        if entered or left:
+            cls.apply(session, entered, left)
+
+    @classmethod
+    def _rebuild_window(cls, start: date, end: date) -> tuple[int, int]:
+        """Rebuild the rollups for screenings on days in [start, end)."""
+        in_window = (_screening_day >= start) & (_screening_day < end)
+
+        with Session(Database.get_engine()) as session:
+            session.execute(delete(RevenueRollup).where(
+                RevenueRollup.day >= start, RevenueRollup.day < end # type: ignore
+            ))
+            session.execute(delete(ScreeningOccupancy).where(
+                ScreeningOccupancy.screening_id.in_(select(Screening.id).where(in_window)) # type: ignore
+            ))
+            # The upserts add up, so hot and archived reservations land in the same rows.
+            revenue_rows = occupancy_rows = 0
+            for source in ROLLUP_SOURCES:
+                criteria = (in_window, source[0].status.in_(COUNTED_STATUSES))
+                revenue_rows += session.execute(cls._upsert_revenue(cls._revenue_source(*criteria, source=source))).rowcount
+                occupancy_rows += session.execute(cls._upsert_occupancy(cls._occupancy_source(*criteria, source=source))).rowcount
+            session.commit()
+            return revenue_rows, occupancy_rows
+
+    @classmethod
+    def backfill(cls, chunks: int = 8, workers: int = 4) -> BackfillResult:
+        """
+        Rebuild the rollups from scratch in parallel day-window chunks.
+
+        Windows never share a rollup key, so chunks do not contend with each other.
+        """
+        started = time.perf_counter()
+        with Session(Database.get_engine()) as session:
+            first, last = session.exec(select(func.min(_screening_day), func.max(_screening_day))).one()
+
+        windows: list[tuple[date, date]] = []
+        if first is not None and last is not None:
+            span = (last - first).days + 1
+            step = max(1, -(-span // max(1, chunks)))
+            windows = [
+                (first + timedelta(days=offset), min(first + timedelta(days=offset + step), last + timedelta(days=1)))
+                for offset in range(0, span, step)
+            ]
+
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            results = list(pool.map(lambda w: cls._rebuild_window(*w), windows))
+
+        result = BackfillResult(
+            chunks=len(windows),
+            revenue_rows=sum(r for r, _ in results),
+            occupancy_rows=sum(o for _, o in results),
+            elapsed_seconds=round(time.perf_counter() - started, 3),
+        )
+        logger.success(f"Rebuilt analytics rollups: {result}")
+        return result
+
+
+event.listen(Reservation.status, "set", RevenueRollups.on_status_set, active_history=True)
+event.listen(Session, "after_flush", RevenueRollups.on_after_flush)
+
+
+class AnalyticsService:
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def _filtered(self, statement: Select, start: date, end: date, movie_id: int | None, theatre_id: int | None) -> Select:
+        statement = statement.where(RevenueRollup.day >= start, RevenueRollup.day <= end) # type: ignore
+        if movie_id is not None:
+            statement = statement.where(RevenueRollup.movie_id == movie_id)
+        if theatre_id is not None:
+            statement = statement.where(RevenueRollup.theatre_id == theatre_id)
+        return statement
+
+    async def get_revenue(
+        self,
+        start: date,
+        end: date,
+        movie_id: int | None = None,
+        theatre_id: int | None = None
+        ) -> RevenueSummary:
+        """Total revenue over a day range, optionally for one movie and/or theatre."""
+        statement = self._filtered(
+            select(
+                func.coalesce(func.sum(RevenueRollup.revenue), literal(Decimal("0"))),
+                func.coalesce(func.sum(RevenueRollup.tickets_sold), 0),
+                func.coalesce(func.sum(RevenueRollup.reservation_count), 0),
+            ),
+            start, end, movie_id, theatre_id
+        )
+        revenue, tickets, reservations = self._session.exec(statement).one() # type: ignore
+        return RevenueSummary(
+            start=start,
+            end=end,
+            movie_id=movie_id,
+            theatre_id=theatre_id,
+            revenue=revenue,
+            tickets_sold=tickets,
+            reservation_count=reservations,
+        )
+
+    async def get_daily_revenue(
+        self,
+        start: date,
+        end: date,
+        movie_id: int | None = None,
+        theatre_id: int | None = None
+        ) -> list[DailyRevenue]:
+        """Revenue per day over a day range."""
+        statement = self._filtered(
+            select(
+                RevenueRollup.day,
+                func.sum(RevenueRollup.revenue),
+                func.sum(RevenueRollup.tickets_sold),
+                func.sum(RevenueRollup.reservation_count),
+            ),
+            start, end, movie_id, theatre_id
+        ).group_by(RevenueRollup.day).order_by(RevenueRollup.day)
+        return [
+            DailyRevenue(day=day, revenue=revenue, tickets_sold=tickets, reservation_count=reservations)
+            for day, revenue, tickets, reservations in self._session.exec(statement).all() # type: ignore
+        ]
+
+    async def get_screening_occupancy(self, screening_id: int) -> OccupancyResponse:
+        """Occupancy of one screening, read from its rollup row."""
+        row: ScreeningOccupancy | None = self._session.get(ScreeningOccupancy, screening_id)
+        if not row:
+            screening: Screening | None = self._session.get(Screening, screening_id)
+            if not screening:
+                raise NotFoundException("Screening not found")
+            row = ScreeningOccupancy(screening_id=screening_id, capacity=screening.auditorium.capacity)
+        return OccupancyResponse(
+            screening_id=row.screening_id,
+            capacity=row.capacity,
+            seats_sold=row.seats_sold,
+            revenue=row.revenue,
+            occupancy_rate=(row.seats_sold / row.capacity) if row.capacity else 0.0,
+        )
+
+    async def get_screening_forecast(self, screening_id: int) -> ForecastResponse:
+        """Seats an upcoming screening is expected to sell, read from its forecast row."""
+        forecast: ScreeningForecast | None = self._session.get(ScreeningForecast, screening_id)
+        if forecast:
+            return ForecastResponse(**forecast.model_dump())
+        screening: Screening | None = self._session.get(Screening, screening_id)
+        if not screening:
+            raise NotFoundException("Screening not found")
+        return ForecastResponse(screening_id=screening_id, capacity=screening.auditorium.capacity)
+
+
+def get_analytics_service(session: SessionDep) -> AnalyticsService:
+    """"""
+    return AnalyticsService(session)
+
+
+AnalyticsServiceDep = Annotated[AnalyticsService, Depends(get_analytics_service)]
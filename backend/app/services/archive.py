@@ -0,0 +1,86 @@
+from sqlmodel import Session, select
+from sqlalchemy import delete, insert
+from datetime import datetime, timedelta, timezone
+from loguru import logger
+import time
+
+from app.core import settings
+from app.database import Database
+from app.models import (
+    Reservation, ReservationSeat, ReservationArchive, ReservationSeatArchive,
+    Screening, ArchiveResult
+)
+
+_RESERVATION_COLUMNS: list[str] = [
+    "id", "created_at", "updated_at", "deleted_at", "status", "total_price",
+    "user_id", "screening_id", "cancelled_at", "booking_reference", "notes",
+]
+_SEAT_COLUMNS: list[str] = ["reservation_id", "seat_id", "price_paid"]
+
+
+class ReservationArchiver:
+    """
+    Moves reservations of screenings that are over into the archive tables.
+
+    Live booking only ever touches upcoming screenings, so the hot tables and
+    their indexes stay sized to what is bookable, however much history is kept.
+    Each batch is one transaction: copy, then delete, so a row is never in both
+    tables or in neither.
+    """
+
+    @staticmethod
+    def _archive_batch(session: Session, cutoff: datetime, batch_size: int) -> tuple[int, int]:
+        """Move up to `batch_size` reservations. Returns (reservations, seats) moved."""
+        statement = (
+            select(Reservation.id)
+            .join(Screening, Screening.id == Reservation.screening_id) # type: ignore
+            .where(Screening.end_time < cutoff)
+            .order_by(Reservation.id) # type: ignore
+            .limit(batch_size)
+            .with_for_update(of=Reservation, skip_locked=True) # type: ignore
+        )
+        ids = list(session.exec(statement).all())
+        if not ids:
+            return 0, 0
+
+        reservations = ReservationArchive.__table__ # type: ignore
+        seats = ReservationSeatArchive.__table__ # type: ignore
+        session.execute(insert(reservations).from_select(
+            _RESERVATION_COLUMNS,
+            select(*[getattr(Reservation, c) for c in _RESERVATION_COLUMNS]).where(Reservation.id.in_(ids)) # type: ignore
+        ))
+        moved_seats = session.execute(insert(seats).from_select(
+            _SEAT_COLUMNS,
+            select(*[getattr(ReservationSeat, c) for c in _SEAT_COLUMNS]).where(ReservationSeat.reservation_id.in_(ids)) # type: ignore
+        )).rowcount
+        session.execute(delete(ReservationSeat).where(ReservationSeat.reservation_id.in_(ids))) # type: ignore
+        session.execute(delete(Reservation).where(Reservation.id.in_(ids))) # type: ignore
+        session.commit()
+        return len(ids), moved_seats
+
+    @classmethod
+    def archive(cls, cutoff: datetime | None = None, batch_size: int | None = None) -> ArchiveResult:
+        """Archive reservations of screenings that ended before `cutoff`."""
+        started = time.perf_counter()
+        if cutoff is None:
+            cutoff = datetime.now(timezone.utc) - timedelta(days=settings.RESERVATION_ARCHIVE_AFTER_DAYS)
+        batch_size = batch_size or settings.RESERVATION_ARCHIVE_BATCH_SIZE
+
+        total_reservations = total_seats = 0
+        with Session(Database.get_engine()) as session:
+            while True:
+                moved, moved_seats = cls._archive_batch(session, cutoff, batch_size)
+                total_reservations += moved
+                total_seats += moved_seats
+                if moved < batch_size:
+                    break
+
+        result = ArchiveResult(
+            cutoff=cutoff,
+            reservations=total_reservations,
+            seats=total_seats,
+            elapsed_seconds=round(time.perf_counter() - started, 3),
+        )
+        if total_reservations:
+            logger.success(f"Archived reservations: {result}")
+        return result
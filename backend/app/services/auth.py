@@ -1,8 +1,13 @@
 from fastapi import Depends
+from sqlmodel import Session, select
+from sqlalchemy import update
+from datetime import datetime, timedelta, timezone
 from typing import Annotated
 from jose import JWTError
-from app.models import Token, TokenData, UserRole, UserResponse
-from app.core import SecurityUtils
+import uuid
+from app.models import Token, TokenData, UserRole, UserResponse, User, RefreshToken
+from app.core import settings, SecurityUtils, LoginThrottle, TokenRevocationList
+from app.database import SessionDep
 from app.utils.exceptions import (
     InvalidJWTTokenException
 )
@@ -12,36 +17,109 @@ from .user import UserServiceDep, UserService
 
 class AuthService:
 
-    def __init__(self, user_service: UserService) -> None:
+    def __init__(self, session: Session, user_service: UserService) -> None:
+        self._session = session
         self._user_service = user_service
-    
-    async def login_for_access_token(self, username: str, password: str) -> Token:
-        """"""
-        user = await self._user_service.authenticate(username, password)
-        token_data = TokenData(sub=str(user.id), role=user.role)
-        token = SecurityUtils.create_access_token(token_data)
+
+    def _issue_tokens(self, user: User, family_id: str | None = None) -> Token:
+        """Issue an access token plus a refresh token in `family_id` (a new family if none)."""
+        token = SecurityUtils.create_access_token(TokenData(sub=str(user.id), role=user.role))
+        refresh_token, token_hash = SecurityUtils.create_refresh_token()
+        self._session.add(RefreshToken(
+            user_id=user.id, # type: ignore
+            token_hash=token_hash,
+            family_id=family_id or uuid.uuid4().hex,
+            expires_at=datetime.now(timezone.utc) + timedelta(days=settings.JWT_REFRESH_TOKEN_EXPIRE_DAYS)
+        ))
+        self._session.commit()
+        token.refresh_token = refresh_token
         return token
-    
+
+    def _revoke_family(self, family_id: str) -> None:
+        self._session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at == None) # type: ignore
+            .values(revoked_at=datetime.now(timezone.utc))
+        )
+
+    async def login_for_access_token(self, username: str, password: str, client_ip: str | None = None) -> Token:
+        """Throttle, then authenticate and issue an access and a refresh token."""
+        LoginThrottle.check(username, client_ip)
+        user = await self._user_service.authenticate(username, password)
+        return self._issue_tokens(user)
+
+    async def refresh_tokens(self, refresh_token: str) -> Token:
+        """
+        Rotate a refresh token: spend it and issue a new pair in the same family.
+
+        Presenting a token that was already spent means it leaked, so the whole
+        family is revoked and the user has to log in again.
+        """
+        statement = (
+            select(RefreshToken)
+            .where(RefreshToken.token_hash == SecurityUtils.hash_refresh_token(refresh_token))
+            .with_for_update()
+        )
+        stored: RefreshToken | None = self._session.exec(statement).first()
+        now = datetime.now(timezone.utc)
+        if not stored or stored.revoked_at is not None or stored.expires_at <= now:
+            self._session.rollback()
+            raise InvalidJWTTokenException()
+        if stored.used_at is not None:
+            self._revoke_family(stored.family_id)
+            self._session.commit()
+            raise InvalidJWTTokenException()
+
+        user: User | None = self._session.get(User, stored.user_id)
+        if not user or not user.is_active:
+            self._revoke_family(stored.family_id)
+            self._session.commit()
+            raise InvalidJWTTokenException()
+
+        stored.used_at = now
+        return self._issue_tokens(user, stored.family_id)
+
+    async def logout(self, token: str, refresh_token: str | None = None) -> None:
+        """Revoke the access token and, if given, the refresh token's family."""
+        try:
+            decoded = SecurityUtils.decode_token(token)
+        except JWTError:
+            raise InvalidJWTTokenException()
+        if decoded.jti:
+            TokenRevocationList.revoke_token(self._session, decoded.jti)
+        if refresh_token:
+            statement = select(RefreshToken.family_id).where(
+                RefreshToken.token_hash == SecurityUtils.hash_refresh_token(refresh_token),
+                RefreshToken.user_id == int(decoded.sub or 0)
+            )
+            family_id = self._session.exec(statement).first()
+            if family_id:
+                self._revoke_family(family_id)
+        self._session.commit()
+
     async def get_current_user(self, token: str) -> UserResponse:
         """"""
         try:
             decoded = SecurityUtils.decode_token(token)
             user_id: int | None = int(decoded.sub) if decoded.sub else None
             user_role: UserRole | None = decoded.role
-            
+
             if (not user_id) or (not user_role):
                 raise InvalidJWTTokenException()
         except JWTError:
             raise InvalidJWTTokenException()
-        
+
+        if TokenRevocationList.is_revoked(decoded.jti, decoded.sub, decoded.iat):
+            raise InvalidJWTTokenException()
+
         user = await self._user_service.get_one_user(user_id)
         return user
 
 
 
-def get_auth_service(user_service: UserServiceDep) -> AuthService:
+def get_auth_service(session: SessionDep, user_service: UserServiceDep) -> AuthService:
     """"""
-    return AuthService(user_service)
+    return AuthService(session, user_service)
 
 
 AuthServiceDep = Annotated[AuthService, Depends(get_auth_service)]
@@ -0,0 +1,213 @@
+from sqlmodel import Session, select, func
+from sqlalchemy import Float, cast, delete, extract, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from datetime import datetime, timedelta, timezone
+from loguru import logger
+import numpy as np
+import time
+
+from app.core import settings
+from app.database import Database
+from app.models import (
+    Auditorium, Screening, MovieGenre, ScreeningOccupancy, ScreeningForecast, ForecastResult
+)
+
+SLOTS: int = 7 * 24  # local weekday x hour
+
+
+class OccupancyModel:
+    """
+    Fill rate of a screening as the historical mean plus a weekday-hour, a
+    genre and a movie effect.
+
+    The effects are fitted by backfitting: each is the shrunk mean of what the
+    others leave unexplained, `sum(residual) / (count + FORECAST_SHRINKAGE)`,
+    so an effect seen on few screenings stays close to zero. A movie's genre
+    effect is the average over its genres, which gives movies without history
+    a forecast from the genres they share with ones that have it. Fitting is
+    a handful of `bincount`s and small matrix products over the whole history.
+    """
+
+    def __init__(
+        self,
+        mean: float,
+        slot_effects: np.ndarray,
+        movie_ids: np.ndarray,
+        movie_effects: np.ndarray,
+        movie_genres: np.ndarray,
+        genre_effects: np.ndarray
+    ) -> None:
+        self.mean = mean
+        self.slot_effects = slot_effects
+        self.movie_ids = movie_ids
+        self.movie_effects = movie_effects
+        self.movie_genres = movie_genres
+        self.genre_effects = genre_effects
+
+    @staticmethod
+    def _genre_weights(movie_ids: np.ndarray, pairs: np.ndarray) -> np.ndarray:
+        """Movie x genre matrix with each movie's row summing to 1 (or 0 without genres)."""
+        _, genre_index = np.unique(pairs[:, 1], return_inverse=True)
+        weights = np.zeros((len(movie_ids), int(genre_index.max(initial=-1)) + 1), dtype=np.float64)
+        rows = np.searchsorted(movie_ids, pairs[:, 0])
+        weights[rows, genre_index] = 1.0
+        sizes = weights.sum(axis=1, keepdims=True)
+        return np.divide(weights, sizes, out=weights, where=sizes > 0)
+
+    @classmethod
+    def fit(cls, movies: np.ndarray, slots: np.ndarray, fill: np.ndarray, pairs: np.ndarray, shrinkage: float, rounds: int) -> "OccupancyModel":
+        """
+        Fit on one row per past screening (`movies`, `slots`, `fill`) and the
+        (movie_id, genre_id) `pairs` of every movie to be forecast.
+        """
+        movie_ids, movie_index = np.unique(np.concatenate([movies, pairs[:, 0]]), return_inverse=True)
+        movie_index = movie_index[:len(movies)]
+        movie_genres = cls._genre_weights(movie_ids, pairs)
+        slot_effects = np.zeros(SLOTS)
+        movie_effects = np.zeros(len(movie_ids))
+        genre_effects = np.zeros(movie_genres.shape[1])
+        if len(fill) == 0:
+            return cls(0.0, slot_effects, movie_ids, movie_effects, movie_genres, genre_effects)
+
+        mean = float(fill.mean())
+        slot_counts = np.bincount(slots, minlength=SLOTS)
+        movie_counts = np.bincount(movie_index, minlength=len(movie_ids)).astype(np.float64)
+        genre_counts = movie_genres.T @ movie_counts
+        for _ in range(max(1, rounds)):
+            genre_term = movie_genres @ genre_effects
+            residual = fill - mean - genre_term[movie_index] - movie_effects[movie_index]
+            slot_effects = np.bincount(slots, residual, minlength=SLOTS) / (slot_counts + shrinkage)
+
+            residual = fill - mean - slot_effects[slots] - movie_effects[movie_index]
+            by_movie = np.bincount(movie_index, residual, minlength=len(movie_ids))
+            genre_effects = (movie_genres.T @ by_movie) / (genre_counts + shrinkage)
+
+            genre_term = movie_genres @ genre_effects
+            residual = fill - mean - slot_effects[slots] - genre_term[movie_index]
+            movie_effects = np.bincount(movie_index, residual, minlength=len(movie_ids)) / (movie_counts + shrinkage)
+        return cls(mean, slot_effects, movie_ids, movie_effects, movie_genres, genre_effects)
+
+    def predict(self, movies: np.ndarray, slots: np.ndarray) -> np.ndarray:
+        """Fill rate in [0, 1] for each (movie, slot); movies unknown to the model get the mean and slot effect."""
+        if not len(self.movie_ids):
+            return np.clip(self.mean + self.slot_effects[slots], 0.0, 1.0)
+        positions = np.clip(np.searchsorted(self.movie_ids, movies), 0, len(self.movie_ids) - 1)
+        known = self.movie_ids[positions] == movies
+        movie_terms = self.movie_effects + self.movie_genres @ self.genre_effects
+        fill = self.mean + self.slot_effects[slots] + np.where(known, movie_terms[positions], 0.0)
+        return np.clip(fill, 0.0, 1.0)
+
+
+class OccupancyForecaster:
+    """
+    Maintains `ScreeningForecast`: the seats every upcoming screening is
+    expected to sell.
+
+    The model is refitted on the recent history each run and applied to all
+    upcoming screenings at once; readers (pricing, scheduling, analytics)
+    only look rows up. A screening never forecasts fewer seats than it has
+    already sold.
+    """
+
+    @staticmethod
+    def _slot(column):
+        """Local weekday (Monday 0) x hour of a timestamp column, as 0..167."""
+        local = func.timezone(settings.PRICING_TIMEZONE, column)
+        return ((extract("isodow", local) - 1) * 24 + extract("hour", local)).label("slot")
+
+    @classmethod
+    def history(cls, session: Session, start: datetime, end: datetime) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(movie_ids, slots, fill rates) of the screenings that ended in [start, end)."""
+        capacity = func.coalesce(ScreeningOccupancy.capacity, Auditorium.capacity)
+        statement = (
+            select(
+                Screening.movie_id,
+                cls._slot(Screening.start_time),
+                cast(func.coalesce(ScreeningOccupancy.seats_sold, 0), Float) / capacity,
+            )
+            .join(Auditorium, Auditorium.id == Screening.auditorium_id) # type: ignore
+            .outerjoin(ScreeningOccupancy, ScreeningOccupancy.screening_id == Screening.id) # type: ignore
+            .where(
+                Screening.end_time >= start,
+                Screening.end_time < end,
+                Screening.deleted_at == None, # type: ignore
+                capacity > 0,
+                # Ended screenings are deactivated afterwards; ones deactivated earlier were cancelled.
+                or_(Screening.is_active == True, Screening.updated_at >= Screening.end_time), # type: ignore
+            )
+        )
+        rows = np.array(session.exec(statement).all(), dtype=np.float64).reshape(-1, 3)
+        return rows[:, 0].astype(np.int64), rows[:, 1].astype(np.int64), np.clip(rows[:, 2], 0.0, 1.0)
+
+    @staticmethod
+    def genre_pairs(session: Session) -> np.ndarray:
+        rows = session.exec(select(MovieGenre.movie_id, MovieGenre.genre_id)).all()
+        return np.array(rows, dtype=np.int64).reshape(-1, 2)
+
+    @classmethod
+    def fit(cls, session: Session, now: datetime) -> tuple[OccupancyModel, int]:
+        """Fit on the last FORECAST_HISTORY_DAYS. Returns the model and the screenings it saw."""
+        movies, slots, fill = cls.history(session, now - timedelta(days=settings.FORECAST_HISTORY_DAYS), now)
+        model = OccupancyModel.fit(
+            movies, slots, fill, cls.genre_pairs(session), settings.FORECAST_SHRINKAGE, settings.FORECAST_FIT_ROUNDS
+        )
+        return model, len(fill)
+
+    @classmethod
+    def _store(cls, session: Session, model: OccupancyModel, now: datetime) -> int:
+        upcoming = (Screening.is_active == True, Screening.deleted_at == None, Screening.start_time > now) # type: ignore
+        session.execute(delete(ScreeningForecast).where(
+            ScreeningForecast.screening_id.not_in(select(Screening.id).where(*upcoming)) # type: ignore
+        ))
+        statement = (
+            select(
+                Screening.id,
+                Screening.movie_id,
+                cls._slot(Screening.start_time),
+                Auditorium.capacity,
+                func.coalesce(ScreeningOccupancy.seats_sold, 0),
+            )
+            .join(Auditorium, Auditorium.id == Screening.auditorium_id) # type: ignore
+            .outerjoin(ScreeningOccupancy, ScreeningOccupancy.screening_id == Screening.id) # type: ignore
+            .where(*upcoming)
+        )
+        rows = np.array(session.exec(statement).all(), dtype=np.int64).reshape(-1, 5)
+        if not len(rows):
+            return 0
+
+        capacities, sold = rows[:, 3], rows[:, 4]
+        seats = np.clip(np.maximum(model.predict(rows[:, 1], rows[:, 2]) * capacities, sold), 0, capacities)
+        fill = np.divide(seats, capacities, out=np.zeros(len(rows)), where=capacities > 0)
+        values = [
+            {"screening_id": screening_id, "capacity": capacity, "forecast_seats": s, "fill_rate": f, "computed_at": now}
+            for screening_id, capacity, s, f in zip(
+                rows[:, 0].tolist(), capacities.tolist(), np.round(seats, 2).tolist(), np.round(fill, 4).tolist()
+            )
+        ]
+        for start in range(0, len(values), 5000):
+            stmt = pg_insert(ScreeningForecast.__table__).values(values[start:start + 5000]) # type: ignore
+            session.execute(stmt.on_conflict_do_update(
+                index_elements=["screening_id"],
+                set_={c: stmt.excluded[c] for c in ("capacity", "forecast_seats", "fill_rate", "computed_at")}
+            ))
+        return len(values)
+
+    @classmethod
+    def refresh(cls) -> ForecastResult:
+        """Refit the model and rewrite the forecasts of every upcoming screening."""
+        started = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        with Session(Database.get_engine()) as session:
+            model, history = cls.fit(session, now)
+            fitted = time.perf_counter()
+            forecasts = cls._store(session, model, now)
+            session.commit()
+
+        result = ForecastResult(
+            history_screenings=history,
+            forecasts=forecasts,
+            fit_seconds=round(fitted - started, 3),
+            elapsed_seconds=round(time.perf_counter() - started, 3),
+        )
+        logger.success(f"Refreshed occupancy forecasts: {result}")
+        return result
@@ -1,12 +1,82 @@
-from typing import Annotated
+from typing import Annotated, Iterable
 from fastapi import Depends, HTTPException
-from sqlmodel import select, Session
+from sqlmodel import select, Session, func
 from sqlalchemy.exc import IntegrityError
+from datetime import datetime
+from loguru import logger
+import threading
+import time
+from app.core import settings
 from app.database import SessionDep
 from app.models import Genre, GenreCreate, GenreUpdate, GenreResponse
 from app.utils.exceptions import NotFoundException
 
 
+class GenreRegistry:
+    """
+    Process-wide genre id -> name map.
+
+    Keyed by the genre table's version (row count and latest `updated_at`),
+    probed at most every `GENRE_REGISTRY_REFRESH_SECONDS`, so writes made by
+    other workers show up within that interval. Looking up an unknown id
+    probes right away, so a genre created elsewhere is usable immediately.
+    """
+
+    _names: dict[int, str] | None = None
+    _version: tuple[int, datetime | None] | None = None
+    _checked_at: float = 0.0
+    _lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop the map; the next lookup reloads it."""
+        with cls._lock:
+            cls._names = None
+            cls._version = None
+
+    @classmethod
+    def _genres_version(cls, session: Session) -> tuple[int, datetime | None]:
+        count, updated_at = session.exec(select(func.count(), func.max(Genre.updated_at))).one() # type: ignore
+        return count, updated_at
+
+    @classmethod
+    def names(cls, session: Session, force: bool = False) -> dict[int, str]:
+        """Get the id -> name map, reloading it only if the genre table changed."""
+        now = time.monotonic()
+        if not force and cls._names is not None and now - cls._checked_at < settings.GENRE_REGISTRY_REFRESH_SECONDS:
+            return cls._names
+
+        with cls._lock:
+            version = cls._genres_version(session)
+            if cls._names is None or version != cls._version:
+                cls._names = dict(session.exec(select(Genre.id, Genre.name)).all()) # type: ignore
+                cls._version = version
+                logger.info(f"Loaded genre registry (version {version}).")
+            cls._checked_at = now
+            return cls._names
+
+    @classmethod
+    def _lookup(cls, session: Session, genre_ids: list[int]) -> dict[int, str]:
+        names = cls.names(session)
+        if any(genre_id not in names for genre_id in genre_ids):
+            names = cls.names(session, force=True)
+        return names
+
+    @classmethod
+    def known(cls, session: Session, genre_ids: Iterable[int]) -> list[int]:
+        """The given ids that exist, deduplicated, in order."""
+        genre_ids = list(dict.fromkeys(genre_ids))
+        names = cls._lookup(session, genre_ids)
+        return [genre_id for genre_id in genre_ids if genre_id in names]
+
+    @classmethod
+    def names_of(cls, session: Session, genre_ids: Iterable[int]) -> list[str]:
+        """Names of the given genre ids."""
+        genre_ids = list(genre_ids)
+        names = cls._lookup(session, genre_ids)
+        return [names[genre_id] for genre_id in genre_ids if genre_id in names]
+
+
 class GenreService:
 
     def __init__(self, session: Session) -> None:
@@ -22,6 +92,7 @@ class GenreService:
             genre = Genre(**payload.model_dump())
             self._session.add(genre)
             self._session.commit()
+            GenreRegistry.invalidate()
             self._session.refresh(genre)
             return self.genre_to_response(genre)
         except IntegrityError:
@@ -56,6 +127,7 @@ class GenreService:
         if updated:
             genre.touch()
             self._session.commit()
+            GenreRegistry.invalidate()
             self._session.refresh(genre)
         
         return self.genre_to_response(genre)
@@ -67,6 +139,7 @@ class GenreService:
             raise NotFoundException("Genre not found")
         genre.soft_delete()
         self._session.commit()
+        GenreRegistry.invalidate()
 
 
 def get_genre_service(session: SessionDep) -> GenreService:
@@ -0,0 +1,131 @@
+from sqlmodel import Session, select, func
+from sqlalchemy import update
+from datetime import datetime, timezone
+from loguru import logger
+import time
+
+from app.core import settings
+from app.database import Database
+from app.models import (
+    Screening, Seat, Reservation, ReservationSeat, ReservationStatus,
+    WaitlistEntry, WaitlistStatus, LifecycleResult
+)
+
+
+class ScreeningLifecycle:
+    """
+    Moves screenings and their reservations along once time has passed.
+
+    Every step is set-based and batched, one short transaction per batch:
+    reservations of screenings that have ended become COMPLETED (so the BOOKED
+    rows stay sized to what is upcoming), ended screenings are deactivated,
+    and the denormalized `available_seats` of upcoming screenings is
+    recomputed from the seats actually booked or held.
+    """
+
+    @staticmethod
+    def complete_reservations(session: Session, now: datetime, batch_size: int) -> int:
+        # BOOKED and COMPLETED both count towards the revenue rollups, so they need no update.
+        completed = 0
+        while True:
+            batch = (
+                select(Reservation.id)
+                .join(Screening, Screening.id == Reservation.screening_id) # type: ignore
+                .where(Reservation.status == ReservationStatus.BOOKED, Screening.end_time < now)
+                .limit(batch_size)
+                .with_for_update(of=Reservation, skip_locked=True) # type: ignore
+            )
+            done = session.execute(
+                update(Reservation)
+                .where(Reservation.id.in_(batch.scalar_subquery())) # type: ignore
+                .values(status=ReservationStatus.COMPLETED, updated_at=now)
+            ).rowcount
+            session.commit()
+            completed += done
+            if done < batch_size:
+                return completed
+
+    @staticmethod
+    def deactivate_screenings(session: Session, now: datetime) -> int:
+        deactivated = session.execute(
+            update(Screening)
+            .where(Screening.is_active == True, Screening.end_time < now) # type: ignore
+            .values(is_active=False, updated_at=now)
+        ).rowcount
+        session.commit()
+        return deactivated
+
+    @staticmethod
+    def _expected_available_seats():
+        """Free seats of the screening being updated: active seats minus booked and held ones."""
+        seats = (
+            select(func.count()).select_from(Seat)
+            .where(Seat.auditorium_id == Screening.auditorium_id, Seat.is_active == True)
+            .scalar_subquery()
+        )
+        booked = (
+            select(func.count()).select_from(ReservationSeat)
+            .join(Reservation, Reservation.id == ReservationSeat.reservation_id) # type: ignore
+            .where(Reservation.screening_id == Screening.id, Reservation.status == ReservationStatus.BOOKED)
+            .scalar_subquery()
+        )
+        held = (
+            select(func.coalesce(func.sum(func.cardinality(WaitlistEntry.held_seat_ids)), 0))
+            .where(WaitlistEntry.screening_id == Screening.id, WaitlistEntry.status == WaitlistStatus.OFFERED)
+            .scalar_subquery()
+        )
+        return func.greatest(seats - booked - held, 0)
+
+    @classmethod
+    def reconcile_available_seats(cls, session: Session, now: datetime, chunk_size: int) -> int:
+        """
+        Recompute `available_seats` of upcoming screenings, `chunk_size` at a
+        time in id order. Screenings being booked right now are locked by their
+        booking and skipped; their count is being kept current anyway.
+        """
+        expected = cls._expected_available_seats()
+        reconciled = 0
+        last_id = 0
+        while True:
+            chunk = session.exec(
+                select(Screening.id)
+                .where(Screening.is_active == True, Screening.end_time >= now, Screening.id > last_id) # type: ignore
+                .order_by(Screening.id) # type: ignore
+                .limit(chunk_size)
+            ).all()
+            if not chunk:
+                return reconciled
+            last_id = chunk[-1] # type: ignore
+            locked = (
+                select(Screening.id)
+                .where(Screening.id.in_(chunk)) # type: ignore
+                .with_for_update(skip_locked=True)
+            )
+            locked_ids = session.exec(locked).all()
+            if locked_ids:
+                reconciled += session.execute(
+                    update(Screening)
+                    .where(Screening.id.in_(locked_ids), Screening.available_seats != expected) # type: ignore
+                    .values(available_seats=expected, updated_at=now)
+                ).rowcount
+            session.commit()
+
+    @classmethod
+    def run(cls) -> LifecycleResult:
+        """One pass of every lifecycle step."""
+        started = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        with Session(Database.get_engine()) as session:
+            completed = cls.complete_reservations(session, now, settings.LIFECYCLE_BATCH_SIZE)
+            deactivated = cls.deactivate_screenings(session, now)
+            reconciled = cls.reconcile_available_seats(session, now, settings.LIFECYCLE_RECONCILE_CHUNK_SIZE)
+
+        result = LifecycleResult(
+            reservations_completed=completed,
+            screenings_deactivated=deactivated,
+            screenings_reconciled=reconciled,
+            elapsed_seconds=round(time.perf_counter() - started, 3),
+        )
+        if completed or deactivated or reconciled:
+            logger.success(f"Screening lifecycle: {result}")
+        return result
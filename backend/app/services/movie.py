@@ -1,31 +1,40 @@
-from fastapi import Depends
+from fastapi import BackgroundTasks, Depends
 from sqlmodel import Session, select
+from sqlalchemy import delete
+from sqlalchemy.orm import selectinload
 from typing import Annotated
-from app.database import SessionDep
-from app.models import Movie, MovieCreate, MovieUpdate, MovieResponse, Genre
+from app.database import SessionDep, DataLoader
+from app.models import Movie, MovieGenre, MovieCreate, MovieUpdate, MovieResponse
 from app.utils.exceptions import NotFoundException
 
+from .genre import GenreRegistry
+from .recommendation import SimilarMovies
+
 
 class MovieService:
 
-    def __init__(self, session: Session) -> None:
+    def __init__(self, session: Session, background_tasks: BackgroundTasks) -> None:
         self._session = session
+        self._background_tasks = background_tasks
     
     def movie_to_response(self, movie: Movie) -> MovieResponse:
         """"""
+        links = DataLoader.for_session(self._session).load(movie, "genre_links")
         return MovieResponse(
             **movie.model_dump(),
-            genre_names=[g.name for g in movie.genres]
+            genre_names=GenreRegistry.names_of(self._session, [link.genre_id for link in links])
             )
     
     async def create_movie(self, payload: MovieCreate) -> MovieResponse:
         """Create a new movie."""
-        statement = select(Genre).where(Genre.id.in_(payload.genre_ids)) # type: ignore
-        genres = self._session.exec(statement).all()
-        
-        movie = Movie(**payload.model_dump(exclude={"genre_ids"}), genres=list(genres))
+        genre_ids = GenreRegistry.known(self._session, payload.genre_ids)
+
+        movie = Movie(**payload.model_dump(exclude={"genre_ids"}))
         self._session.add(movie)
+        self._session.flush()
+        self._session.add_all([MovieGenre(movie_id=movie.id, genre_id=genre_id) for genre_id in genre_ids]) # type: ignore
         self._session.commit()
+        self._background_tasks.add_task(SimilarMovies.refresh, movie.id) # type: ignore
         self._session.refresh(movie)
         
         return self.movie_to_response(movie)
@@ -43,6 +52,17 @@ class MovieService:
         movies = self._session.exec(statement).all()
         return [self.movie_to_response(movie) for movie in movies]
 
+    async def get_movies_by_ids(self, movie_ids: list[int]) -> tuple[list[MovieResponse], list[int]]:
+        """Get movies by ID in one query, in request order. Also returns the IDs not found."""
+        statement = (
+            select(Movie)
+            .where(Movie.id.in_(movie_ids)) # type: ignore
+            .options(selectinload(Movie.genre_links)) # type: ignore
+        )
+        found = {movie.id: movie for movie in self._session.exec(statement).all()}
+        movies = [self.movie_to_response(found[i]) for i in movie_ids if i in found]
+        return movies, [i for i in movie_ids if i not in found]
+
     async def update_movie(self, movie_id: int, payload: MovieUpdate) -> MovieResponse:
         """Update an existing movie."""
         movie: Movie | None = self._session.get(Movie, movie_id)
@@ -52,11 +72,12 @@ class MovieService:
         data = payload.model_dump(exclude_unset=True, exclude_defaults=True, exclude_none=True)
 
         # Handle genres
+        old_genre_ids: list[int] | None = None
         if "genre_ids" in data:
-            statement = select(Genre).where(Genre.id.in_(data["genre_ids"])) # type: ignore
-            genres = self._session.exec(statement).all()
-            movie.genres = list(genres)
-            del data["genre_ids"]
+            old_genre_ids = [link.genre_id for link in movie.genre_links]
+            genre_ids = GenreRegistry.known(self._session, data.pop("genre_ids"))
+            self._session.execute(delete(MovieGenre).where(MovieGenre.movie_id == movie_id)) # type: ignore
+            self._session.add_all([MovieGenre(movie_id=movie_id, genre_id=genre_id) for genre_id in genre_ids])
 
         for key, value in data.items():
             setattr(movie, key, value)
@@ -64,6 +85,8 @@ class MovieService:
         # Touch + persist
         movie.touch()
         self._session.commit()
+        if old_genre_ids is not None:
+            self._background_tasks.add_task(SimilarMovies.refresh, movie_id, old_genre_ids)
         self._session.refresh(movie)
 
         return self.movie_to_response(movie)
@@ -75,11 +98,12 @@ class MovieService:
             raise NotFoundException("Movie not found")
         movie.soft_delete()
         self._session.commit()
+        self._background_tasks.add_task(SimilarMovies.refresh, movie_id)
 
 
-def get_movie_service(session: SessionDep) -> MovieService:
+def get_movie_service(session: SessionDep, background_tasks: BackgroundTasks) -> MovieService:
     """"""
-    return MovieService(session)
+    return MovieService(session, background_tasks)
 
 
 MovieServiceDep = Annotated[MovieService, Depends(get_movie_service)]
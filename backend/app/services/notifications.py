@@ -0,0 +1,110 @@
+from sqlmodel import Session, select, func
+from sqlalchemy import ARRAY, Text, bindparam
+from collections import defaultdict
+from typing import Any
+from loguru import logger
+import asyncio
+import json
+
+from app.core import settings
+from app.database import Database
+
+
+class Notifier:
+    """
+    Pushes per-user events to connected clients across workers.
+
+    `publish` issues a Postgres NOTIFY inside the caller's transaction, so an
+    event goes out only if the change that caused it commits. Every worker
+    LISTENs on one dedicated connection and fans notifications out to the
+    queues of its own subscribers; nobody has to poll.
+    """
+
+    CHANNEL: str = "user_events"
+
+    _subscribers: defaultdict[int, set[asyncio.Queue]] = defaultdict(set)
+    _connection: Any = None
+    _loop: asyncio.AbstractEventLoop | None = None
+
+    @classmethod
+    def publish(cls, session: Session, user_id: int, event: str, data: dict[str, Any]) -> None:
+        """Queue an event for `user_id`; delivered when the session's transaction commits."""
+        payload = json.dumps({"user_id": user_id, "event": event, "data": data}, default=str)
+        session.execute(select(func.pg_notify(cls.CHANNEL, payload)))
+
+    @classmethod
+    def publish_many(cls, session: Session, events: list[tuple[int, str, dict[str, Any]]]) -> None:
+        """Queue many (user_id, event, data) events with one statement; delivered on commit."""
+        if not events:
+            return
+        payloads = [json.dumps({"user_id": u, "event": ev, "data": d}, default=str) for u, ev, d in events]
+        rows = func.unnest(bindparam("payloads", payloads, type_=ARRAY(Text))).table_valued("payload").render_derived()
+        session.execute(select(func.pg_notify(cls.CHANNEL, rows.c.payload)).select_from(rows))
+
+    @classmethod
+    def subscribe(cls, user_id: int) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.NOTIFICATIONS_QUEUE_SIZE)
+        cls._subscribers[user_id].add(queue)
+        return queue
+
+    @classmethod
+    def unsubscribe(cls, user_id: int, queue: asyncio.Queue) -> None:
+        queues = cls._subscribers.get(user_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del cls._subscribers[user_id]
+
+    @classmethod
+    def _deliver(cls, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        for queue in cls._subscribers.get(message.get("user_id"), ()):
+            if queue.full():
+                queue.get_nowait()  # a stalled client loses its oldest event, not the newest
+            queue.put_nowait(message)
+
+    @classmethod
+    def _on_readable(cls) -> None:
+        try:
+            cls._connection.poll()
+        except Exception as e:
+            logger.error(f"Lost the notification connection, reconnecting: {e}")
+            cls.stop()
+            if cls._loop is not None:
+                cls._loop.call_later(1.0, cls.start)
+            return
+        while cls._connection.notifies:
+            cls._deliver(cls._connection.notifies.pop(0).payload)
+
+    @classmethod
+    def start(cls) -> None:
+        """LISTEN on a connection taken out of the pool, driven by the running event loop."""
+        if cls._connection is not None:
+            return
+        try:
+            raw = Database.get_engine().raw_connection()
+            connection = raw.driver_connection
+            raw.detach()
+            connection.autocommit = True # type: ignore
+            connection.cursor().execute(f"LISTEN {cls.CHANNEL}") # type: ignore
+        except Exception as e:
+            logger.error(f"Failed to start listening for notifications: {e}")
+            return
+        cls._connection = connection
+        cls._loop = asyncio.get_running_loop()
+        cls._loop.add_reader(connection.fileno(), cls._on_readable) # type: ignore
+
+    @classmethod
+    def stop(cls) -> None:
+        if cls._connection is None:
+            return
+        try:
+            if cls._loop is not None:
+                cls._loop.remove_reader(cls._connection.fileno())
+            cls._connection.close()
+        except Exception:
+            pass
+        cls._connection = None
@@ -0,0 +1,118 @@
+from sqlmodel import Session, select
+from concurrent.futures import Executor, ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable
+from loguru import logger
+import multiprocessing
+
+from app.core import settings
+from app.database import Database
+from app.models import OutboxMessage, OutboxStatus
+
+# Returns, per message id, the error that failed it or None once it is handled.
+OutboxHandler = Callable[[Session, list[OutboxMessage]], dict[int, Exception | None]]
+
+
+class OutboxDispatcher:
+    """
+    Delivers outbox messages after the transactions that wrote them commit.
+
+    Every worker runs a dispatcher; each claims a batch of due messages with
+    `FOR UPDATE SKIP LOCKED`, so workers share the backlog without handing out
+    a message twice, and a worker that dies mid-batch only releases its locks.
+    Handlers get a whole batch of one topic and may push CPU-bound work to
+    the shared process pool.
+    """
+
+    _handlers: dict[str, OutboxHandler] = {}
+    _executor: Executor | None = None
+
+    @staticmethod
+    def enqueue(session: Session, topic: str, payload: dict[str, Any]) -> None:
+        """Add a message to the caller's transaction; it is dispatched only if that commits."""
+        session.add(OutboxMessage(topic=topic, payload=payload))
+
+    @classmethod
+    def register(cls, topic: str, handler: OutboxHandler) -> None:
+        cls._handlers[topic] = handler
+
+    @classmethod
+    def executor(cls) -> Executor | None:
+        """The process pool for CPU-bound work, or None to do it inline (OUTBOX_RENDER_WORKERS = 0)."""
+        if cls._executor is None and settings.OUTBOX_RENDER_WORKERS > 0:
+            # spawn, not fork: the dispatcher forks from a threaded process holding pooled connections.
+            cls._executor = ProcessPoolExecutor(
+                settings.OUTBOX_RENDER_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return cls._executor
+
+    @classmethod
+    def shutdown(cls) -> None:
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
+
+    @staticmethod
+    def _retry_at(now: datetime, attempts: int) -> datetime:
+        return now + timedelta(seconds=settings.OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+
+    @classmethod
+    def dispatch_batch(cls, batch_size: int | None = None) -> int:
+        """Claim and handle up to `batch_size` due messages in one transaction. Returns messages claimed."""
+        now = datetime.now(timezone.utc)
+        with Session(Database.get_engine()) as session:
+            statement = (
+                select(OutboxMessage)
+                .where(OutboxMessage.status == OutboxStatus.PENDING, OutboxMessage.available_at <= now)
+                .order_by(OutboxMessage.available_at, OutboxMessage.id) # type: ignore
+                .limit(batch_size or settings.OUTBOX_BATCH_SIZE)
+                .with_for_update(skip_locked=True)
+            )
+            messages = list(session.exec(statement).all())
+            if not messages:
+                return 0
+
+            by_topic: dict[str, list[OutboxMessage]] = {}
+            for message in messages:
+                by_topic.setdefault(message.topic, []).append(message)
+
+            errors: dict[int, Exception | None] = {}
+            for topic, batch in by_topic.items():
+                handler = cls._handlers.get(topic)
+                if handler is None:
+                    errors.update({m.id: LookupError(f"No handler for topic {topic!r}") for m in batch}) # type: ignore
+                    continue
+                try:
+                    # A savepoint per topic: a database error in one handler must not abort the
+                    # transaction that records every message's outcome.
+                    with session.begin_nested():
+                        errors.update(handler(session, batch))
+                except Exception as e:
+                    errors.update({m.id: e for m in batch}) # type: ignore
+
+            now = datetime.now(timezone.utc)
+            for message in messages:
+                error = errors.get(message.id) # type: ignore
+                message.attempts += 1
+                if error is None:
+                    message.status = OutboxStatus.PROCESSED
+                    message.processed_at = now
+                    continue
+                message.last_error = f"{type(error).__name__}: {error}"[:1000]
+                if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                    message.status = OutboxStatus.FAILED
+                    logger.error(f"Giving up on outbox message {message.id} ({message.topic}): {message.last_error}")
+                else:
+                    message.available_at = cls._retry_at(now, message.attempts)
+            session.commit()
+            return len(messages)
+
+    @classmethod
+    def dispatch_pending(cls) -> int:
+        """Dispatch batches until no full batch is due. Returns messages claimed."""
+        total = 0
+        while True:
+            claimed = cls.dispatch_batch()
+            total += claimed
+            if claimed < settings.OUTBOX_BATCH_SIZE:
+                return total
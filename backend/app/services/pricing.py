@@ -0,0 +1,284 @@
+from fastapi import Depends
+from sqlmodel import Session, select, func
+from abc import ABC, abstractmethod
+from datetime import datetime
+from decimal import Decimal
+from typing import Annotated, Any, Sequence
+from zoneinfo import ZoneInfo
+from loguru import logger
+import numpy as np
+import threading
+import time
+
+from app.core import settings
+from app.database import SessionDep
+from app.models import (
+    PricingRule, PricingRuleKind, PricingRuleCreate, PricingRuleResponse, Screening, ScreeningForecast
+)
+from app.utils.exceptions import NotFoundException
+
+
+class PricingBatch:
+    """Column-oriented pricing input: one entry per seat to price."""
+
+    def __init__(
+        self,
+        base_cents: np.ndarray,
+        seat_types: np.ndarray,
+        hours: np.ndarray,
+        weekdays: np.ndarray,
+        occupancy: np.ndarray,
+        forecast: np.ndarray
+    ) -> None:
+        self.base_cents = base_cents
+        self.seat_types = seat_types
+        self.hours = hours
+        self.weekdays = weekdays
+        self.occupancy = occupancy
+        self.forecast = forecast
+
+    @classmethod
+    def for_screening(
+        cls,
+        screening: Screening,
+        capacity: int,
+        seat_types: Sequence[str | None],
+        forecast: float = 0.0
+    ) -> "PricingBatch":
+        """Build a batch for a seat map of a single screening; `forecast` is its forecast fill rate."""
+        count = len(seat_types)
+        local = screening.start_time.astimezone(ZoneInfo(settings.PRICING_TIMEZONE))
+        occupancy = 1.0 - (screening.available_seats / capacity) if capacity else 0.0
+        return cls(
+            base_cents=np.full(count, int(screening.base_price * 100), dtype=np.int64),
+            seat_types=np.array([t or "standard" for t in seat_types], dtype=object),
+            hours=np.full(count, local.hour, dtype=np.int64),
+            weekdays=np.full(count, local.weekday(), dtype=np.int64),
+            occupancy=np.full(count, occupancy, dtype=np.float64),
+            forecast=np.full(count, forecast, dtype=np.float64),
+        )
+
+
+class PriceModifier(ABC):
+    """A pricing rule family. Compiled once per rule set, then applied per batch."""
+
+    kind: PricingRuleKind
+
+    @abstractmethod
+    def compile(self, rules: list[PricingRule]) -> Any:
+        ...
+
+    @abstractmethod
+    def factors(self, compiled: Any, batch: PricingBatch) -> np.ndarray:
+        ...
+
+
+class SeatTypeModifier(PriceModifier):
+    kind = PricingRuleKind.SEAT_TYPE
+
+    def compile(self, rules: list[PricingRule]) -> dict[str, float]:
+        return {rule.key.lower(): float(rule.multiplier) for rule in rules}
+
+    def factors(self, compiled: dict[str, float], batch: PricingBatch) -> np.ndarray:
+        # Look up each distinct seat type once, then scatter by index.
+        types, inverse = np.unique(batch.seat_types.astype(str), return_inverse=True)
+        table = np.array([compiled.get(t.lower(), 1.0) for t in types], dtype=np.float64)
+        return table[inverse]
+
+
+class HourModifier(PriceModifier):
+    kind = PricingRuleKind.HOUR
+
+    def compile(self, rules: list[PricingRule]) -> np.ndarray:
+        table = np.ones(24, dtype=np.float64)
+        for rule in rules:
+            start, _, end = rule.key.partition("-")
+            first, last = int(start), int(end or start)
+            if last < first:  # wraps past midnight, e.g. "22-2"
+                last += 24
+            hours = np.arange(first, last + 1) % 24
+            table[hours] = float(rule.multiplier)
+        return table
+
+    def factors(self, compiled: np.ndarray, batch: PricingBatch) -> np.ndarray:
+        return compiled[batch.hours]
+
+
+class WeekdayModifier(PriceModifier):
+    kind = PricingRuleKind.WEEKDAY
+
+    def compile(self, rules: list[PricingRule]) -> np.ndarray:
+        table = np.ones(7, dtype=np.float64)
+        for rule in rules:
+            table[int(rule.key) % 7] = float(rule.multiplier)
+        return table
+
+    def factors(self, compiled: np.ndarray, batch: PricingBatch) -> np.ndarray:
+        return compiled[batch.weekdays]
+
+
+class OccupancyModifier(PriceModifier):
+    """Surge pricing: the highest threshold at or below the occupancy wins."""
+
+    kind = PricingRuleKind.OCCUPANCY
+
+    def compile(self, rules: list[PricingRule]) -> tuple[np.ndarray, np.ndarray]:
+        ordered = sorted(rules, key=lambda rule: float(rule.key))
+        thresholds = np.array([float(rule.key) for rule in ordered], dtype=np.float64)
+        multipliers = np.array([float(rule.multiplier) for rule in ordered], dtype=np.float64)
+        return thresholds, multipliers
+
+    def values(self, batch: PricingBatch) -> np.ndarray:
+        return batch.occupancy
+
+    def factors(self, compiled: tuple[np.ndarray, np.ndarray], batch: PricingBatch) -> np.ndarray:
+        thresholds, multipliers = compiled
+        values = self.values(batch)
+        if thresholds.size == 0:
+            return np.ones(values.shape, dtype=np.float64)
+        index = np.searchsorted(thresholds, values, side="right") - 1
+        return np.where(index >= 0, multipliers[np.clip(index, 0, None)], 1.0)
+
+
+class ForecastModifier(OccupancyModifier):
+    """Demand pricing ahead of sales: thresholds apply to the screening's forecast fill rate."""
+
+    kind = PricingRuleKind.FORECAST
+
+    def values(self, batch: PricingBatch) -> np.ndarray:
+        return batch.forecast
+
+
+class PricingEngine:
+    """
+    Prices whole seat maps in one vectorized pass.
+
+    Active `PricingRule`s are compiled into lookup tables and cached process-wide.
+    The cache is keyed by the rule set's version (row count and latest `updated_at`),
+    probed at most every `PRICING_RULES_REFRESH_SECONDS`.
+    """
+
+    _modifiers: list[PriceModifier] = [
+        SeatTypeModifier(),
+        HourModifier(),
+        WeekdayModifier(),
+        OccupancyModifier(),
+        ForecastModifier(),
+    ]
+    _compiled: list[Any] | None = None
+    _version: tuple[int, datetime | None] | None = None
+    _checked_at: float = 0.0
+    _lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def register(cls, modifier: PriceModifier) -> None:
+        """Add a modifier to the pipeline and force a recompile."""
+        with cls._lock:
+            cls._modifiers = [*cls._modifiers, modifier]
+            cls._compiled = None
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop the compiled rules; the next pricing call recompiles them."""
+        with cls._lock:
+            cls._compiled = None
+            cls._version = None
+
+    @classmethod
+    def _rules_version(cls, session: Session) -> tuple[int, datetime | None]:
+        statement = select(func.count(), func.max(PricingRule.updated_at)) # type: ignore
+        count, updated_at = session.exec(statement).one()
+        return count, updated_at
+
+    @classmethod
+    def _compile(cls, session: Session) -> list[Any]:
+        statement = select(PricingRule).where(
+            PricingRule.is_active == True, PricingRule.deleted_at == None # type: ignore
+        )
+        rules = session.exec(statement).all()
+        by_kind: dict[PricingRuleKind, list[PricingRule]] = {}
+        for rule in rules:
+            by_kind.setdefault(rule.kind, []).append(rule)
+        return [modifier.compile(by_kind.get(modifier.kind, [])) for modifier in cls._modifiers]
+
+    @classmethod
+    def compiled(cls, session: Session) -> list[Any]:
+        """Get the compiled rules, recompiling only if the rule set changed."""
+        now = time.monotonic()
+        if cls._compiled is not None and now - cls._checked_at < settings.PRICING_RULES_REFRESH_SECONDS:
+            return cls._compiled
+
+        with cls._lock:
+            version = cls._rules_version(session)
+            if cls._compiled is None or version != cls._version:
+                cls._compiled = cls._compile(session)
+                cls._version = version
+                logger.info(f"Compiled pricing rules (version {version}).")
+            cls._checked_at = now
+            return cls._compiled
+
+    @classmethod
+    def price(cls, session: Session, batch: PricingBatch) -> np.ndarray:
+        """Price every entry of the batch. Returns prices in cents."""
+        compiled = cls.compiled(session)
+        factor = np.ones(batch.base_cents.shape, dtype=np.float64)
+        for modifier, rules in zip(cls._modifiers, compiled):
+            factor *= modifier.factors(rules, batch)
+        return np.rint(batch.base_cents * factor).astype(np.int64)
+
+    @classmethod
+    def price_seats(
+        cls,
+        session: Session,
+        screening: Screening,
+        capacity: int,
+        seat_types: Sequence[str | None]
+        ) -> list[Decimal]:
+        """Price the given seats of one screening."""
+        if not seat_types:
+            return []
+        forecast: ScreeningForecast | None = session.get(ScreeningForecast, screening.id)
+        batch = PricingBatch.for_screening(screening, capacity, seat_types, forecast.fill_rate if forecast else 0.0)
+        cents = cls.price(session, batch)
+        return [Decimal(int(c)).scaleb(-2) for c in cents]
+
+
+class PricingService:
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def rule_to_response(self, rule: PricingRule) -> PricingRuleResponse:
+        """"""
+        return PricingRuleResponse(**rule.model_dump())
+
+    async def create_rule(self, payload: PricingRuleCreate) -> PricingRuleResponse:
+        """Create a pricing rule."""
+        rule = PricingRule(**payload.model_dump())
+        self._session.add(rule)
+        self._session.commit()
+        self._session.refresh(rule)
+        PricingEngine.invalidate()
+        return self.rule_to_response(rule)
+
+    async def get_all_rules(self) -> list[PricingRuleResponse]:
+        """Get all active pricing rules."""
+        statement = select(PricingRule).where(PricingRule.is_active == True).order_by(PricingRule.kind) # type: ignore
+        return [self.rule_to_response(rule) for rule in self._session.exec(statement).all()]
+
+    async def delete_rule(self, rule_id: int) -> None:
+        """Soft delete a pricing rule."""
+        rule: PricingRule | None = self._session.get(PricingRule, rule_id)
+        if not rule:
+            raise NotFoundException("Pricing rule not found")
+        rule.soft_delete()
+        self._session.commit()
+        PricingEngine.invalidate()
+
+
+def get_pricing_service(session: SessionDep) -> PricingService:
+    """"""
+    return PricingService(session)
+
+
+PricingServiceDep = Annotated[PricingService, Depends(get_pricing_service)]
@@ -0,0 +1,187 @@
+from fastapi import Depends
+from sqlmodel import Session, select
+from sqlalchemy import or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from concurrent.futures import Executor
+from datetime import datetime, timezone
+from typing import Annotated
+from pydantic import ValidationError
+from loguru import logger
+import asyncio
+import csv
+import io
+import time
+
+from app.core import settings, SecurityUtils
+from app.database import SessionDep
+from app.models import User, UserRole, UserCreate, UserImportConflict, UserImportResult
+from app.utils.exceptions import BadRequestException
+
+from .outbox import OutboxDispatcher
+
+REQUIRED_COLUMNS: tuple[str, ...] = ("username", "email", "password")
+# Passwords per task sent to a hashing process; small enough to keep every core busy to the end.
+HASH_CHUNK_SIZE: int = 32
+
+
+class UserProvisioner:
+    """
+    Creates users in bulk from a CSV of username, email and password.
+
+    Rows are validated like `UserCreate`, then checked for duplicates within
+    the file and against existing users in one query. Passwords are hashed
+    in a process pool, since bcrypt is meant to be slow, and the accepted
+    rows are inserted in batches. Each batch commits on its own, and a row
+    claimed by a concurrent signup in the meantime is reported instead of
+    failing its batch. Every row that was not created is listed with the
+    reason.
+    """
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    @staticmethod
+    def parse_csv(text: str, max_rows: int) -> tuple[list[tuple[int, UserCreate]], list[UserImportConflict]]:
+        """Valid rows with their line numbers, and the invalid ones as conflicts."""
+        reader = csv.DictReader(io.StringIO(text))
+        missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+        if missing:
+            raise BadRequestException(f"The CSV is missing the columns: {', '.join(missing)}")
+
+        rows: list[tuple[int, UserCreate]] = []
+        conflicts: list[UserImportConflict] = []
+        for record in reader:
+            if len(rows) + len(conflicts) >= max_rows:
+                message = f"A CSV can hold at most {max_rows} users"
+                if max_rows < settings.USER_IMPORT_MAX_ROWS:
+                    message += "; import larger files with `python -m app.cli import-users`"
+                raise BadRequestException(message)
+            username, email = (record.get("username") or "").strip(), (record.get("email") or "").strip()
+            password = record.get("password") or ""
+            if not username or not password:
+                conflicts.append(UserImportConflict(
+                    line=reader.line_num, username=username, email=email, reason="missing username or password"
+                ))
+                continue
+            try:
+                rows.append((reader.line_num, UserCreate(username=username, email=email, password=password)))
+            except ValidationError as error:
+                fields = sorted({str(detail["loc"][0]) for detail in error.errors() if detail["loc"]})
+                conflicts.append(UserImportConflict(
+                    line=reader.line_num, username=username, email=email, reason=f"invalid {', '.join(fields)}"
+                ))
+        return rows, conflicts
+
+    def _taken(self, rows: list[tuple[int, UserCreate]]) -> tuple[set[str], set[str]]:
+        """Usernames and emails of the rows that already belong to a user, in one query."""
+        if not rows:
+            return set(), set()
+        usernames = [row.username for _, row in rows]
+        emails = [row.email for _, row in rows]
+        statement = select(User.username, User.email).where(
+            or_(User.username.in_(usernames), User.email.in_(emails)) # type: ignore
+        )
+        taken = self._session.exec(statement).all()
+        return {username for username, _ in taken}, {email for _, email in taken}
+
+    @staticmethod
+    async def hash_passwords(passwords: list[str], executor: Executor | None) -> list[str]:
+        """bcrypt every password, in order, in chunks across `executor`'s processes, or in a thread without one."""
+        chunks = [passwords[i:i + HASH_CHUNK_SIZE] for i in range(0, len(passwords), HASH_CHUNK_SIZE)]
+        if executor is None or len(chunks) <= 1:
+            return await asyncio.to_thread(SecurityUtils.hash_passwords, passwords)
+
+        loop = asyncio.get_running_loop()
+        hashed = await asyncio.gather(*(
+            loop.run_in_executor(executor, SecurityUtils.hash_passwords, chunk) for chunk in chunks
+        ))
+        return [password for chunk in hashed for password in chunk]
+
+    def _insert(self, batch: list[tuple[int, UserCreate]], hashes: list[str]) -> set[str]:
+        """Insert one batch and commit it. Returns the usernames created."""
+        now = datetime.now(timezone.utc)
+        statement = pg_insert(User.__table__).values([ # type: ignore
+            dict(
+                username=row.username, email=row.email, hashed_password=hashed, role=UserRole.USER,
+                is_active=True, created_at=now, updated_at=now,
+            )
+            for (_, row), hashed in zip(batch, hashes)
+        ])
+        created = self._session.execute(
+            statement.on_conflict_do_nothing().returning(User.__table__.c.username) # type: ignore
+        ).scalars().all()
+        self._session.commit()
+        return set(created)
+
+    async def provision(
+        self, text: str, max_rows: int | None = None, executor: Executor | None = None
+    ) -> UserImportResult:
+        """
+        Create the users of a CSV file and report every row that was not created.
+
+        The defaults suit a request: at most USER_IMPORT_HTTP_MAX_ROWS rows,
+        hashed in the dispatcher's shared process pool, so an import cannot
+        take every core from the API. The command line passes its own limit
+        and pool.
+        """
+        started = time.perf_counter()
+        rows, conflicts = self.parse_csv(text, max_rows or settings.USER_IMPORT_HTTP_MAX_ROWS)
+        received = len(rows) + len(conflicts)
+
+        taken_usernames, taken_emails = self._taken(rows)
+        seen_usernames: set[str] = set()
+        seen_emails: set[str] = set()
+        accepted: list[tuple[int, UserCreate]] = []
+        for line, row in rows:
+            if row.username in taken_usernames:
+                reason = "username already exists"
+            elif row.email in taken_emails:
+                reason = "email already exists"
+            elif row.username in seen_usernames:
+                reason = "username repeated in the file"
+            elif row.email in seen_emails:
+                reason = "email repeated in the file"
+            else:
+                seen_usernames.add(row.username)
+                seen_emails.add(row.email)
+                accepted.append((line, row))
+                continue
+            conflicts.append(UserImportConflict(line=line, username=row.username, email=row.email, reason=reason))
+
+        hash_started = time.perf_counter()
+        executor = executor or OutboxDispatcher.executor()
+        hashes = await self.hash_passwords([row.password for _, row in accepted], executor)
+        hash_seconds = time.perf_counter() - hash_started
+
+        created = 0
+        batch_size = settings.USER_IMPORT_BATCH_SIZE
+        for start in range(0, len(accepted), batch_size):
+            batch = accepted[start:start + batch_size]
+            inserted = self._insert(batch, hashes[start:start + batch_size])
+            created += len(inserted)
+            conflicts.extend(
+                UserImportConflict(line=line, username=row.username, email=row.email, reason="username or email already exists")
+                for line, row in batch if row.username not in inserted
+            )
+
+        conflicts.sort(key=lambda conflict: conflict.line)
+        result = UserImportResult(
+            received=received,
+            created=created,
+            conflicts=conflicts,
+            hash_seconds=round(hash_seconds, 3),
+            elapsed_seconds=round(time.perf_counter() - started, 3),
+        )
+        logger.success(
+            f"Imported users: {received} received, {created} created, {len(conflicts)} conflicts "
+            f"in {result.elapsed_seconds}s ({result.hash_seconds}s hashing)"
+        )
+        return result
+
+
+def get_user_provisioner(session: SessionDep) -> UserProvisioner:
+    """"""
+    return UserProvisioner(session)
+
+
+UserProvisionerDep = Annotated[UserProvisioner, Depends(get_user_provisioner)]
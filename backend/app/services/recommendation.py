@@ -0,0 +1,181 @@
+from fastapi import Depends
+from sqlmodel import Session, select
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from datetime import datetime, timezone
+from typing import Annotated, Iterable
+from loguru import logger
+import numpy as np
+import time
+
+from app.core import settings
+from app.database import Database, SessionDep
+from app.models import (
+    Movie, MovieGenre, MovieRecommendation, SimilarMovie, SimilarMoviesResponse
+)
+
+# Movies per pass: bounds the dense (chunk x catalog) similarity block held in memory.
+CHUNK_SIZE: int = 2000
+
+
+class GenreMatrix:
+    """
+    Movie x genre incidence of the active catalog.
+
+    Loaded from (movie_id, genre_id) pairs; the genre axis is only as wide as
+    the genres in use, so the dense block stays small even for large catalogs.
+    """
+
+    def __init__(self, pairs: np.ndarray) -> None:
+        self.movie_ids, movie_index = np.unique(pairs[:, 0], return_inverse=True)
+        genre_ids, genre_index = np.unique(pairs[:, 1], return_inverse=True)
+        self.matrix = np.zeros((len(self.movie_ids), len(genre_ids)), dtype=np.float32)
+        self.matrix[movie_index, genre_index] = 1.0
+        self.sizes = self.matrix.sum(axis=1)
+
+    @classmethod
+    def load(cls, session: Session) -> "GenreMatrix":
+        statement = (
+            select(MovieGenre.movie_id, MovieGenre.genre_id)
+            .join(Movie, Movie.id == MovieGenre.movie_id) # type: ignore
+            .where(Movie.is_active == True, Movie.deleted_at == None) # type: ignore
+        )
+        pairs = np.array(session.exec(statement).all(), dtype=np.int64).reshape(-1, 2)
+        return cls(pairs)
+
+    def rows_of(self, movie_ids: Iterable[int]) -> np.ndarray:
+        """Row positions of the given movies that are in the matrix."""
+        ids = np.fromiter(movie_ids, dtype=np.int64)
+        positions = np.searchsorted(self.movie_ids, ids)
+        found = positions < len(self.movie_ids)
+        found[found] = self.movie_ids[positions[found]] == ids[found]
+        return positions[found]
+
+    def top_k(self, rows: np.ndarray, k: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Jaccard similarity of `rows` against every movie, reduced to the top `k`.
+
+        Returns (indices, scores), each shaped (len(rows), k), best first;
+        scores of 0 mean fewer than k movies share a genre.
+        """
+        intersections = self.matrix[rows] @ self.matrix.T
+        unions = self.sizes[rows, None] + self.sizes[None, :] - intersections
+        scores = np.divide(intersections, unions, out=np.zeros_like(intersections), where=unions > 0)
+        scores[np.arange(len(rows)), rows] = -1.0  # never recommend a movie for itself
+
+        k = min(k, max(len(self.movie_ids) - 1, 0))
+        if k == 0:
+            empty = np.empty((len(rows), 0))
+            return empty.astype(np.int64), empty
+        # Best score first; ties go to the lower movie id (rows are in id order) so results are stable.
+        keys = np.arange(len(self.movie_ids)) * 1e-12 - scores.astype(np.float64)
+        candidates = np.argpartition(keys, k - 1, axis=1)[:, :k]
+        order = np.argsort(np.take_along_axis(keys, candidates, axis=1), axis=1)
+        candidates = np.take_along_axis(candidates, order, axis=1)
+        return candidates, np.take_along_axis(scores, candidates, axis=1)
+
+
+class SimilarMovies:
+    """
+    Maintains `MovieRecommendation`: top-K movies by genre overlap (Jaccard).
+
+    A genre change on one movie only moves scores between movies that share
+    one of its old or new genres, so only those rows are recomputed.
+    """
+
+    @staticmethod
+    def _store(session: Session, matrix: GenreMatrix, movie_ids: set[int]) -> int:
+        """Recompute and upsert the rows of `movie_ids`; drop rows of movies no longer in the matrix."""
+        rows = matrix.rows_of(sorted(movie_ids))
+        indices, scores = matrix.top_k(rows, settings.RECOMMENDATIONS_TOP_K)
+        now = datetime.now(timezone.utc)
+        values = []
+        for row, movie_indices, movie_scores in zip(rows, indices, scores):
+            keep = movie_scores > 0
+            values.append({
+                "movie_id": int(matrix.movie_ids[row]),
+                "similar_movie_ids": matrix.movie_ids[movie_indices[keep]].tolist(),
+                "scores": np.round(movie_scores[keep].astype(np.float64), 4).tolist(),
+                "computed_at": now,
+            })
+
+        stale = movie_ids - {v["movie_id"] for v in values}
+        if stale:
+            session.execute(delete(MovieRecommendation).where(MovieRecommendation.movie_id.in_(stale))) # type: ignore
+        if values:
+            stmt = pg_insert(MovieRecommendation.__table__).values(values) # type: ignore
+            session.execute(stmt.on_conflict_do_update(
+                index_elements=["movie_id"],
+                set_={c: stmt.excluded[c] for c in ("similar_movie_ids", "scores", "computed_at")}
+            ))
+        return len(values)
+
+    @classmethod
+    def _store_chunked(cls, session: Session, matrix: GenreMatrix, movie_ids: list[int], chunk_size: int) -> int:
+        """`_store` over `movie_ids`, `chunk_size` rows of the similarity matrix at a time."""
+        stored = 0
+        for start in range(0, len(movie_ids), chunk_size):
+            stored += cls._store(session, matrix, set(movie_ids[start:start + chunk_size]))
+        return stored
+
+    @classmethod
+    def refresh(cls, movie_id: int, old_genre_ids: Iterable[int] = (), chunk_size: int = CHUNK_SIZE) -> int:
+        """
+        Recompute the movies affected by `movie_id` having changed genres (or been created/deleted).
+
+        Loads the genre matrix of the whole catalog, so it runs as a background
+        task after the catalog change has committed, not inside the request.
+        """
+        with Session(Database.get_engine()) as session:
+            new_genre_ids = session.exec(select(MovieGenre.genre_id).where(MovieGenre.movie_id == movie_id)).all()
+            genre_ids = set(old_genre_ids) | set(new_genre_ids)
+            affected = {movie_id}
+            if genre_ids:
+                statement = select(MovieGenre.movie_id).where(MovieGenre.genre_id.in_(genre_ids)).distinct() # type: ignore
+                affected.update(session.exec(statement).all())
+
+            stored = cls._store_chunked(session, GenreMatrix.load(session), sorted(affected), chunk_size)
+            session.commit()
+        return stored
+
+    @classmethod
+    def rebuild(cls, chunk_size: int = CHUNK_SIZE) -> int:
+        """Recompute every movie, `chunk_size` rows of the similarity matrix at a time."""
+        started = time.perf_counter()
+        with Session(Database.get_engine()) as session:
+            matrix = GenreMatrix.load(session)
+            stored = cls._store_chunked(session, matrix, matrix.movie_ids.tolist(), chunk_size)
+            session.execute(delete(MovieRecommendation).where(
+                MovieRecommendation.movie_id.not_in(matrix.movie_ids.tolist()) # type: ignore
+            ))
+            session.commit()
+        logger.success(f"Rebuilt similar movies for {stored} movies in {time.perf_counter() - started:.3f}s")
+        return stored
+
+
+class RecommendationService:
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    async def get_similar_movies(self, movie_id: int) -> SimilarMoviesResponse:
+        """Get the precomputed similar movies of a movie."""
+        recommendation: MovieRecommendation | None = self._session.get(MovieRecommendation, movie_id)
+        if not recommendation:
+            return SimilarMoviesResponse(movie_id=movie_id, similar=[], computed_at=None)
+        return SimilarMoviesResponse(
+            movie_id=movie_id,
+            similar=[
+                SimilarMovie(movie_id=similar_id, score=score)
+                for similar_id, score in zip(recommendation.similar_movie_ids, recommendation.scores)
+            ],
+            computed_at=recommendation.computed_at
+        )
+
+
+def get_recommendation_service(session: SessionDep) -> RecommendationService:
+    """"""
+    return RecommendationService(session)
+
+
+RecommendationServiceDep = Annotated[RecommendationService, Depends(get_recommendation_service)]
@@ -0,0 +1,30 @@
+from sqlmodel import Session
+from loguru import logger
+
+from app.models import OutboxMessage
+
+from .notifications import Notifier
+from .outbox import OutboxDispatcher
+
+REFUND_TOPIC: str = "reservation.refund"
+
+
+class RefundIssuer:
+    """
+    Settles `reservation.refund` outbox messages. No payment provider is wired
+    in yet, so a refund is recorded in the log and announced to its user; a
+    provider call would go here, keyed by booking reference to stay idempotent.
+    """
+
+    @staticmethod
+    def handle(session: Session, messages: list[OutboxMessage]) -> dict[int, Exception | None]:
+        events = []
+        for message in messages:
+            refund = message.payload
+            logger.info(f"Refunding {refund['amount']} for {refund['booking_reference']} ({refund.get('reason') or 'no reason'})")
+            events.append((refund["user_id"], "reservation.refunded", refund))
+        Notifier.publish_many(session, events)
+        return {message.id: None for message in messages} # type: ignore
+
+
+OutboxDispatcher.register(REFUND_TOPIC, RefundIssuer.handle)
@@ -0,0 +1,445 @@
+from fastapi import Depends
+from sqlmodel import Session, select, func
+from sqlalchemy import Integer, column, tuple_, union_all, update, values
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import Select
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Annotated, Any, Callable
+from app.core import IdempotencyStore, BookingReferenceGenerator, booking_references
+from app.database import SessionDep, DataLoader
+from app.models import (
+    Reservation, ReservationSeat, ReservationStatus, ReservationCreate, ReservationResponse,
+    CartCheckout, CartCheckoutResponse,
+    ReservationArchive, ReservationSeatArchive, ReservationHistoryItem, ReservationHistoryPage,
+    Screening, Seat, Movie, Auditorium, Theatre, UserResponse, UserRole,
+    WaitlistEntry, WaitlistStatus
+)
+from app.utils.exceptions import (
+    NotFoundException,
+    BadRequestException,
+    SeatsUnavailableException
+)
+from app.utils.helpers import encode_cursor, decode_cursor
+
+from .pricing import PricingEngine
+from .screening import ScreeningService, ScreeningServiceDep
+from .waitlist import WaitlistPromoter
+from .tickets import TicketIssuer
+
+
+class ReservationService:
+
+    def __init__(self, session: Session, screening_service: ScreeningService) -> None:
+        self._session = session
+        self._screening_service = screening_service
+
+    def reservation_to_response(self, reservation: Reservation | ReservationArchive) -> ReservationResponse:
+        """Convert reservation db model to response."""
+        return ReservationResponse(
+            **reservation.model_dump(),
+            seat_ids=[s.seat_id for s in DataLoader.for_session(self._session).load(reservation, "seats")]
+        )
+
+    def _lock_screening(self, screening_id: int) -> Screening:
+        """Lock the screening row; every seat change for a screening goes through this lock."""
+        statement = select(Screening).where(Screening.id == screening_id).with_for_update()
+        screening: Screening | None = self._session.exec(statement).first()
+        if not screening or not screening.is_active or screening.is_deleted:
+            raise NotFoundException("Screening not found")
+        return screening
+
+    def _book(self, user_id: int, payload: ReservationCreate) -> Reservation:
+        """Reserve seats for a screening. Does not commit."""
+        screening = self._lock_screening(payload.screening_id)
+        if screening.start_time <= datetime.now(timezone.utc):
+            raise BadRequestException("Screening has already started")
+
+        seat_ids = sorted(set(payload.seat_ids))
+        statement = select(Seat).where(
+            Seat.id.in_(seat_ids), # type: ignore
+            Seat.auditorium_id == screening.auditorium_id,
+            Seat.is_active == True
+        ).order_by(Seat.id) # type: ignore
+        seats = self._session.exec(statement).all()
+        if len(seats) != len(seat_ids):
+            raise BadRequestException("Some seats do not belong to this screening")
+
+        taken = self._screening_service.taken_seat_ids(screening.id, seat_ids) # type: ignore
+        if taken:
+            raise SeatsUnavailableException(sorted(taken))
+
+        prices = PricingEngine.price_seats(
+            self._session, screening, screening.auditorium.capacity, [s.seat_type for s in seats]
+        )
+        reservation = Reservation(
+            user_id=user_id,
+            screening_id=screening.id, # type: ignore
+            total_price=sum(prices),
+            booking_reference=booking_references.generate(),
+            notes=payload.notes,
+            seats=[
+                ReservationSeat(seat_id=seat.id, price_paid=price) # type: ignore
+                for seat, price in zip(seats, prices)
+            ]
+        )
+        screening.available_seats = max(0, screening.available_seats - len(seats))
+        screening.touch()
+
+        self._session.add(reservation)
+        TicketIssuer.enqueue(self._session, reservation)
+        self._session.flush()
+        return reservation
+
+    def _checkout(self, user_id: int, payload: CartCheckout) -> list[Reservation]:
+        """
+        Reserve seats across several screenings in one transaction; all or nothing. Does not commit.
+
+        Screenings are locked in one statement in id order, so two carts sharing
+        screenings always lock them in the same order and cannot deadlock each
+        other (single bookings lock one screening, so they cannot either). Seats,
+        taken seats and seat counts are each one statement for the whole cart.
+        """
+        items = {item.screening_id: item for item in payload.items}
+        if len(items) != len(payload.items):
+            raise BadRequestException("Each screening can appear only once in a cart")
+        screening_ids = sorted(items)
+
+        statement = (
+            select(Screening)
+            .where(Screening.id.in_(screening_ids)) # type: ignore
+            .order_by(Screening.id) # type: ignore
+            .with_for_update()
+        )
+        screenings = {screening.id: screening for screening in self._session.exec(statement).all()}
+        now = datetime.now(timezone.utc)
+        for screening_id in screening_ids:
+            screening = screenings.get(screening_id)
+            if not screening or not screening.is_active or screening.is_deleted:
+                raise NotFoundException(f"Screening {screening_id} not found")
+            if screening.start_time <= now:
+                raise BadRequestException(f"Screening {screening_id} has already started")
+
+        seat_ids = sorted({seat_id for item in payload.items for seat_id in item.seat_ids})
+        statement = select(Seat).where(Seat.id.in_(seat_ids), Seat.is_active == True).order_by(Seat.id) # type: ignore
+        seats_by_id = {seat.id: seat for seat in self._session.exec(statement).all()}
+        taken = self._screening_service.taken_seats(screening_ids, seat_ids)
+
+        reservations: list[Reservation] = []
+        booked_counts: list[tuple[int, int]] = []
+        unavailable: list[int] = []
+        loader = DataLoader.for_session(self._session)
+        for screening_id in screening_ids:
+            screening, item = screenings[screening_id], items[screening_id]
+            seats = [seats_by_id.get(seat_id) for seat_id in sorted(set(item.seat_ids))]
+            if any(seat is None or seat.auditorium_id != screening.auditorium_id for seat in seats):
+                raise BadRequestException(f"Some seats do not belong to screening {screening_id}")
+            unavailable.extend(seat.id for seat in seats if seat.id in taken[screening_id]) # type: ignore
+            if unavailable:
+                continue
+
+            auditorium = loader.load(screening, "auditorium")
+            prices = PricingEngine.price_seats(
+                self._session, screening, auditorium.capacity, [seat.seat_type for seat in seats] # type: ignore
+            )
+            reservations.append(Reservation(
+                user_id=user_id,
+                screening_id=screening_id,
+                total_price=sum(prices),
+                booking_reference=booking_references.generate(),
+                notes=item.notes,
+                seats=[
+                    ReservationSeat(seat_id=seat.id, price_paid=price) # type: ignore
+                    for seat, price in zip(seats, prices)
+                ]
+            ))
+            booked_counts.append((screening_id, len(seats)))
+        if unavailable:
+            raise SeatsUnavailableException(sorted(unavailable))
+
+        counts = values(column("screening_id", Integer), column("seats", Integer), name="booked").data(booked_counts)
+        self._session.execute(
+            update(Screening)
+            .where(Screening.id == counts.c.screening_id)
+            .values(
+                available_seats=func.greatest(Screening.available_seats - counts.c.seats, 0),
+                updated_at=now
+            ),
+            execution_options={"synchronize_session": False}
+        )
+        for screening in screenings.values():
+            self._session.expire(screening, ["available_seats", "updated_at"])
+
+        self._session.add_all(reservations)
+        for reservation in reservations:
+            TicketIssuer.enqueue(self._session, reservation)
+        self._session.flush()
+        return reservations
+
+    def _cancel(self, user: UserResponse, reservation_id: int) -> Reservation:
+        """Cancel a booked reservation and release its seats. Does not commit."""
+        reservation: Reservation | None = self._session.get(Reservation, reservation_id)
+        if not reservation or (reservation.user_id != user.id and user.role != UserRole.ADMIN):
+            raise NotFoundException("Reservation not found")
+
+        screening = self._lock_screening(reservation.screening_id)
+        self._session.refresh(reservation, with_for_update=True)
+        if reservation.status != ReservationStatus.BOOKED:
+            raise BadRequestException("Only booked reservations can be cancelled")
+
+        reservation.cancel()
+        screening.available_seats += len(reservation.seats)
+        screening.touch()
+        # Freed seats go to the waitlist in this same transaction, before anyone else can book them.
+        WaitlistPromoter.promote(self._session, screening)
+        self._session.flush()
+        return reservation
+
+    def _claim(self, user: UserResponse, entry_id: int, notes: str | None) -> Reservation:
+        """Book the seats held for a promoted waitlist entry. Does not commit."""
+        entry: WaitlistEntry | None = self._session.get(WaitlistEntry, entry_id)
+        if not entry or entry.user_id != user.id:
+            raise NotFoundException("Waitlist entry not found")
+
+        screening = self._lock_screening(entry.screening_id)
+        self._session.refresh(entry, with_for_update=True)
+        if entry.status != WaitlistStatus.OFFERED or entry.hold_expires_at <= datetime.now(timezone.utc): # type: ignore
+            raise BadRequestException("No seats are held for this waitlist entry")
+
+        # Hand the held seats back, then book them like any other seats in the same transaction.
+        entry.status = WaitlistStatus.CLAIMED
+        entry.touch()
+        screening.available_seats += len(entry.held_seat_ids)
+        self._session.flush()
+        return self._book(user.id, ReservationCreate(
+            screening_id=entry.screening_id, seat_ids=entry.held_seat_ids, notes=notes
+        ))
+
+    def _locked(self, operation: Callable[[], Any]) -> Any:
+        """
+        Run a seat-changing operation and commit it; on failure roll back at once.
+
+        Handlers run on the event loop, so row locks of a failed operation must
+        not wait for request teardown: the next request could block the loop on them.
+        """
+        try:
+            result = operation()
+            self._session.commit()
+        except BaseException:
+            self._session.rollback()
+            raise
+        for reservation in result if isinstance(result, list) else [result]:
+            self._session.refresh(reservation)
+        return result
+
+    async def _idempotent(
+        self,
+        scope: str,
+        idempotency_key: str | None,
+        fingerprint: str,
+        operation: Callable[[], Reservation]
+        ) -> ReservationResponse:
+        """Run `operation`, or replay its stored result if the key was seen before."""
+        if idempotency_key is None:
+            return self.reservation_to_response(self._locked(operation))
+
+        reference = IdempotencyStore.run(
+            self._session, scope, idempotency_key, fingerprint, lambda: operation().booking_reference # type: ignore
+        )
+        return await self.get_by_reference(reference)
+
+    async def create_reservation(
+        self,
+        user: UserResponse,
+        payload: ReservationCreate,
+        idempotency_key: str | None = None
+        ) -> ReservationResponse:
+        """Book seats for the current user."""
+        return await self._idempotent(
+            f"{user.id}:book",
+            idempotency_key,
+            payload.model_dump_json(),
+            lambda: self._book(user.id, payload)
+        )
+
+    async def cancel_reservation(
+        self,
+        user: UserResponse,
+        reservation_id: int,
+        idempotency_key: str | None = None
+        ) -> ReservationResponse:
+        """Cancel one of the current user's reservations."""
+        return await self._idempotent(
+            f"{user.id}:cancel",
+            idempotency_key,
+            str(reservation_id),
+            lambda: self._cancel(user, reservation_id)
+        )
+
+    async def claim_waitlist_hold(
+        self,
+        user: UserResponse,
+        entry_id: int,
+        notes: str | None = None,
+        idempotency_key: str | None = None
+        ) -> ReservationResponse:
+        """Turn the current user's waitlist hold into a booking."""
+        return await self._idempotent(
+            f"{user.id}:claim",
+            idempotency_key,
+            str(entry_id),
+            lambda: self._claim(user, entry_id, notes)
+        )
+
+    async def checkout_cart(
+        self,
+        user: UserResponse,
+        payload: CartCheckout,
+        idempotency_key: str | None = None
+        ) -> CartCheckoutResponse:
+        """Book every item of a cart for the current user, or none of them."""
+        if idempotency_key is None:
+            reservations = [
+                self.reservation_to_response(r) for r in self._locked(lambda: self._checkout(user.id, payload))
+            ]
+        else:
+            references = IdempotencyStore.run(
+                self._session,
+                f"{user.id}:checkout",
+                idempotency_key,
+                payload.model_dump_json(),
+                lambda: ",".join(r.booking_reference for r in self._checkout(user.id, payload)) # type: ignore
+            )
+            reservations = [await self.get_by_reference(reference) for reference in references.split(",")]
+        return CartCheckoutResponse(
+            reservations=reservations,
+            total_price=sum((r.total_price for r in reservations), Decimal("0"))
+        )
+
+    async def get_by_reference(self, booking_reference: str) -> ReservationResponse:
+        """Get one reservation by its booking reference."""
+        normalized = BookingReferenceGenerator.normalize(booking_reference)
+        if normalized is None:
+            raise BadRequestException("Invalid booking reference")
+        booking_reference = normalized
+        statement = select(Reservation).where(Reservation.booking_reference == booking_reference)
+        reservation: Reservation | ReservationArchive | None = self._session.exec(statement).first()
+        if not reservation:
+            archived = select(ReservationArchive).where(ReservationArchive.booking_reference == booking_reference)
+            reservation = self._session.exec(archived).first()
+        if not reservation:
+            raise NotFoundException("Reservation not found")
+        return self.reservation_to_response(reservation)
+
+    async def get_user_reservation_by_reference(self, user: UserResponse, booking_reference: str) -> ReservationResponse:
+        """Get one of the current user's reservations by its booking reference."""
+        response = await self.get_by_reference(booking_reference)
+        if response.user_id != user.id and user.role != UserRole.ADMIN:
+            raise NotFoundException("Reservation not found")
+        return response
+
+    async def get_one_reservation(self, user: UserResponse, reservation_id: int) -> ReservationResponse:
+        """Get one of the current user's reservations by its ID."""
+        reservation: Reservation | ReservationArchive | None = (
+            self._session.get(Reservation, reservation_id) or self._session.get(ReservationArchive, reservation_id)
+        )
+        if not reservation or (reservation.user_id != user.id and user.role != UserRole.ADMIN):
+            raise NotFoundException("Reservation not found")
+        return self.reservation_to_response(reservation)
+
+    @staticmethod
+    def _newest_first(model: Any, user_id: int, cursor: tuple[datetime, int] | None, limit: int, *criteria: Any) -> Select:
+        """Keyset page of (id, created_at) for one user, newest first."""
+        statement = select(model.id, model.created_at).where(model.user_id == user_id, *criteria)
+        if cursor is not None:
+            statement = statement.where(tuple_(model.created_at, model.id) < tuple_(*cursor))
+        return statement.order_by(model.created_at.desc(), model.id.desc()).limit(limit)
+
+    @staticmethod
+    def _seat_labels(reservation_seat: Any, reservation_id: Any):
+        """Seat identifiers like 'A12' of one reservation, in seat order."""
+        label = func.concat(Seat.row_label, Seat.seat_number)
+        return (
+            select(func.array_agg(aggregate_order_by(label, Seat.row_label, Seat.seat_number)))
+            .select_from(reservation_seat)
+            .join(Seat, Seat.id == reservation_seat.seat_id) # type: ignore
+            .where(reservation_seat.reservation_id == reservation_id)
+            .scalar_subquery()
+        )
+
+    async def get_user_reservations(
+        self,
+        user: UserResponse,
+        status: ReservationStatus | None = None,
+        cursor: str | None = None,
+        limit: int = 20
+        ) -> ReservationHistoryPage:
+        """
+        Get a page of the current user's reservations, newest first, hot and archived.
+
+        Each status gets its own range scan of idx_reservation_user_status_created, so
+        a page costs `limit` index entries per status however long the history is.
+        Details are joined for the final page only, all in one statement.
+        """
+        try:
+            position = decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            raise BadRequestException(str(e))
+
+        statuses = [status] if status else list(ReservationStatus)
+        archived_criteria = [ReservationArchive.status == status] if status else []
+        candidates = union_all(
+            *[self._newest_first(Reservation, user.id, position, limit, Reservation.status == s) for s in statuses],
+            self._newest_first(ReservationArchive, user.id, position, limit, *archived_criteria),
+        ).subquery()
+        page = (
+            select(candidates.c.id, candidates.c.created_at)
+            .order_by(candidates.c.created_at.desc(), candidates.c.id.desc())
+            .limit(limit)
+            .subquery()
+        )
+
+        hot, cold = aliased(Reservation), aliased(ReservationArchive)
+        screening_id = func.coalesce(hot.screening_id, cold.screening_id)
+        statement = (
+            select(
+                page.c.id,
+                func.coalesce(hot.booking_reference, cold.booking_reference),
+                func.coalesce(hot.status, cold.status),
+                func.coalesce(hot.total_price, cold.total_price),
+                page.c.created_at,
+                screening_id,
+                Screening.start_time,
+                Movie.title,
+                Theatre.name,
+                Auditorium.name,
+                func.coalesce(self._seat_labels(ReservationSeat, page.c.id), self._seat_labels(ReservationSeatArchive, page.c.id)),
+            )
+            .select_from(page)
+            .outerjoin(hot, hot.id == page.c.id)
+            .outerjoin(cold, cold.id == page.c.id)
+            .join(Screening, Screening.id == screening_id) # type: ignore
+            .join(Movie, Movie.id == Screening.movie_id) # type: ignore
+            .join(Auditorium, Auditorium.id == Screening.auditorium_id) # type: ignore
+            .join(Theatre, Theatre.id == Auditorium.theatre_id) # type: ignore
+            .order_by(page.c.created_at.desc(), page.c.id.desc())
+        )
+        items = [
+            ReservationHistoryItem(
+                id=row[0], booking_reference=row[1], status=row[2], total_price=row[3],
+                created_at=row[4], screening_id=row[5], start_time=row[6], movie_title=row[7],
+                theatre_name=row[8], auditorium_name=row[9], seats=row[10] or []
+            )
+            for row in self._session.execute(statement).all()
+        ]
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id) if len(items) == limit else None
+        return ReservationHistoryPage(items=items, next_cursor=next_cursor)
+
+
+def get_reservation_service(session: SessionDep, screening_service: ScreeningServiceDep) -> ReservationService:
+    """"""
+    return ReservationService(session, screening_service)
+
+
+ReservationServiceDep = Annotated[ReservationService, Depends(get_reservation_service)]
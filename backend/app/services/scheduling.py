@@ -0,0 +1,265 @@
+from fastapi import Depends
+from sqlmodel import Session, select, func
+from sqlalchemy import insert
+from datetime import datetime, time as clock, timedelta, timezone
+from typing import Annotated
+from zoneinfo import ZoneInfo
+import asyncio
+import math
+import time
+
+from app.core import settings
+from app.database import SessionDep
+from app.models import (
+    Movie, Theatre, Auditorium, Seat, Screening, ScreeningOccupancy, ScreeningForecast,
+    ScheduleRequest, ScheduledScreening, ScheduleResult
+)
+from app.utils.exceptions import NotFoundException, BadRequestException
+from app.utils.scheduling import Lane, ScheduleOptimizer, decayed_total, solve
+
+from .outbox import OutboxDispatcher
+
+# Relative demand by local hour of day; prime time is 1.0.
+HOURLY_DEMAND: tuple[float, ...] = (
+    0.30, 0.20, 0.10, 0.10, 0.10, 0.10, 0.10, 0.10, 0.15, 0.20, 0.30, 0.35,
+    0.45, 0.50, 0.55, 0.60, 0.70, 0.85, 1.00, 1.00, 0.95, 0.80, 0.60, 0.45,
+)
+WEEKEND_DEMAND: float = 1.25  # Friday from 17:00, Saturday and Sunday
+
+
+class ScheduleService:
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def _popularity(self, movie_ids: list[int]) -> dict[int, float]:
+        """
+        Share of seats each movie has sold so far, over all its screenings with
+        sales; for movies without sales yet, the mean forecast fill rate of
+        their upcoming screenings.
+        """
+        statement = (
+            select(
+                Screening.movie_id,
+                func.sum(ScreeningOccupancy.seats_sold) / func.nullif(func.sum(ScreeningOccupancy.capacity), 0)
+            )
+            .join(Screening, Screening.id == ScreeningOccupancy.screening_id) # type: ignore
+            .where(Screening.movie_id.in_(movie_ids)) # type: ignore
+            .group_by(Screening.movie_id)
+        )
+        shares = {movie_id: float(share) for movie_id, share in self._session.exec(statement).all() if share} # type: ignore
+        forecast = (
+            select(Screening.movie_id, func.avg(ScreeningForecast.fill_rate))
+            .join(Screening, Screening.id == ScreeningForecast.screening_id) # type: ignore
+            .where(Screening.movie_id.in_(set(movie_ids) - set(shares))) # type: ignore
+            .group_by(Screening.movie_id)
+        )
+        for movie_id, share in self._session.exec(forecast).all():
+            if share:
+                shares[movie_id] = float(share)
+        return shares
+
+    @staticmethod
+    def _hourly_demand(weekday: int) -> list[float]:
+        """Demand for every hour from the week's first local midnight, over eight days."""
+        demand = []
+        for hour in range(8 * 24):
+            day, hour_of_day = (weekday + hour // 24) % 7, hour % 24
+            weekend = day >= 5 or (day == 4 and hour_of_day >= 17)
+            demand.append(HOURLY_DEMAND[hour_of_day] * (WEEKEND_DEMAND if weekend else 1.0))
+        return demand
+
+    def _screenings(
+        self, auditorium_ids: list[int], week_start: datetime, zone: ZoneInfo
+    ) -> list[tuple[int, datetime, datetime]]:
+        """(auditorium, start, end) of active screenings within eight days from the week's first local midnight."""
+        statement = select(Screening.auditorium_id, Screening.start_time, Screening.end_time).where(
+            Screening.auditorium_id.in_(auditorium_ids), # type: ignore
+            Screening.is_active == True,
+            Screening.deleted_at == None, # type: ignore
+            Screening.start_time < (week_start + timedelta(days=8)).replace(tzinfo=zone),
+            Screening.end_time > week_start.replace(tzinfo=zone)
+        )
+        return list(self._session.exec(statement).all())
+
+    def _lanes(
+        self, payload: ScheduleRequest, auditorium_ids: list[int], week_start: datetime, zone: ZoneInfo
+    ) -> list[Lane]:
+        """Free time of each auditorium per day within opening hours, around screenings already planned."""
+        slot = settings.SCHEDULE_SLOT_MINUTES
+        to_minutes = lambda moment: (moment.astimezone(zone).replace(tzinfo=None) - week_start).total_seconds() / 60
+        now = max(0.0, to_minutes(datetime.now(timezone.utc)))
+
+        busy: dict[int, list[tuple[float, float]]] = {}
+        for auditorium_id, start, end in self._screenings(auditorium_ids, week_start, zone):
+            busy.setdefault(auditorium_id, []).append(
+                (to_minutes(start) - payload.cleaning_minutes, to_minutes(end) + payload.cleaning_minutes)
+            )
+
+        opens = payload.opens_at.hour * 60 + payload.opens_at.minute
+        closes = payload.closes_at.hour * 60 + payload.closes_at.minute
+        if closes <= opens:
+            closes += 24 * 60
+        lanes: list[Lane] = []
+        for index, auditorium_id in enumerate(auditorium_ids):
+            taken = sorted(busy.get(auditorium_id, []))
+            for day in range(7):
+                start, end = float(day * 24 * 60 + opens), float(day * 24 * 60 + closes)
+                start = max(start, now)
+                for busy_start, busy_end in taken + [(end, end)]:
+                    if busy_end <= start:
+                        continue
+                    window_start = math.ceil(start / slot) * slot
+                    window_end = int(min(busy_start, end))
+                    if window_end > window_start:
+                        lanes.append((index, day, window_start, window_end))
+                    start = max(start, busy_end)
+                    if start >= end:
+                        break
+        return lanes
+
+    async def plan_week(self, theatre_id: int, payload: ScheduleRequest) -> ScheduleResult:
+        """
+        Plan a week of screenings for a theatre's auditoriums and, unless
+        `dry_run`, insert them in one statement.
+
+        The search runs on a snapshot of the auditoriums' free time, with no
+        locks held, in the shared process pool when there is one. Only then
+        are the auditoriums locked, and planned screenings that now overlap
+        one created meanwhile (by another plan or by hand) are dropped before
+        the insert, so concurrent plans cannot overlap and the locks last one
+        short transaction.
+        """
+        started = time.perf_counter()
+        theatre: Theatre | None = self._session.get(Theatre, theatre_id)
+        if not theatre or not theatre.is_active or theatre.is_deleted:
+            raise NotFoundException("Theatre not found.")
+
+        statement = (
+            select(Auditorium)
+            .where(Auditorium.theatre_id == theatre_id, Auditorium.is_active == True) # type: ignore
+            .order_by(Auditorium.id) # type: ignore
+        )
+        if payload.auditorium_ids is not None:
+            statement = statement.where(Auditorium.id.in_(payload.auditorium_ids)) # type: ignore
+        auditoriums = list(self._session.exec(statement).all())
+        if not auditoriums or (payload.auditorium_ids is not None and len(auditoriums) != len(set(payload.auditorium_ids))):
+            raise BadRequestException("Some auditoriums are not active auditoriums of this theatre")
+
+        movie_ids = [movie.movie_id for movie in payload.movies]
+        movies = {
+            movie.id: movie for movie in self._session.exec(
+                select(Movie).where(Movie.id.in_(movie_ids), Movie.is_active == True) # type: ignore
+            ).all()
+        }
+        if len(movies) != len(movie_ids):
+            raise BadRequestException("Some movies are not active movies")
+        history = self._popularity(movie_ids)
+
+        zone = ZoneInfo(settings.PRICING_TIMEZONE)
+        week_start = datetime.combine(payload.week_start, clock())
+        auditorium_ids = [auditorium.id for auditorium in auditoriums]
+        lanes = self._lanes(payload, auditorium_ids, week_start, zone) # type: ignore
+        durations = [movies[movie_id].duration_minutes for movie_id in movie_ids]
+        prices = {movie.movie_id: movie.base_price or payload.base_price for movie in payload.movies}
+        optimizer = ScheduleOptimizer(
+            lanes=lanes,
+            capacities=[auditorium.capacity for auditorium in auditoriums],
+            durations=durations,
+            popularity=[
+                movie.popularity or history.get(movie.movie_id, settings.SCHEDULE_DEFAULT_POPULARITY)
+                for movie in payload.movies
+            ],
+            hourly_demand=self._hourly_demand(payload.week_start.weekday()),
+            cleaning_minutes=payload.cleaning_minutes,
+            slot_minutes=settings.SCHEDULE_SLOT_MINUTES,
+            decay=settings.SCHEDULE_REPEAT_DECAY,
+        )
+        # End the read transaction: nothing stays open, let alone locked, during the search.
+        self._session.commit()
+
+        executor = OutboxDispatcher.executor()
+        if executor:
+            # The search is pure Python: in a thread it would hold the GIL against the event loop.
+            optimizer, (greedy_score, _, iterations) = await asyncio.get_running_loop().run_in_executor(
+                executor, solve, optimizer, settings.SCHEDULE_SEARCH_SECONDS
+            )
+        else:
+            greedy_score, _, iterations = await asyncio.to_thread(optimizer.solve, settings.SCHEDULE_SEARCH_SECONDS)
+
+        # Every planned screening with its lane's day and unrounded expected seats, to score what is kept.
+        showings: list[tuple[ScheduledScreening, int, float]] = []
+        for lane_index, sequence in enumerate(optimizer.sequences):
+            lane = lanes[lane_index]
+            for movie_index, start in zip(sequence, optimizer.starts(lane_index, sequence) or []):
+                start_time = (week_start + timedelta(minutes=start)).replace(tzinfo=zone).astimezone(timezone.utc)
+                expected = optimizer.expected(lane, movie_index, start)
+                showings.append((ScheduledScreening(
+                    movie_id=movie_ids[movie_index],
+                    auditorium_id=auditorium_ids[lane[0]], # type: ignore
+                    start_time=start_time,
+                    end_time=start_time + timedelta(minutes=durations[movie_index]),
+                    expected_seats=round(expected, 1),
+                ), lane[1], expected))
+        showings.sort(key=lambda showing: (showing[0].start_time, showing[0].auditorium_id))
+
+        if not payload.dry_run and showings:
+            # The search saw an unlocked snapshot: lock the auditoriums, then drop what was taken meanwhile.
+            locked = set(self._session.exec(
+                select(Auditorium.id)
+                .where(Auditorium.id.in_(auditorium_ids), Auditorium.is_active == True) # type: ignore
+                .with_for_update()
+            ).all())
+            cleaning = timedelta(minutes=payload.cleaning_minutes)
+            taken: dict[int, list[tuple[datetime, datetime]]] = {}
+            for auditorium_id, start, end in self._screenings(auditorium_ids, week_start, zone):
+                taken.setdefault(auditorium_id, []).append((start - cleaning, end + cleaning))
+            now = datetime.now(timezone.utc)
+            showings = [
+                (s, day, expected) for s, day, expected in showings
+                if s.auditorium_id in locked and s.start_time > now and not any(
+                    start < s.end_time and s.start_time < end for start, end in taken.get(s.auditorium_id, [])
+                )
+            ]
+
+        planned = [s for s, _, _ in showings]
+        if not payload.dry_run and planned:
+            seats = dict(self._session.exec(
+                select(Seat.auditorium_id, func.count())
+                .where(Seat.auditorium_id.in_(auditorium_ids), Seat.is_active == True) # type: ignore
+                .group_by(Seat.auditorium_id)
+            ).all())
+            self._session.execute(insert(Screening), [ # type: ignore
+                dict(
+                    movie_id=s.movie_id, auditorium_id=s.auditorium_id, start_time=s.start_time, end_time=s.end_time,
+                    base_price=prices[s.movie_id], is_active=True, available_seats=seats.get(s.auditorium_id, 0),
+                    created_at=now, updated_at=now,
+                )
+                for s in planned
+            ])
+        self._session.commit()
+
+        # Scored as the search scores, but over the screenings returned: dropped slots no longer count.
+        groups: dict[tuple[int, int], list[float]] = {}
+        for s, day, expected in showings:
+            groups.setdefault((day, s.movie_id), []).append(expected)
+        score = decayed_total(groups.values(), settings.SCHEDULE_REPEAT_DECAY)
+
+        return ScheduleResult(
+            theatre_id=theatre_id,
+            week_start=payload.week_start,
+            screenings=planned,
+            expected_seats_sold=round(score, 1),
+            greedy_expected_seats_sold=round(greedy_score, 1),
+            iterations=iterations,
+            created=0 if payload.dry_run else len(planned),
+            elapsed_seconds=round(time.perf_counter() - started, 3),
+        )
+
+
+def get_schedule_service(session: SessionDep) -> ScheduleService:
+    """"""
+    return ScheduleService(session)
+
+
+ScheduleServiceDep = Annotated[ScheduleService, Depends(get_schedule_service)]
@@ -0,0 +1,182 @@
+from fastapi import Depends
+from sqlmodel import Session, select, func
+from sqlalchemy import Text, cast, insert, literal, union, update
+from datetime import datetime, timezone
+from typing import Annotated
+import time
+from app.database import SessionDep
+from app.models import (
+    Screening, Seat, Reservation, ReservationSeat, ReservationStatus, SeatPriceResponse,
+    WaitlistEntry, WaitlistStatus, OutboxMessage, OutboxStatus, ScreeningCancellationResult
+)
+from app.utils.exceptions import NotFoundException, BadRequestException
+
+from .analytics import RevenueRollups
+from .notifications import Notifier
+from .pricing import PricingEngine
+from .refunds import REFUND_TOPIC
+
+
+class ScreeningService:
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def get_screening(self, screening_id: int) -> Screening:
+        """Get an active screening or raise."""
+        screening: Screening | None = self._session.get(Screening, screening_id)
+        if not screening or not screening.is_active:
+            raise NotFoundException("Screening not found")
+        return screening
+
+    def taken_seats(self, screening_ids: list[int], seat_ids: list[int] | None = None) -> dict[int, set[int]]:
+        """
+        Seat ids per screening taken by booked reservations or held for promoted
+        waitlist entries, optionally among `seat_ids`. One query for all screenings.
+        """
+        booked = (
+            select(Reservation.screening_id, ReservationSeat.seat_id)
+            .join(Reservation, Reservation.id == ReservationSeat.reservation_id) # type: ignore
+            .where(
+                Reservation.screening_id.in_(screening_ids), # type: ignore
+                Reservation.status == ReservationStatus.BOOKED
+            )
+        )
+        holds = (
+            select(WaitlistEntry.screening_id, func.unnest(WaitlistEntry.held_seat_ids).label("seat_id"))
+            .where(WaitlistEntry.screening_id.in_(screening_ids), WaitlistEntry.status == WaitlistStatus.OFFERED) # type: ignore
+            .subquery()
+        )
+        held = select(holds.c.screening_id, holds.c.seat_id)
+        if seat_ids is not None:
+            booked = booked.where(ReservationSeat.seat_id.in_(seat_ids)) # type: ignore
+            held = held.where(holds.c.seat_id.in_(seat_ids))
+
+        taken: dict[int, set[int]] = {screening_id: set() for screening_id in screening_ids}
+        for screening_id, seat_id in self._session.execute(union(booked, held)).all():
+            taken[screening_id].add(seat_id)
+        return taken
+
+    def taken_seat_ids(self, screening_id: int, seat_ids: list[int] | None = None) -> set[int]:
+        """Seat ids of one screening that are booked or held, optionally among `seat_ids`."""
+        return self.taken_seats([screening_id], seat_ids)[screening_id]
+
+    async def get_seat_map(self, screening_id: int) -> list[SeatPriceResponse]:
+        """Get every seat of a screening with its price and availability."""
+        screening = self.get_screening(screening_id)
+        statement = (
+            select(Seat)
+            .where(Seat.auditorium_id == screening.auditorium_id, Seat.is_active == True)
+            .order_by(Seat.row_label, Seat.seat_number) # type: ignore
+        )
+        seats = self._session.exec(statement).all()
+        taken = self.taken_seat_ids(screening_id)
+        prices = PricingEngine.price_seats(
+            self._session, screening, screening.auditorium.capacity, [s.seat_type for s in seats]
+        )
+        return [
+            SeatPriceResponse(
+                seat_id=seat.id, # type: ignore
+                seat_identifier=seat.seat_identifier,
+                seat_type=seat.seat_type,
+                price=price,
+                is_available=seat.id not in taken,
+            )
+            for seat, price in zip(seats, prices)
+        ]
+
+    async def cancel_screening(self, screening_id: int, reason: str | None = None) -> ScreeningCancellationResult:
+        """
+        Cancel a screening with everything booked for it, in one short transaction.
+
+        Reservations are cancelled and their refunds queued by a single
+        statement (an UPDATE ... RETURNING feeding an INSERT into the outbox),
+        rather than object by object. Only this screening's row and its own
+        reservations are locked, so booking other screenings is never blocked.
+        Seat rows are kept for the refund trail; cancelled reservations no
+        longer count as taking their seats.
+        """
+        started = time.perf_counter()
+        now = datetime.now(timezone.utc)
+        statement = select(Screening).where(Screening.id == screening_id).with_for_update()
+        screening: Screening | None = self._session.exec(statement).first()
+        if not screening or screening.is_deleted:
+            raise NotFoundException("Screening not found")
+        if not screening.is_active:
+            raise BadRequestException("Screening is already cancelled")
+        if screening.start_time <= now:
+            raise BadRequestException("Screening has already started")
+
+        cancelled = (
+            update(Reservation)
+            .where(Reservation.screening_id == screening_id, Reservation.status == ReservationStatus.BOOKED) # type: ignore
+            .values(status=ReservationStatus.CANCELLED, cancelled_at=now, updated_at=now)
+            .returning(Reservation.id, Reservation.user_id, Reservation.booking_reference, Reservation.total_price)
+            .cte("cancelled")
+        )
+        refund = func.jsonb_build_object(
+            "reservation_id", cancelled.c.id, "user_id", cancelled.c.user_id,
+            "booking_reference", cancelled.c.booking_reference, "amount", cast(cancelled.c.total_price, Text),
+            "screening_id", screening_id, "reason", reason,
+        )
+        refunds = (
+            insert(OutboxMessage)
+            .from_select(
+                ["topic", "payload", "status", "attempts", "created_at", "available_at"],
+                select(
+                    literal(REFUND_TOPIC), refund, literal(OutboxStatus.PENDING.name), literal(0),
+                    literal(now), literal(now)
+                ).select_from(cancelled)
+            )
+            .returning(OutboxMessage.id)
+            .cte("refunds")
+        )
+        rows = self._session.execute(
+            select(cancelled.c.id, select(func.count()).select_from(refunds).scalar_subquery())
+            .add_cte(refunds)
+        ).all()
+        reservation_ids = {row[0] for row in rows}
+        refunds_queued = rows[0][1] if rows else 0
+
+        seats = 0
+        if reservation_ids:
+            seats = self._session.exec(
+                select(func.count()).select_from(ReservationSeat)
+                .where(ReservationSeat.reservation_id.in_(reservation_ids)) # type: ignore
+            ).one()
+            # Bulk updates skip the flush hook that keeps the rollups current.
+            RevenueRollups.apply(self._session, set(), reservation_ids)
+
+        waitlist = self._session.execute(
+            update(WaitlistEntry)
+            .where(
+                WaitlistEntry.screening_id == screening_id,
+                WaitlistEntry.status.in_([WaitlistStatus.WAITING, WaitlistStatus.OFFERED]) # type: ignore
+            )
+            .values(status=WaitlistStatus.EXPIRED, updated_at=now)
+            .returning(WaitlistEntry.id, WaitlistEntry.user_id)
+        ).all()
+        Notifier.publish_many(self._session, [
+            (user_id, "waitlist.expired", {"entry_id": entry_id, "screening_id": screening_id})
+            for entry_id, user_id in waitlist
+        ])
+
+        screening.is_active = False
+        screening.touch()
+        self._session.commit()
+        return ScreeningCancellationResult(
+            screening_id=screening_id,
+            reservations=len(reservation_ids),
+            seats=seats,
+            refunds_queued=refunds_queued,
+            waitlist_entries=len(waitlist),
+            elapsed_seconds=round(time.perf_counter() - started, 3),
+        )
+
+
+def get_screening_service(session: SessionDep) -> ScreeningService:
+    """"""
+    return ScreeningService(session)
+
+
+ScreeningServiceDep = Annotated[ScreeningService, Depends(get_screening_service)]
@@ -1,10 +1,94 @@
 from fastapi import Depends
-from sqlmodel import Session, select
+from sqlmodel import Session, select, func
+from sqlalchemy import or_
+from sqlalchemy.orm import selectinload
 from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timezone
 from typing import Annotated
-from app.database import SessionDep
-from app.models import Theatre, TheatreCreate, TheatreUpdate, TheatreResponse
+from loguru import logger
+import threading
+import time
+from app.core import settings
+from app.database import SessionDep, DataLoader
+from app.models import (
+    Theatre, TheatreCreate, TheatreUpdate, TheatreResponse, NearbyTheatre, NearbyScreening,
+    Screening, Auditorium
+)
 from app.utils.exceptions import NotFoundException, EntityExistsException, ServerError
+from app.utils.geo import GeoGrid, MAX_DISTANCE_KM, bounding_box, haversine_km
+
+
+class TheatreLocator:
+    """
+    Process-wide spatial index of active theatres with a location.
+
+    TheatreService moves a theatre in the grid as it writes it, so this worker
+    sees its own writes at once. Writes by other workers are caught by
+    probing the theatre table's version (row count and latest `updated_at`)
+    at most every `GEO_INDEX_REFRESH_SECONDS` and reloading when it moved.
+    """
+
+    _grid: GeoGrid | None = None
+    _version: tuple[int, datetime | None] | None = None
+    _checked_at: float = 0.0
+    _lock: threading.Lock = threading.Lock()
+
+    @classmethod
+    def invalidate(cls) -> None:
+        with cls._lock:
+            cls._grid = None
+            cls._version = None
+
+    @staticmethod
+    def _theatres_version(session: Session) -> tuple[int, datetime | None]:
+        count, updated_at = session.exec(select(func.count(), func.max(Theatre.updated_at))).one() # type: ignore
+        return count, updated_at
+
+    @staticmethod
+    def _indexable(theatre: Theatre) -> bool:
+        return theatre.is_active and not theatre.is_deleted and theatre.latitude is not None
+
+    @classmethod
+    def grid(cls, session: Session) -> GeoGrid:
+        """The grid, reloaded only if the theatre table changed since it was built."""
+        now = time.monotonic()
+        if cls._grid is not None and now - cls._checked_at < settings.GEO_INDEX_REFRESH_SECONDS:
+            return cls._grid
+
+        with cls._lock:
+            version = cls._theatres_version(session)
+            if cls._grid is None or version != cls._version:
+                grid = GeoGrid(settings.GEO_INDEX_CELL_DEGREES)
+                statement = select(Theatre.id, Theatre.latitude, Theatre.longitude).where(
+                    Theatre.is_active == True,
+                    Theatre.deleted_at == None, # type: ignore
+                    Theatre.latitude != None # type: ignore
+                )
+                for theatre_id, latitude, longitude in session.exec(statement).all():
+                    grid.add(theatre_id, latitude, longitude) # type: ignore
+                cls._grid, cls._version = grid, version
+                logger.info(f"Loaded theatre geo index: {len(grid)} theatres (version {version}).")
+            cls._checked_at = now
+            return cls._grid
+
+    @classmethod
+    def update(cls, session: Session, theatre: Theatre, created: bool = False) -> None:
+        """Move a just committed theatre in the grid, without a reload."""
+        with cls._lock:
+            if cls._grid is None:
+                return
+            if cls._indexable(theatre):
+                cls._grid.add(theatre.id, theatre.latitude, theatre.longitude) # type: ignore
+            else:
+                cls._grid.remove(theatre.id) # type: ignore
+            # Only this write moved the version: keep the grid. Anything else: reload on next use.
+            count, updated_at = cls._version # type: ignore
+            expected = (count + int(created), max(updated_at, theatre.updated_at) if updated_at else theatre.updated_at)
+            version = cls._theatres_version(session)
+            if version == expected:
+                cls._version = version
+            else:
+                cls._checked_at = 0.0
 
 
 class TheatreService:
@@ -14,7 +98,8 @@ class TheatreService:
     
     def theatre_to_response(self, theatre: Theatre) -> TheatreResponse:
         """Convert theatre db model to response."""
-        auditorium_names: list[str] = [a.name for a in theatre.auditoriums]
+        auditoriums = DataLoader.for_session(self._session).load(theatre, "auditoriums")
+        auditorium_names: list[str] = [a.name for a in auditoriums]
         return TheatreResponse(**theatre.model_dump(), auditorium_names=auditorium_names)
     
     async def create_theatre(self, payload: TheatreCreate) -> TheatreResponse:
@@ -24,6 +109,7 @@ class TheatreService:
             self._session.add(theatre)
             self._session.commit()
             self._session.refresh(theatre)
+            TheatreLocator.update(self._session, theatre, created=True)
             return self.theatre_to_response(theatre)
         except IntegrityError:
             raise EntityExistsException("Theatre already exists.")
@@ -47,6 +133,17 @@ class TheatreService:
         theatres = self._session.exec(statement).all()
         return [self.theatre_to_response(theatre) for theatre in theatres]
     
+    async def get_theatres_by_ids(self, theatre_ids: list[int]) -> tuple[list[TheatreResponse], list[int]]:
+        """Get theatres by ID in one query, in request order. Also returns the IDs not found."""
+        statement = (
+            select(Theatre)
+            .where(Theatre.id.in_(theatre_ids)) # type: ignore
+            .options(selectinload(Theatre.auditoriums)) # type: ignore
+        )
+        found = {theatre.id: theatre for theatre in self._session.exec(statement).all()}
+        theatres = [self.theatre_to_response(found[i]) for i in theatre_ids if i in found]
+        return theatres, [i for i in theatre_ids if i not in found]
+
     async def update_theatre(self, theatre_id: int, payload: TheatreUpdate) -> TheatreResponse:
         """Update an existing theatre."""
         theatre: Theatre | None = self._session.get(Theatre, theatre_id)
@@ -64,6 +161,7 @@ class TheatreService:
             theatre.touch()
             self._session.commit()
             self._session.refresh(theatre)
+            TheatreLocator.update(self._session, theatre)
         
         return self.theatre_to_response(theatre)
     
@@ -74,6 +172,109 @@ class TheatreService:
             raise NotFoundException("Theatre not found.")
         theatre.soft_delete()
         self._session.commit()
+        TheatreLocator.update(self._session, theatre)
+
+    def _nearest_from_db(
+        self, latitude: float, longitude: float, limit: int, radius_km: float | None, allowed: set[int] | None
+    ) -> list[tuple[float, int]]:
+        """
+        Fallback for GeoGrid.nearest on idx_theatre_location: read the bounding
+        box of a radius, doubling it until it holds `limit` theatres.
+        """
+        cap = min(radius_km, MAX_DISTANCE_KM) if radius_km is not None else MAX_DISTANCE_KM
+        radius = min(10.0, cap)
+        while True:
+            min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius)
+            in_lon = (
+                Theatre.longitude.between(min_lon, max_lon) if min_lon <= max_lon # type: ignore
+                else or_(Theatre.longitude >= min_lon, Theatre.longitude <= max_lon) # type: ignore
+            )
+            statement = select(Theatre.id, Theatre.latitude, Theatre.longitude).where(
+                Theatre.latitude.between(min_lat, max_lat), in_lon, # type: ignore
+                Theatre.is_active == True,
+                Theatre.deleted_at == None # type: ignore
+            )
+            if allowed is not None:
+                statement = statement.where(Theatre.id.in_(allowed)) # type: ignore
+            found = sorted(
+                (distance, theatre_id)
+                for theatre_id, lat, lon in self._session.exec(statement).all()
+                if (distance := haversine_km(latitude, longitude, lat, lon)) <= radius # type: ignore
+            )
+            if len(found) >= min(limit, len(allowed) if allowed is not None else limit) or radius >= cap:
+                return found[:limit] # type: ignore
+            radius = min(radius * 2, cap)
+
+    def _showtimes(
+        self, movie_id: int, starts_after: datetime, starts_before: datetime | None
+    ) -> dict[int, list[NearbyScreening]]:
+        """Upcoming active screenings of a movie in the window, by theatre."""
+        statement = (
+            select(Screening, Auditorium.theatre_id, Auditorium.name)
+            .join(Auditorium, Auditorium.id == Screening.auditorium_id) # type: ignore
+            .where(
+                Screening.movie_id == movie_id,
+                Screening.is_active == True,
+                Screening.deleted_at == None, # type: ignore
+                Screening.start_time >= starts_after
+            )
+            .order_by(Screening.start_time) # type: ignore
+        )
+        if starts_before is not None:
+            statement = statement.where(Screening.start_time < starts_before)
+        showtimes: dict[int, list[NearbyScreening]] = {}
+        for screening, theatre_id, auditorium_name in self._session.exec(statement).all():
+            showtimes.setdefault(theatre_id, []).append(NearbyScreening(
+                id=screening.id, movie_id=screening.movie_id, auditorium_name=auditorium_name, # type: ignore
+                start_time=screening.start_time, end_time=screening.end_time,
+                available_seats=screening.available_seats,
+            ))
+        return showtimes
+
+    async def find_nearby(
+        self,
+        latitude: float,
+        longitude: float,
+        limit: int = 10,
+        radius_km: float | None = None,
+        movie_id: int | None = None,
+        starts_after: datetime | None = None,
+        starts_before: datetime | None = None
+    ) -> list[NearbyTheatre]:
+        """
+        The nearest active theatres, optionally within `radius_km`. With
+        `movie_id`, only theatres showing that movie in the time window count,
+        and their showtimes come along.
+        """
+        showtimes: dict[int, list[NearbyScreening]] = {}
+        allowed: set[int] | None = None
+        if movie_id is not None:
+            showtimes = self._showtimes(movie_id, starts_after or datetime.now(timezone.utc), starts_before)
+            allowed = set(showtimes)
+            if not allowed:
+                return []
+
+        if settings.GEO_INDEX_ENABLED:
+            hits = TheatreLocator.grid(self._session).nearest(latitude, longitude, limit, radius_km, allowed)
+        else:
+            hits = self._nearest_from_db(latitude, longitude, limit, radius_km, allowed)
+        if not hits:
+            return []
+
+        statement = (
+            select(Theatre)
+            .where(Theatre.id.in_([theatre_id for _, theatre_id in hits])) # type: ignore
+            .options(selectinload(Theatre.auditoriums)) # type: ignore
+        )
+        theatres = {theatre.id: theatre for theatre in self._session.exec(statement).all()}
+        return [
+            NearbyTheatre(
+                **self.theatre_to_response(theatres[theatre_id]).model_dump(),
+                distance_km=round(distance, 3),
+                screenings=showtimes.get(theatre_id, []),
+            )
+            for distance, theatre_id in hits if theatre_id in theatres
+        ]
 
 
 def get_theatre_service(session: SessionDep) -> TheatreService:
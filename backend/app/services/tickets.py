@@ -0,0 +1,159 @@
+from sqlmodel import Session, select, func
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from email.message import EmailMessage
+from email.utils import formatdate
+from importlib import import_module
+from pathlib import Path
+from typing import Protocol
+import os
+
+from app.core import settings
+from app.models import (
+    OutboxMessage, IssuedTicket, Reservation, ReservationSeat, ReservationStatus,
+    Screening, Seat, Movie, Auditorium, Theatre, User
+)
+from app.utils.tickets import render_ticket
+
+from .outbox import OutboxDispatcher
+
+TICKET_TOPIC: str = "ticket.issue"
+
+
+class TicketSender(Protocol):
+    def send(self, ticket: IssuedTicket, svg: bytes) -> None:
+        """Deliver a rendered ticket. Must be safe to repeat: delivery is at least once."""
+        ...
+
+
+class FileTicketSender:
+    """
+    Stand-in for an e-mail or push gateway: writes the confirmation message
+    (with the ticket attached) and the ticket itself to TICKET_OUTPUT_DIR.
+    """
+
+    def __init__(self, directory: str | None = None) -> None:
+        self._directory = Path(directory or settings.TICKET_OUTPUT_DIR)
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+    def _write(self, name: str, content: bytes) -> None:
+        # Write then rename, so a retried delivery replaces a file and never leaves half of one.
+        path = self._directory / name
+        partial = path.with_suffix(path.suffix + ".part")
+        partial.write_bytes(content)
+        os.replace(partial, path)
+
+    @staticmethod
+    def confirmation(ticket: IssuedTicket, svg: bytes) -> EmailMessage:
+        message = EmailMessage()
+        message["From"] = settings.TICKET_FROM_ADDRESS
+        message["To"] = ticket.email
+        message["Subject"] = f"Your tickets for {ticket.movie_title} ({ticket.booking_reference})"
+        message["Date"] = formatdate(localtime=False)
+        message.set_content(
+            f"Hi {ticket.username},\n\n"
+            f"Your booking {ticket.booking_reference} is confirmed.\n\n"
+            f"{ticket.movie_title}\n"
+            f"{ticket.theatre_name}, {ticket.auditorium_name}\n"
+            f"{ticket.start_time:%A %d %B %Y, %H:%M %Z}\n"
+            f"Seats: {', '.join(ticket.seats)}\n"
+            f"Total: {ticket.total_price}\n\n"
+            "Show the attached ticket at the entrance.\n"
+        )
+        message.add_attachment(
+            svg, maintype="image", subtype="svg+xml", filename=f"{ticket.booking_reference}.svg"
+        )
+        return message
+
+    def send(self, ticket: IssuedTicket, svg: bytes) -> None:
+        self._write(f"{ticket.booking_reference}.svg", svg)
+        self._write(f"{ticket.booking_reference}.eml", bytes(self.confirmation(ticket, svg)))
+
+
+class TicketIssuer:
+    """Renders and delivers tickets of committed bookings, as `ticket.issue` outbox messages."""
+
+    _sender: TicketSender | None = None
+
+    @staticmethod
+    def require_key() -> None:
+        """Refuse to work without a configured key: with a known one, anyone can forge a ticket."""
+        if not settings.TICKET_SIGNING_KEY:
+            raise ValueError("No ticket signing key: set TICKET_SIGNING_KEY.")
+
+    @staticmethod
+    def enqueue(session: Session, reservation: Reservation) -> None:
+        """Schedule the reservation's ticket; called in the transaction that books it."""
+        OutboxDispatcher.enqueue(session, TICKET_TOPIC, {"booking_reference": reservation.booking_reference})
+
+    @classmethod
+    def sender(cls) -> TicketSender:
+        """The TICKET_SENDER class, imported and built on first use."""
+        if cls._sender is None:
+            module, _, name = settings.TICKET_SENDER.partition(":")
+            cls._sender = getattr(import_module(module), name)()
+        return cls._sender # type: ignore
+
+    @staticmethod
+    def load(session: Session, references: list[str]) -> dict[str, IssuedTicket]:
+        """Ticket contents of the still booked reservations among `references`, in one query."""
+        label = func.concat(Seat.row_label, Seat.seat_number)
+        seat_labels = (
+            select(func.array_agg(aggregate_order_by(label, Seat.row_label, Seat.seat_number)))
+            .join(ReservationSeat, ReservationSeat.seat_id == Seat.id) # type: ignore
+            .where(ReservationSeat.reservation_id == Reservation.id)
+            .scalar_subquery()
+        )
+        statement = (
+            select(
+                Reservation.booking_reference, User.username, User.email, Movie.title,
+                Theatre.name, Auditorium.name, Screening.start_time,
+                seat_labels, Reservation.total_price
+            )
+            .join(User, User.id == Reservation.user_id) # type: ignore
+            .join(Screening, Screening.id == Reservation.screening_id) # type: ignore
+            .join(Movie, Movie.id == Screening.movie_id) # type: ignore
+            .join(Auditorium, Auditorium.id == Screening.auditorium_id) # type: ignore
+            .join(Theatre, Theatre.id == Auditorium.theatre_id) # type: ignore
+            .where(
+                Reservation.booking_reference.in_(references), # type: ignore
+                Reservation.status == ReservationStatus.BOOKED
+            )
+        )
+        return {
+            row[0]: IssuedTicket(
+                booking_reference=row[0], username=row[1], email=row[2], movie_title=row[3],
+                theatre_name=row[4], auditorium_name=row[5], start_time=row[6], seats=row[7] or [],
+                total_price=row[8],
+            )
+            for row in session.exec(statement).all() # type: ignore
+        }
+
+    @classmethod
+    def handle(cls, session: Session, messages: list[OutboxMessage]) -> dict[int, Exception | None]:
+        """Render the batch's tickets in the process pool, then hand them to the sender one by one."""
+        tickets = cls.load(session, [m.payload["booking_reference"] for m in messages])
+        # Cancelled before its ticket went out: nothing to send, and the message is done.
+        results: dict[int, Exception | None] = {m.id: None for m in messages} # type: ignore
+        pending = [m for m in messages if m.payload["booking_reference"] in tickets]
+
+        executor = OutboxDispatcher.executor()
+        futures = {
+            message.id: executor.submit(
+                render_ticket, tickets[message.payload["booking_reference"]].model_dump(), settings.TICKET_SIGNING_KEY
+            )
+            for message in pending
+        } if executor else {}
+
+        sender = cls.sender()
+        for message in pending:
+            ticket = tickets[message.payload["booking_reference"]]
+            try:
+                future = futures.get(message.id)
+                svg = future.result() if future else render_ticket(ticket.model_dump(), settings.TICKET_SIGNING_KEY)
+                sender.send(ticket, svg)
+            except Exception as e:
+                results[message.id] = e # type: ignore
+        return results
+
+
+OutboxDispatcher.register(TICKET_TOPIC, TicketIssuer.handle)
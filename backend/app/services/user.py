@@ -1,9 +1,11 @@
 from fastapi import Depends
 from typing import Annotated
 from sqlmodel import Session, select
-from app.models import User, UserCreate, UserUpdate, UserResponse
+from sqlalchemy import update
+from datetime import datetime, timezone
+from app.models import User, UserCreate, UserUpdate, UserResponse, RefreshToken
 from app.database import SessionDep
-from app.core import SecurityUtils
+from app.core import SecurityUtils, TokenRevocationList
 from app.utils.exceptions import (
     NotFoundException,
     UserExistsException,
@@ -20,6 +22,15 @@ class UserService:
         """Converts a db user to a response model."""
         return UserResponse(**user.model_dump(exclude={"hashed_password"}))
     
+    def revoke_tokens(self, user_id: int) -> None:
+        """Revoke every access and refresh token issued to a user so far. The caller commits."""
+        TokenRevocationList.revoke_user(self._session, user_id)
+        self._session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at == None) # type: ignore
+            .values(revoked_at=datetime.now(timezone.utc))
+        )
+
     async def check_user_exists(self, username: str, email: str) -> None:
         """Checks if a user exists."""
         statement = select(User).where(User.username == username)
@@ -70,6 +81,13 @@ class UserService:
         users = self._session.exec(statement).all()
         return [self.user_to_response(user) for user in users]
     
+    async def get_users_by_ids(self, user_ids: list[int]) -> tuple[list[UserResponse], list[int]]:
+        """Get users by ID in one query, in request order. Also returns the IDs not found."""
+        statement = select(User).where(User.id.in_(user_ids)) # type: ignore
+        found = {user.id: user for user in self._session.exec(statement).all()}
+        users = [self.user_to_response(found[i]) for i in user_ids if i in found]
+        return users, [i for i in user_ids if i not in found]
+
     async def update_user(self, user_id: int, payload: UserUpdate) -> UserResponse:
         """Update an existing user."""
         user: User | None = self._session.get(User, user_id)
@@ -80,6 +98,7 @@ class UserService:
         for key, value in payload.model_dump(exclude_unset=True, exclude_defaults=True, exclude_none=True).items():
             if key == "password":
                 setattr(user, "hashed_password", SecurityUtils.hash_password(value))
+                self.revoke_tokens(user_id)
             else:
                 setattr(user, key, value)
             updated = True
@@ -98,13 +117,14 @@ class UserService:
         if not user:
             raise NotFoundException("User not found")
         user.soft_delete()
+        self.revoke_tokens(user_id)
         self._session.commit()
 
     async def authenticate(self, username: str, password: str) -> User:
         """"""
         statement = select(User).where(User.username == username)
         user: User | None = self._session.exec(statement).first()
-        if (not user) or (not SecurityUtils.verify_password(password, user.hashed_password)):
+        if (not user) or (not SecurityUtils.verify_password(password, user.hashed_password)) or (not user.is_active):
             raise InvalidCredentialsExeception("Invalid credentials")
         return user
 
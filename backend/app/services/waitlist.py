@@ -0,0 +1,236 @@
+from fastapi import Depends
+from sqlmodel import Session, select, func
+from sqlalchemy import union_all, update
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timedelta, timezone
+from typing import Annotated
+from loguru import logger
+
+from app.core import settings
+from app.database import Database, SessionDep
+from app.models import (
+    Screening, Seat, WAITLIST_MAX_SEATS, WaitlistEntry, WaitlistStatus, WaitlistJoin, WaitlistEntryResponse, UserResponse
+)
+from app.utils.exceptions import NotFoundException, BadRequestException, EntityExistsException
+
+from .notifications import Notifier
+from .screening import ScreeningService
+
+
+class WaitlistPromoter:
+    """
+    Hands freed seats of a screening to its waitlist, first come first served.
+
+    Callers hold the screening row lock (as every seat change does), so
+    promotions of one screening never interleave. The queue is read through
+    partial indexes of waiting entries only, so the cost of a promotion
+    depends on the seats freed, not on how many users wait.
+    """
+
+    @staticmethod
+    def _free_seat_ids(session: Session, screening: Screening) -> list[int]:
+        """Seats of the screening nobody has booked or holds, in seat order."""
+        taken = ScreeningService(session).taken_seat_ids(screening.id) # type: ignore
+        statement = (
+            select(Seat.id)
+            .where(Seat.auditorium_id == screening.auditorium_id, Seat.is_active == True)
+            .order_by(Seat.row_label, Seat.seat_number) # type: ignore
+        )
+        return [seat_id for seat_id in session.exec(statement).all() if seat_id not in taken] # type: ignore
+
+    @classmethod
+    def promote(cls, session: Session, screening: Screening) -> list[WaitlistEntry]:
+        """
+        Offer the screening's free seats to the longest waiting entries that fit.
+
+        An entry asking for more seats than are left is skipped, not blocking the
+        queue; it keeps its place for the next release. With F seats free, only
+        the first F // s waiters asking for s seats can be served, so those are
+        the only candidates read, whatever the queue length. Does not commit.
+        """
+        now = datetime.now(timezone.utc)
+        if not screening.is_active or screening.start_time <= now:
+            return []
+        free = cls._free_seat_ids(session, screening)
+        if not free:
+            return []
+
+        candidates = union_all(*[
+            select(WaitlistEntry.id)
+            .where(
+                WaitlistEntry.screening_id == screening.id,
+                WaitlistEntry.status == WaitlistStatus.WAITING,
+                WaitlistEntry.seats_requested == size,
+            )
+            .order_by(WaitlistEntry.id) # type: ignore
+            .limit(len(free) // size)
+            for size in range(1, min(len(free), WAITLIST_MAX_SEATS) + 1)
+        ])
+        statement = (
+            select(WaitlistEntry)
+            .where(WaitlistEntry.id.in_(candidates), WaitlistEntry.status == WaitlistStatus.WAITING) # type: ignore
+            .order_by(WaitlistEntry.id) # type: ignore
+            .with_for_update(skip_locked=True)
+        )
+        hold_expires_at = min(now + timedelta(minutes=settings.WAITLIST_HOLD_MINUTES), screening.start_time)
+        offered: list[WaitlistEntry] = []
+        for entry in session.exec(statement).all():
+            if entry.seats_requested > len(free):
+                continue
+            entry.held_seat_ids, free = free[:entry.seats_requested], free[entry.seats_requested:]
+            entry.status = WaitlistStatus.OFFERED
+            entry.offered_at = now
+            entry.hold_expires_at = hold_expires_at
+            entry.touch()
+            offered.append(entry)
+            if not free:
+                break
+
+        if offered:
+            screening.available_seats = max(0, screening.available_seats - sum(e.seats_requested for e in offered))
+            screening.touch()
+            for entry in offered:
+                Notifier.publish(session, entry.user_id, "waitlist.offered", {
+                    "entry_id": entry.id, "screening_id": entry.screening_id,
+                    "seat_ids": entry.held_seat_ids, "hold_expires_at": hold_expires_at.isoformat(),
+                })
+        return offered
+
+    @classmethod
+    def release(cls, session: Session, screening: Screening, entries: list[WaitlistEntry], status: WaitlistStatus) -> None:
+        """Give up the holds of offered `entries` (expired or left) and promote the next waiters. Does not commit."""
+        released = 0
+        for entry in entries:
+            if entry.status == WaitlistStatus.OFFERED:
+                released += len(entry.held_seat_ids)
+            entry.status = status
+            entry.touch()
+            Notifier.publish(session, entry.user_id, f"waitlist.{status.value}", {
+                "entry_id": entry.id, "screening_id": entry.screening_id,
+            })
+        if released:
+            screening.available_seats += released
+            screening.touch()
+            session.flush()
+            cls.promote(session, screening)
+
+    @classmethod
+    def expire_holds(cls) -> int:
+        """Expire lapsed holds, one transaction per screening, re-offering their seats. Returns holds expired."""
+        now = datetime.now(timezone.utc)
+        with Session(Database.get_engine()) as session:
+            statement = select(WaitlistEntry.screening_id).where(
+                WaitlistEntry.status == WaitlistStatus.OFFERED,
+                WaitlistEntry.hold_expires_at <= now # type: ignore
+            ).distinct()
+            screening_ids = session.exec(statement).all()
+
+            expired = 0
+            for screening_id in screening_ids:
+                screening = session.exec(select(Screening).where(Screening.id == screening_id).with_for_update()).first()
+                entries = session.exec(
+                    select(WaitlistEntry)
+                    .where(
+                        WaitlistEntry.screening_id == screening_id,
+                        WaitlistEntry.status == WaitlistStatus.OFFERED,
+                        WaitlistEntry.hold_expires_at <= now # type: ignore
+                    )
+                    .with_for_update()
+                ).all()
+                if screening and entries:
+                    cls.release(session, screening, list(entries), WaitlistStatus.EXPIRED)
+                    expired += len(entries)
+                session.commit()
+
+            # Nobody can be served once a screening has started.
+            started = select(Screening.id).where(Screening.start_time <= now)
+            session.execute(
+                update(WaitlistEntry)
+                .where(WaitlistEntry.status == WaitlistStatus.WAITING, WaitlistEntry.screening_id.in_(started)) # type: ignore
+                .values(status=WaitlistStatus.EXPIRED, updated_at=now)
+            )
+            session.commit()
+        if expired:
+            logger.info(f"Expired {expired} waitlist holds")
+        return expired
+
+
+class WaitlistService:
+
+    def __init__(self, session: Session) -> None:
+        self._session = session
+
+    def _position(self, entry: WaitlistEntry) -> int | None:
+        """Waiting entries ahead of `entry`; an index-only count over idx_waitlist_queue."""
+        if entry.status != WaitlistStatus.WAITING:
+            return None
+        statement = select(func.count()).select_from(WaitlistEntry).where(
+            WaitlistEntry.screening_id == entry.screening_id,
+            WaitlistEntry.status == WaitlistStatus.WAITING,
+            WaitlistEntry.id < entry.id # type: ignore
+        )
+        return self._session.exec(statement).one()
+
+    def entry_to_response(self, entry: WaitlistEntry) -> WaitlistEntryResponse:
+        """"""
+        return WaitlistEntryResponse(**entry.model_dump(), position=self._position(entry))
+
+    def _get_own_entry(self, user: UserResponse, entry_id: int) -> WaitlistEntry:
+        entry: WaitlistEntry | None = self._session.get(WaitlistEntry, entry_id)
+        if not entry or entry.user_id != user.id:
+            raise NotFoundException("Waitlist entry not found")
+        return entry
+
+    async def join(self, user: UserResponse, payload: WaitlistJoin) -> WaitlistEntryResponse:
+        """Queue the current user for a sold-out screening."""
+        screening: Screening | None = self._session.get(Screening, payload.screening_id)
+        if not screening or not screening.is_active or screening.is_deleted:
+            raise NotFoundException("Screening not found")
+        if screening.start_time <= datetime.now(timezone.utc):
+            raise BadRequestException("Screening has already started")
+        if screening.available_seats > 0:
+            raise BadRequestException("Screening has seats available; book them directly")
+
+        statement = select(WaitlistEntry.id).where(
+            WaitlistEntry.screening_id == payload.screening_id,
+            WaitlistEntry.user_id == user.id,
+            WaitlistEntry.status.in_([WaitlistStatus.WAITING, WaitlistStatus.OFFERED]) # type: ignore
+        )
+        if self._session.exec(statement).first():
+            raise EntityExistsException("Already on the waitlist for this screening")
+
+        entry = WaitlistEntry(user_id=user.id, screening_id=payload.screening_id, seats_requested=payload.seats)
+        self._session.add(entry)
+        try:
+            self._session.commit()
+        except IntegrityError:
+            # A concurrent join got past the check first; the partial unique index caught this one.
+            self._session.rollback()
+            raise EntityExistsException("Already on the waitlist for this screening")
+        self._session.refresh(entry)
+        return self.entry_to_response(entry)
+
+    async def get_entry(self, user: UserResponse, entry_id: int) -> WaitlistEntryResponse:
+        """Get one of the current user's waitlist entries, with its place in the queue."""
+        return self.entry_to_response(self._get_own_entry(user, entry_id))
+
+    async def leave(self, user: UserResponse, entry_id: int) -> None:
+        """Leave the waitlist, giving up a hold if one was offered."""
+        entry = self._get_own_entry(user, entry_id)
+        if entry.status not in (WaitlistStatus.WAITING, WaitlistStatus.OFFERED):
+            raise BadRequestException("Waitlist entry is no longer active")
+        screening = self._session.exec(
+            select(Screening).where(Screening.id == entry.screening_id).with_for_update()
+        ).one()
+        self._session.refresh(entry, with_for_update=True)
+        if entry.status in (WaitlistStatus.WAITING, WaitlistStatus.OFFERED):
+            WaitlistPromoter.release(self._session, screening, [entry], WaitlistStatus.LEFT)
+        self._session.commit()
+
+
+def get_waitlist_service(session: SessionDep) -> WaitlistService:
+    """"""
+    return WaitlistService(session)
+
+
+WaitlistServiceDep = Annotated[WaitlistService, Depends(get_waitlist_service)]
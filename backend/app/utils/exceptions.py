@@ -63,3 +63,36 @@ class NotImplementedException(HTTPException):
             status_code=status.HTTP_501_NOT_IMPLEMENTED,
             detail=message
         )
+
+
+class BadRequestException(HTTPException):
+    def __init__(self, message: str) -> None:
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=message
+        )
+
+
+class SeatsUnavailableException(HTTPException):
+    def __init__(self, seat_ids: list[int]) -> None:
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Seats are no longer available: {seat_ids}"
+        )
+
+
+class IdempotencyKeyReuseException(HTTPException):
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used with a different request"
+        )
+
+
+class TooManyRequestsException(HTTPException):
+    def __init__(self, retry_after: float) -> None:
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts. Try again later.",
+            headers={"Retry-After": str(max(1, round(retry_after)))}
+        )
@@ -0,0 +1,139 @@
+from typing import Iterable
+import math
+
+EARTH_RADIUS_KM: float = 6371.0088
+# Half the circumference: no two points on Earth are further apart.
+MAX_DISTANCE_KM: float = math.pi * EARTH_RADIUS_KM
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(lat: float, lon: float, radius_km: float) -> tuple[float, float, float, float]:
+    """
+    (min_lat, max_lat, min_lon, max_lon) enclosing every point within
+    `radius_km`. min_lon > max_lon when the box crosses the antimeridian;
+    near the poles the box spans every longitude.
+    """
+    angle = radius_km / EARTH_RADIUS_KM
+    min_lat, max_lat = lat - math.degrees(angle), lat + math.degrees(angle)
+    if min_lat <= -90 or max_lat >= 90 or angle >= math.pi / 2:
+        return max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0
+    dlon = math.degrees(math.asin(min(1.0, math.sin(angle) / math.cos(math.radians(lat)))))
+    if dlon >= 180:
+        return min_lat, max_lat, -180.0, 180.0
+    min_lon, max_lon = lon - dlon, lon + dlon
+    if min_lon < -180:
+        min_lon += 360
+    if max_lon >= 180:
+        max_lon -= 360
+    return min_lat, max_lat, min_lon, max_lon
+
+
+def _in_lon_range(lon: float, min_lon: float, max_lon: float) -> bool:
+    if min_lon <= max_lon:
+        return min_lon <= lon <= max_lon
+    return lon >= min_lon or lon <= max_lon
+
+
+class GeoGrid:
+    """
+    Points bucketed into fixed lat/lon cells, like geohashes of one precision.
+
+    Adding, moving and removing a point touch one or two buckets, so the grid
+    is kept current incrementally. A radius search only looks at the buckets
+    under the radius' bounding box (or at the occupied ones, when there are
+    fewer); nearest-N widens the radius until it holds N points.
+    """
+
+    def __init__(self, cell_degrees: float = 0.25) -> None:
+        self._cell = cell_degrees
+        self._columns = math.ceil(360 / cell_degrees)
+        self._cells: dict[tuple[int, int], dict[int, tuple[float, float]]] = {}
+        self._points: dict[int, tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _cell_of(self, lat: float, lon: float) -> tuple[int, int]:
+        return int((lat + 90) // self._cell), int((lon + 180) // self._cell) % self._columns
+
+    def add(self, point_id: int, lat: float, lon: float) -> None:
+        """Add a point, or move it if it is already in the grid."""
+        self.remove(point_id)
+        if lon >= 180:
+            lon -= 360  # one meridian, one spelling
+        self._cells.setdefault(self._cell_of(lat, lon), {})[point_id] = (lat, lon)
+        self._points[point_id] = (lat, lon)
+
+    def remove(self, point_id: int) -> None:
+        location = self._points.pop(point_id, None)
+        if location is None:
+            return
+        cell = self._cell_of(*location)
+        bucket = self._cells[cell]
+        del bucket[point_id]
+        if not bucket:
+            del self._cells[cell]
+
+    def _cells_in_box(self, min_lat: float, max_lat: float, min_lon: float, max_lon: float) -> Iterable[dict[int, tuple[float, float]]]:
+        first_row, last_row = self._cell_of(min_lat, 0)[0], self._cell_of(max_lat, 0)[0]
+        first_column, last_column = self._cell_of(0, min_lon)[1], self._cell_of(0, max_lon)[1]
+        if max_lon - min_lon >= 360:
+            columns = range(self._columns)
+        elif min_lon <= max_lon:
+            columns = range(first_column, last_column + 1)
+        else:
+            columns = [*range(first_column, self._columns), *range(0, last_column + 1)] # type: ignore
+        if (last_row - first_row + 1) * len(columns) > len(self._cells):
+            # A wide box covers more cells than are occupied; test the occupied ones instead.
+            column_set = set(columns)
+            for (row, column), bucket in self._cells.items():
+                if first_row <= row <= last_row and column in column_set:
+                    yield bucket
+            return
+        for row in range(first_row, last_row + 1):
+            for column in columns:
+                bucket = self._cells.get((row, column))
+                if bucket:
+                    yield bucket
+
+    def within(self, lat: float, lon: float, radius_km: float, allowed: set[int] | None = None) -> list[tuple[float, int]]:
+        """(distance_km, id) of the points within `radius_km`, nearest first, optionally among `allowed`."""
+        min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+        found: list[tuple[float, int]] = []
+        for bucket in self._cells_in_box(min_lat, max_lat, min_lon, max_lon):
+            for point_id, (point_lat, point_lon) in bucket.items():
+                if allowed is not None and point_id not in allowed:
+                    continue
+                if not (min_lat <= point_lat <= max_lat and _in_lon_range(point_lon, min_lon, max_lon)):
+                    continue
+                distance = haversine_km(lat, lon, point_lat, point_lon)
+                if distance <= radius_km:
+                    found.append((distance, point_id))
+        found.sort()
+        return found
+
+    def nearest(
+        self, lat: float, lon: float, limit: int,
+        radius_km: float | None = None, allowed: set[int] | None = None, start_km: float = 10.0
+    ) -> list[tuple[float, int]]:
+        """
+        The `limit` nearest points as (distance_km, id), optionally within
+        `radius_km` and among `allowed`. Everything within a radius is found,
+        so once a radius holds `limit` points they are the nearest ones.
+        """
+        cap = min(radius_km, MAX_DISTANCE_KM) if radius_km is not None else MAX_DISTANCE_KM
+        candidates = len(allowed) if allowed is not None else len(self._points)
+        radius = min(start_km, cap)
+        while True:
+            found = self.within(lat, lon, radius, allowed)
+            if len(found) >= min(limit, candidates) or radius >= cap:
+                return found[:limit]
+            radius = min(radius * 2, cap)
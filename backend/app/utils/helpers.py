@@ -1,3 +1,6 @@
+from datetime import datetime
+import base64
+
 
 def seconds_to_time(seconds: int | float) -> str:
     """
@@ -10,3 +13,37 @@ def seconds_to_time(seconds: int | float) -> str:
     minutes = int(seconds // 60)
     seconds %= 60
     return f"{hours:02}:{minutes:02}:{seconds:02}" if hours > 0 else f"{minutes:02}:{seconds:02}"
+
+
+def parse_id_list(value: str, max_ids: int = 200) -> list[int]:
+    """
+    Parse a comma separated list of IDs like "3,1,2".
+    Keeps the first occurrence of each ID, in order.
+    """
+    ids: list[int] = []
+    for part in value.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if not part.isdigit():
+            raise ValueError(f"Invalid ID: {part!r}")
+        ids.append(int(part))
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > max_ids:
+        raise ValueError(f"At most {max_ids} IDs can be requested at once")
+    return ids
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Encode a keyset pagination position as an opaque token."""
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Decode a token from `encode_cursor`. Raises ValueError if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
@@ -0,0 +1,182 @@
+"""
+Weekly schedule search. Runs in the dispatcher's process pool, so it depends
+on the standard library only, never on app state.
+"""
+from typing import Iterable
+import math
+import random
+import time
+
+# A lane is a free stretch of one auditorium on one day: (auditorium index, day, start, end),
+# in minutes from the week's local midnight.
+Lane = tuple[int, int, int, int]
+
+
+def decayed_total(groups: Iterable[list[float]], decay: float) -> float:
+    """
+    Expected seats of showings grouped by day and movie: within a group the
+    k-th best counts `decay ** k`. Sorts each group in place.
+    """
+    total = 0.0
+    for values in groups:
+        values.sort(reverse=True)
+        factor = 1.0
+        for value in values:
+            total += value * factor
+            factor *= decay
+    return total
+
+
+class ScheduleOptimizer:
+    """
+    Packs movies into free lanes of auditorium time to maximize expected seats sold.
+
+    A lane holds a sequence of movies played back to back, each taking its
+    running time plus cleaning rounded up to the slot grid, so a sequence
+    fixes every start time. A screening is expected to sell `capacity *
+    min(1, popularity * demand at its start)`; the k-th best showing of a
+    movie on a day sells `SCHEDULE_REPEAT_DECAY ** k` of that, which spreads
+    the programme over the catalogue.
+
+    A greedy pass fills each lane by best expected seats per minute of
+    auditorium time, biggest auditoriums first. Local search then tries
+    random replace, insert, swap and remove moves on one lane at a time,
+    keeping those that do not lower the day's total. A move only changes
+    one day, so it is scored by re-adding that day alone.
+    """
+
+    def __init__(
+        self,
+        lanes: list[Lane],
+        capacities: list[int],
+        durations: list[int],
+        popularity: list[float],
+        hourly_demand: list[float],
+        cleaning_minutes: int,
+        slot_minutes: int,
+        decay: float,
+        seed: int = 0,
+    ) -> None:
+        self._lanes = lanes
+        self._capacities = capacities
+        self._durations = durations
+        self._popularity = popularity
+        self._hourly_demand = hourly_demand
+        self._decay = decay
+        self._rng = random.Random(seed)
+        self._blocks = [math.ceil((d + cleaning_minutes) / slot_minutes) * slot_minutes for d in durations]
+        self._movies = range(len(durations))
+        self._days: dict[int, list[int]] = {}
+        for index, lane in enumerate(lanes):
+            self._days.setdefault(lane[1], []).append(index)
+        self.sequences: list[list[int]] = [[] for _ in lanes]
+        self._values: list[list[tuple[int, float]]] = [[] for _ in lanes]
+
+    def expected(self, lane: Lane, movie: int, start: int) -> float:
+        demand = self._popularity[movie] * self._hourly_demand[start // 60]
+        return self._capacities[lane[0]] * min(1.0, demand)
+
+    def starts(self, lane_index: int, sequence: list[int]) -> list[int] | None:
+        """Start minute of each movie of the sequence, or None if it overruns the lane."""
+        _, _, start, end = self._lanes[lane_index]
+        starts = []
+        for movie in sequence:
+            if start + self._durations[movie] > end:
+                return None
+            starts.append(start)
+            start += self._blocks[movie]
+        return starts
+
+    def _lane_values(self, lane_index: int, sequence: list[int]) -> list[tuple[int, float]] | None:
+        starts = self.starts(lane_index, sequence)
+        if starts is None:
+            return None
+        lane = self._lanes[lane_index]
+        return [(movie, self.expected(lane, movie, start)) for movie, start in zip(sequence, starts)]
+
+    def _day_score(self, day: int) -> float:
+        by_movie: dict[int, list[float]] = {}
+        for lane_index in self._days[day]:
+            for movie, value in self._values[lane_index]:
+                by_movie.setdefault(movie, []).append(value)
+        return decayed_total(by_movie.values(), self._decay)
+
+    def score(self) -> float:
+        return sum(self._day_score(day) for day in self._days)
+
+    def greedy(self) -> None:
+        shown: dict[tuple[int, int], int] = {}
+        order = sorted(range(len(self._lanes)), key=lambda i: (-self._capacities[self._lanes[i][0]], self._lanes[i][2]))
+        for lane_index in order:
+            lane = self._lanes[lane_index]
+            _, day, start, end = lane
+            sequence: list[int] = []
+            while True:
+                best: tuple[float, int] | None = None
+                for movie in self._movies:
+                    if start + self._durations[movie] > end:
+                        continue
+                    gain = self.expected(lane, movie, start) * self._decay ** shown.get((day, movie), 0)
+                    density = gain / self._blocks[movie]
+                    if best is None or density > best[0]:
+                        best = (density, movie)
+                if best is None:
+                    break
+                movie = best[1]
+                sequence.append(movie)
+                shown[(day, movie)] = shown.get((day, movie), 0) + 1
+                start += self._blocks[movie]
+            self.sequences[lane_index] = sequence
+            self._values[lane_index] = self._lane_values(lane_index, sequence) or []
+
+    def _neighbour(self, sequence: list[int]) -> list[int]:
+        candidate = list(sequence)
+        move = self._rng.random()
+        movie = self._rng.randrange(len(self._durations))
+        if not candidate or move < 0.3:
+            candidate.insert(self._rng.randint(0, len(candidate)), movie)
+        elif move < 0.65:
+            candidate[self._rng.randrange(len(candidate))] = movie
+        elif move < 0.85 and len(candidate) > 1:
+            i, j = self._rng.sample(range(len(candidate)), 2)
+            candidate[i], candidate[j] = candidate[j], candidate[i]
+        else:
+            del candidate[self._rng.randrange(len(candidate))]
+        return candidate
+
+    def improve(self, seconds: float, max_iterations: int | None = None) -> int:
+        """Hill-climb for `seconds` (or `max_iterations` moves). Returns moves tried."""
+        if not self._lanes:
+            return 0
+        day_scores = {day: self._day_score(day) for day in self._days}
+        deadline = time.perf_counter() + seconds
+        iterations = 0
+        while time.perf_counter() < deadline and (max_iterations is None or iterations < max_iterations):
+            iterations += 1
+            lane_index = self._rng.randrange(len(self._lanes))
+            candidate = self._neighbour(self.sequences[lane_index])
+            values = self._lane_values(lane_index, candidate)
+            if values is None:
+                continue
+            day = self._lanes[lane_index][1]
+            previous, self._values[lane_index] = self._values[lane_index], values
+            score = self._day_score(day)
+            if score >= day_scores[day]:
+                self.sequences[lane_index] = candidate
+                day_scores[day] = score
+            else:
+                self._values[lane_index] = previous
+        return iterations
+
+    def solve(self, seconds: float, max_iterations: int | None = None) -> tuple[float, float, int]:
+        """Greedy, then local search. Returns (greedy score, final score, moves tried)."""
+        self.greedy()
+        greedy_score = self.score()
+        iterations = self.improve(seconds, max_iterations)
+        return greedy_score, self.score(), iterations
+
+
+def solve(optimizer: ScheduleOptimizer, seconds: float) -> tuple[ScheduleOptimizer, tuple[float, float, int]]:
+    """`optimizer.solve`, returning the optimizer too: run in another process, the caller's copy stays unsolved."""
+    result = optimizer.solve(seconds)
+    return optimizer, result
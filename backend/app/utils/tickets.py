@@ -0,0 +1,85 @@
+"""
+Ticket rendering. Runs in the dispatcher's process pool, so it depends on the
+standard library (and the optional QR encoder) only, never on app state.
+"""
+from datetime import datetime
+from typing import Any
+from xml.sax.saxutils import escape
+import hashlib
+import hmac
+
+try:
+    import qrcode
+except ImportError:  # optional: pip install moviereservationsystem[tickets]
+    qrcode = None
+
+MODULE_SIZE: int = 6
+QUIET_ZONE: int = 4
+
+
+def ticket_code(booking_reference: str, signing_key: str) -> str:
+    """What the QR code holds: the reference and a signature the door scanner can check offline."""
+    if not signing_key:
+        raise ValueError("No ticket signing key: set TICKET_SIGNING_KEY.")
+    signature = hmac.new(signing_key.encode(), booking_reference.encode(), hashlib.sha256).hexdigest()[:16]
+    return f"{booking_reference}.{signature}"
+
+
+def _qr_path(data: str) -> tuple[str, int]:
+    """SVG path of the QR code's dark modules, one rectangle per horizontal run, and its size in modules."""
+    code = qrcode.QRCode(border=0, error_correction=qrcode.constants.ERROR_CORRECT_M) # type: ignore
+    code.add_data(data)
+    code.make(fit=True)
+    matrix = code.get_matrix()
+    parts: list[str] = []
+    for y, row in enumerate(matrix):
+        x = 0
+        while x < len(row):
+            if not row[x]:
+                x += 1
+                continue
+            start = x
+            while x < len(row) and row[x]:
+                x += 1
+            parts.append(f"M{start} {y}h{x - start}v1h{start - x}z")
+    return "".join(parts), len(matrix)
+
+
+def render_ticket(ticket: dict[str, Any], signing_key: str) -> bytes:
+    """Render a ticket (the fields of an IssuedTicket) as an SVG document."""
+    code = ticket_code(ticket["booking_reference"], signing_key)
+    start_time: datetime = ticket["start_time"]
+    lines = [
+        ticket["movie_title"],
+        f"{ticket['theatre_name']} · {ticket['auditorium_name']}",
+        start_time.strftime("%a %d %b %Y, %H:%M %Z").strip(),
+        f"Seats: {', '.join(ticket['seats'])}",
+        f"Ref: {ticket['booking_reference']}",
+    ]
+
+    width, text_top = 480, 40
+    body: list[str] = []
+    if qrcode is not None:
+        path, modules = _qr_path(code)
+        size = (modules + 2 * QUIET_ZONE) * MODULE_SIZE
+        body.append(
+            f'<g transform="translate({(width - size) // 2} 20) scale({MODULE_SIZE})">'
+            f'<rect width="{modules + 2 * QUIET_ZONE}" height="{modules + 2 * QUIET_ZONE}" fill="#fff"/>'
+            f'<path transform="translate({QUIET_ZONE} {QUIET_ZONE})" d="{path}" fill="#000"/></g>'
+        )
+        text_top += size + 20
+    else:
+        body.append(f'<text x="{width // 2}" y="{text_top}" text-anchor="middle" font-family="monospace">{escape(code)}</text>')
+        text_top += 40
+
+    for i, line in enumerate(lines):
+        weight = ' font-weight="bold"' if i == 0 else ""
+        body.append(
+            f'<text x="{width // 2}" y="{text_top + i * 28}" text-anchor="middle" '
+            f'font-family="sans-serif" font-size="18"{weight}>{escape(line)}</text>'
+        )
+    height = text_top + len(lines) * 28 + 20
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+        f'<rect width="{width}" height="{height}" fill="#fff"/>{"".join(body)}</svg>'
+    ).encode()
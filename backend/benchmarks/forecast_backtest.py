@@ -0,0 +1,143 @@
+"""
+Offline backtest of the occupancy forecasts.
+
+Run from the backend directory against a database at the latest revision:
+
+    DATABASE_URL=... python -m benchmarks.forecast_backtest [--holdout-days 28] [--synthetic 200000]
+
+The model is fitted on the screenings that ended before the holdout window
+and scored on the fill rates of the screenings inside it, next to two
+baselines: the overall mean and the movie's own mean. Fit and predict
+times are reported as well.
+
+With --synthetic, a history of that many screenings is generated first. It
+has known weekday/hour, genre and movie effects and lives in a transaction
+that is rolled back, so the database is left as it was. Without it, the
+backtest runs on the real history.
+"""
+from sqlmodel import Session
+from sqlalchemy import insert
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+import argparse
+import time
+
+import numpy as np
+
+from app.core import settings
+from app.database import Database
+from app.models import Theatre, Auditorium, Genre, Movie, MovieGenre, Screening, ScreeningOccupancy
+from app.services import OccupancyModel, OccupancyForecaster
+
+
+def insert_ids(session: Session, model, rows: list[dict]) -> list[int]:
+    statement = insert(model).returning(model.id, sort_by_parameter_order=True)
+    return list(session.execute(statement, rows).scalars().all())
+
+
+def seed_history(session: Session, screenings: int, now: datetime, rng: np.random.Generator) -> None:
+    stamp = dict(created_at=now, updated_at=now)
+    theatre = Theatre(name="Backtest theatre")
+    session.add(theatre)
+    session.flush()
+    capacities = rng.integers(40, 400, 40)
+    auditorium_ids = insert_ids(session, Auditorium, [
+        dict(name=f"Backtest {i}", capacity=int(c), theatre_id=theatre.id, is_active=True, **stamp)
+        for i, c in enumerate(capacities)
+    ])
+    capacity_of = dict(zip(auditorium_ids, capacities.tolist()))
+    genre_ids = insert_ids(session, Genre, [dict(name=f"Backtest {i}", is_active=True, **stamp) for i in range(15)])
+    movie_ids = insert_ids(session, Movie, [
+        dict(title=f"Backtest {i}", description="", duration_minutes=120, is_active=True, **stamp) for i in range(300)
+    ])
+
+    genre_effect = dict(zip(genre_ids, rng.normal(0, 0.08, len(genre_ids))))
+    movie_effect: dict[int, float] = {}
+    pairs = []
+    for movie_id in movie_ids:
+        genres = rng.choice(genre_ids, rng.integers(1, 4), replace=False).tolist()
+        pairs += [dict(movie_id=movie_id, genre_id=genre_id) for genre_id in genres]
+        movie_effect[movie_id] = rng.normal(0, 0.1) + np.mean([genre_effect[g] for g in genres])
+    session.execute(insert(MovieGenre), pairs)
+
+    hour_effect = 0.25 * np.exp(-((np.arange(24) - 19.5) ** 2) / 8) - 0.08
+    weekday_effect = np.array([-0.04, -0.05, -0.03, 0.0, 0.06, 0.1, 0.05])
+    zone = ZoneInfo(settings.PRICING_TIMEZONE)
+    minutes = rng.uniform(0, 365 * 24 * 60, screenings)
+    movies = rng.choice(movie_ids, screenings).tolist()
+    auditoriums = rng.choice(auditorium_ids, screenings).tolist()
+    for first in range(0, screenings, 20_000):
+        chunk = range(first, min(first + 20_000, screenings))
+        starts = [now - timedelta(days=365) + timedelta(minutes=float(minutes[i])) for i in chunk]
+        ids = insert_ids(session, Screening, [
+            dict(
+                movie_id=movies[i], auditorium_id=auditoriums[i], start_time=start, end_time=start + timedelta(hours=2),
+                base_price=10, available_seats=0, is_active=False, created_at=start, updated_at=start + timedelta(hours=3),
+            )
+            for i, start in zip(chunk, starts)
+        ])
+        occupancy = []
+        for screening_id, i, start in zip(ids, chunk, starts):
+            local = start.astimezone(zone)
+            fill = 0.35 + hour_effect[local.hour] + weekday_effect[local.weekday()] + movie_effect[movies[i]]
+            capacity = capacity_of[auditoriums[i]]
+            sold = int(rng.binomial(capacity, float(np.clip(fill, 0.0, 1.0))))
+            if sold:
+                occupancy.append(dict(screening_id=screening_id, capacity=capacity, seats_sold=sold, revenue=sold * 10))
+        if occupancy:
+            session.execute(insert(ScreeningOccupancy), occupancy)
+
+
+def report(name: str, predicted: np.ndarray, actual: np.ndarray) -> None:
+    error = predicted - actual
+    print(
+        f"{name:>12} {np.abs(error).mean() * 100:>8.2f} {np.sqrt((error ** 2).mean()) * 100:>8.2f} "
+        f"{error.mean() * 100:>+8.2f} {(np.abs(error) <= 0.1).mean() * 100:>9.1f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--holdout-days", type=int, default=28)
+    parser.add_argument("--synthetic", type=int, default=0, help="screenings of generated history; 0 uses the real one")
+    args = parser.parse_args()
+
+    now = datetime.now(timezone.utc)
+    cutoff = now - timedelta(days=args.holdout_days)
+    Database.connect(settings.DATABASE_URL)
+    with Session(Database.get_engine()) as session:
+        if args.synthetic:
+            started = time.perf_counter()
+            seed_history(session, args.synthetic, now, np.random.default_rng(7))
+            print(f"Generated {args.synthetic} screenings in {time.perf_counter() - started:.1f}s")
+
+        started = time.perf_counter()
+        movies, slots, fill = OccupancyForecaster.history(session, cutoff - timedelta(days=settings.FORECAST_HISTORY_DAYS), cutoff)
+        test_movies, test_slots, test_fill = OccupancyForecaster.history(session, cutoff, now)
+        pairs = OccupancyForecaster.genre_pairs(session)
+        loaded = time.perf_counter()
+        model = OccupancyModel.fit(movies, slots, fill, pairs, settings.FORECAST_SHRINKAGE, settings.FORECAST_FIT_ROUNDS)
+        fitted = time.perf_counter()
+        predicted = model.predict(test_movies, test_slots)
+        predicted_at = time.perf_counter()
+        session.rollback()
+    Database.disconnect()
+
+    print(f"Train {len(fill)} screenings, test {len(test_fill)} (last {args.holdout_days} days)")
+    print(f"Load {loaded - started:.3f}s, fit {fitted - loaded:.3f}s, predict {predicted_at - fitted:.4f}s")
+    if not len(fill) or not len(test_fill):
+        return
+
+    movie_ids, index = np.unique(movies, return_inverse=True)
+    movie_means = np.bincount(index, fill) / np.bincount(index)
+    positions = np.clip(np.searchsorted(movie_ids, test_movies), 0, len(movie_ids) - 1)
+    by_movie = np.where(movie_ids[positions] == test_movies, movie_means[positions], fill.mean())
+
+    print(f"{'fill rate':>12} {'MAE pp':>8} {'RMSE pp':>8} {'bias pp':>8} {'<=10pp %':>9}")
+    report("mean", np.full(len(test_fill), fill.mean()), test_fill)
+    report("movie mean", by_movie, test_fill)
+    report("model", predicted, test_fill)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Latency benchmark for nearest-theatre search.
+
+Run from the backend directory against a database at the latest revision:
+
+    DATABASE_URL=... python -m benchmarks.geo_search [--theatres 1000 10000 50000] [--queries 200]
+
+Theatres are scattered around a few metro areas and queried from random
+points near them, three ways: the in-memory grid (TheatreLocator), the
+bounding-box fallback on idx_theatre_location, and computing the distance to
+every theatre. Everything runs in one transaction that is rolled back, so the
+database is left as it was.
+"""
+from sqlmodel import Session, select
+from sqlalchemy import insert, text
+from datetime import datetime, timezone
+import argparse
+import random
+import statistics
+import time
+
+from app.core import settings
+from app.database import Database
+from app.models import Theatre
+from app.services import TheatreService
+from app.utils.geo import GeoGrid, haversine_km
+
+METROS: list[tuple[float, float]] = [
+    (-26.20, 28.05), (51.51, -0.13), (40.71, -74.01), (35.68, 139.69), (-33.87, 151.21), (19.43, -99.13),
+]
+
+
+def seed_theatres(session: Session, count: int, rng: random.Random) -> None:
+    now = datetime.now(timezone.utc)
+    session.execute(insert(Theatre.__table__), [ # type: ignore
+        dict(
+            name=f"Benchmark {i}", latitude=lat + rng.gauss(0, 0.5), longitude=lon + rng.gauss(0, 0.5),
+            is_active=True, created_at=now, updated_at=now,
+        )
+        for i in range(count)
+        for lat, lon in [rng.choice(METROS)]
+    ])
+    session.execute(text("ANALYZE theatre"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--theatres", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    Database.connect(settings.DATABASE_URL)
+    with Session(Database.get_engine()) as session:
+        service = TheatreService(session)
+        print(f"{'theatres':>9} {'grid ms':>8} {'bbox ms':>8} {'scan ms':>8}")
+        for count in args.theatres:
+            session.execute(text("DELETE FROM theatre WHERE name LIKE 'Benchmark %'"))
+            seed_theatres(session, count, rng)
+            rows = session.exec(select(Theatre.id, Theatre.latitude, Theatre.longitude).where(Theatre.latitude != None)).all() # type: ignore
+            grid = GeoGrid(settings.GEO_INDEX_CELL_DEGREES)
+            for theatre_id, lat, lon in rows:
+                grid.add(theatre_id, lat, lon) # type: ignore
+
+            points = [(lat + rng.gauss(0, 0.3), lon + rng.gauss(0, 0.3)) for lat, lon in rng.choices(METROS, k=args.queries)]
+            timings: dict[str, list[float]] = {"grid": [], "bbox": [], "scan": []}
+            for lat, lon in points:
+                started = time.perf_counter()
+                by_grid = grid.nearest(lat, lon, args.limit)
+                timings["grid"].append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                by_box = service._nearest_from_db(lat, lon, args.limit, None, None)
+                timings["bbox"].append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                by_scan = sorted((haversine_km(lat, lon, la, lo), i) for i, la, lo in rows)[:args.limit] # type: ignore
+                timings["scan"].append(time.perf_counter() - started)
+                assert [i for _, i in by_grid] == [i for _, i in by_scan] == [i for _, i in by_box]
+
+            print(f"{count:>9} " + " ".join(f"{statistics.median(timings[k]) * 1000:>8.3f}" for k in ("grid", "bbox", "scan")))
+        session.rollback()
+    Database.disconnect()
+
+
+if __name__ == "__main__":
+    main()
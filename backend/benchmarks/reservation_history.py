@@ -0,0 +1,122 @@
+"""
+Latency benchmark for the "my reservations" history endpoint.
+
+Run from the backend directory against a database at the latest revision:
+
+    DATABASE_URL=... python -m benchmarks.reservation_history [--bookings 100 1000 10000] [--repeat 50]
+
+For each history size a user is given that many reservations (mixed statuses,
+a tenth of them archived), then the first, a middle and the last page are timed
+through ReservationService.get_user_reservations. Keyset pagination should keep
+all three flat as the history grows. Everything runs in one transaction that is
+rolled back, so the database is left as it was.
+"""
+from datetime import datetime, timedelta, timezone
+from sqlmodel import Session, select
+from sqlalchemy import insert, text
+import argparse
+import asyncio
+import statistics
+import time
+
+from app.core import settings
+from app.database import Database
+from app.models import (
+    User, UserResponse, UserRole, Movie, Theatre, Auditorium, Seat, Screening,
+    Reservation, ReservationSeat, ReservationArchive, ReservationSeatArchive, ReservationStatus
+)
+from app.services import ReservationService, ScreeningService
+from app.utils.helpers import encode_cursor
+
+STATUSES: list[ReservationStatus] = list(ReservationStatus)
+
+
+def seed_catalog(session: Session) -> tuple[int, int]:
+    """One screening with one seat is enough; history rows only need valid keys."""
+    theatre = Theatre(name="Benchmark theatre")
+    session.add(theatre)
+    session.flush()
+    auditorium = Auditorium(name="Benchmark", capacity=1, theatre_id=theatre.id) # type: ignore
+    movie = Movie(title="Benchmark", description="", duration_minutes=120)
+    session.add_all([auditorium, movie])
+    session.flush()
+    seat = Seat(row_label="A", seat_number=1, auditorium_id=auditorium.id) # type: ignore
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    screening = Screening(
+        movie_id=movie.id, auditorium_id=auditorium.id, start_time=start, # type: ignore
+        end_time=start + timedelta(hours=2), base_price=10, available_seats=1 # type: ignore
+    )
+    session.add_all([seat, screening])
+    session.flush()
+    return screening.id, seat.id # type: ignore
+
+
+def seed_history(session: Session, bookings: int, screening_id: int, seat_id: int, first_id: int) -> UserResponse:
+    user = User(username=f"bench{bookings}", email=f"bench{bookings}@example.com", hashed_password="x", role=UserRole.USER)
+    session.add(user)
+    session.flush()
+
+    now = datetime.now(timezone.utc)
+    hot, cold, hot_seats, cold_seats = [], [], [], []
+    for i in range(bookings):
+        row = dict(
+            id=first_id + i, created_at=now - timedelta(minutes=i), updated_at=now,
+            status=STATUSES[i % len(STATUSES)], total_price=10, user_id=user.id, screening_id=screening_id,
+        )
+        archived = i % 10 == 9
+        (cold if archived else hot).append(row if not archived else {**row, "archived_at": now})
+        (cold_seats if archived else hot_seats).append(dict(reservation_id=first_id + i, seat_id=seat_id, price_paid=10))
+
+    for table, rows in (
+        (Reservation, hot), (ReservationSeat, hot_seats),
+        (ReservationArchive, cold), (ReservationSeatArchive, cold_seats),
+    ):
+        if rows:
+            session.execute(insert(table.__table__), rows) # type: ignore
+    session.execute(text("ANALYZE reservation; ANALYZE reservationarchive"))
+    return UserResponse(**user.model_dump())
+
+
+def time_page(service: ReservationService, user: UserResponse, cursor: str | None, repeat: int) -> float:
+    samples: list[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        page = asyncio.run(service.get_user_reservations(user, None, cursor, 20))
+        samples.append(time.perf_counter() - started)
+    assert page.items, "empty page"
+    return statistics.median(samples) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bookings", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    Database.connect(settings.DATABASE_URL)
+    with Session(Database.get_engine()) as session:
+        service = ReservationService(session, ScreeningService(session))
+        screening_id, seat_id = seed_catalog(session)
+        first_id = 1_000_000_000
+
+        print(f"{'bookings':>9} {'first page ms':>14} {'middle page ms':>15} {'last page ms':>13}")
+        for bookings in args.bookings:
+            user = seed_history(session, bookings, screening_id, seat_id, first_id)
+            first_id += bookings
+            created = list(session.exec(
+                select(Reservation.created_at, Reservation.id).where(Reservation.user_id == user.id)
+                .order_by(Reservation.created_at.desc(), Reservation.id.desc()) # type: ignore
+            ).all())
+            middle = encode_cursor(*created[len(created) // 2])
+            last = encode_cursor(*created[-21]) if len(created) > 21 else None
+            print(
+                f"{bookings:>9} {time_page(service, user, None, args.repeat):>14.2f} "
+                f"{time_page(service, user, middle, args.repeat):>15.2f} "
+                f"{time_page(service, user, last, args.repeat):>13.2f}"
+            )
+        session.rollback()
+    Database.disconnect()
+
+
+if __name__ == "__main__":
+    main()
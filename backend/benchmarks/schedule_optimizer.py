@@ -0,0 +1,55 @@
+"""
+Solve-time and quality benchmark for the weekly schedule optimizer.
+
+Run from the backend directory:
+
+    python -m benchmarks.schedule_optimizer [--auditoriums 5 10 20 40] [--movies 12] [--seconds 0.5 2]
+
+Builds a week of lanes (10:00 to midnight) for auditoriums of random
+capacity and a random catalogue, then reports the greedy score and the
+score after local search for each time budget. No database is needed.
+"""
+import argparse
+import random
+import time
+
+from app.core import settings
+from app.services import ScheduleOptimizer, ScheduleService
+
+
+def build(auditoriums: int, movies: int, rng: random.Random) -> ScheduleOptimizer:
+    lanes = [(a, day, day * 1440 + 600, day * 1440 + 1440) for a in range(auditoriums) for day in range(7)]
+    return ScheduleOptimizer(
+        lanes=lanes,
+        capacities=[rng.randint(40, 400) for _ in range(auditoriums)],
+        durations=[rng.randint(85, 180) for _ in range(movies)],
+        popularity=[rng.uniform(0.15, 0.9) for _ in range(movies)],
+        hourly_demand=ScheduleService._hourly_demand(0),
+        cleaning_minutes=20,
+        slot_minutes=settings.SCHEDULE_SLOT_MINUTES,
+        decay=settings.SCHEDULE_REPEAT_DECAY,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--auditoriums", type=int, nargs="+", default=[5, 10, 20, 40])
+    parser.add_argument("--movies", type=int, default=12)
+    parser.add_argument("--seconds", type=float, nargs="+", default=[0.5, 2.0])
+    args = parser.parse_args()
+
+    print(f"{'auditoriums':>11} {'budget s':>8} {'greedy':>10} {'searched':>10} {'gain %':>7} {'moves':>8} {'total s':>8}")
+    for auditoriums in args.auditoriums:
+        for seconds in args.seconds:
+            optimizer = build(auditoriums, args.movies, random.Random(auditoriums))
+            started = time.perf_counter()
+            greedy, searched, moves = optimizer.solve(seconds)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{auditoriums:>11} {seconds:>8.1f} {greedy:>10.0f} {searched:>10.0f} "
+                f"{(searched / greedy - 1) * 100:>7.2f} {moves:>8} {elapsed:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Throughput benchmark for access token verification.
+
+Run from the backend directory (EdDSA and key generation need the `keys` extra):
+
+    python -m benchmarks.token_verification [--tokens 1000] [--seconds 2]
+
+For each algorithm a throwaway key ring is installed and `--tokens` distinct
+tokens are issued, standing in for the active users of one worker. Each is
+then verified round-robin through SecurityUtils.decode_token on one thread,
+so the figures are tokens per second per core: once with the verified-token
+cache disabled (full signature check every time) and once with it enabled.
+The `python-jose` row is a bare `jwt.decode` with the key as a string, which
+builds the key on every call; the key ring hands jose keys built once.
+"""
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from jose import jwt
+import argparse
+import itertools
+import json
+import secrets
+import tempfile
+import time
+
+from app.core import KeyRing, SecurityUtils, VerifiedTokenCache
+from app.models import TokenData, UserRole
+
+
+def private_pem(algorithm: str) -> str:
+    if algorithm == "HS256":
+        return secrets.token_hex(32)
+    key = ed25519.Ed25519PrivateKey.generate() if algorithm == "EdDSA" else ec.generate_private_key(ec.SECP256R1())
+    return key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+
+
+def install_key_ring(algorithm: str, material: str) -> None:
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump({"active": "bench", "keys": [{"kid": "bench", "alg": algorithm, "private_key": material}]}, f)
+    SecurityUtils._key_ring = KeyRing(f.name, reload_seconds=3600)
+
+
+def rate(verify, tokens: list[str], seconds: float) -> float:
+    """Verifications per second, running for about `seconds`."""
+    done, started = 0, time.perf_counter()
+    tokens_cycle = itertools.cycle(tokens)
+    while (elapsed := time.perf_counter() - started) < seconds:
+        for token in itertools.islice(tokens_cycle, 256):
+            verify(token)
+        done += 256
+    return done / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=1000)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    print(f"{'algorithm':>10} {'path':>12} {'tokens/s':>12}")
+    for algorithm in ("HS256", "ES256", "EdDSA"):
+        material = private_pem(algorithm)
+        install_key_ring(algorithm, material)
+        tokens = [
+            SecurityUtils.create_access_token(TokenData(sub=str(i), role=UserRole.USER), 30).access_token
+            for i in range(args.tokens)
+        ]
+
+        if algorithm != "EdDSA":
+            claims = [jwt.get_unverified_claims(token) for token in tokens]
+            jose_tokens = [jwt.encode(c, material, algorithm=algorithm) for c in claims]
+            verifying_key = material if algorithm == "HS256" else serialization.load_pem_private_key(
+                material.encode(), password=None
+            ).public_key().public_bytes(
+                serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+            ).decode()
+            jose_rate = rate(
+                lambda t: TokenData(**jwt.decode(t, verifying_key, algorithms=[algorithm])),
+                jose_tokens, args.seconds
+            )
+            print(f"{algorithm:>10} {'python-jose':>12} {jose_rate:>12,.0f}")
+
+        for label, cache in (("no cache", VerifiedTokenCache(0, 0)), ("cache", VerifiedTokenCache(10_000, 60))):
+            SecurityUtils._verified = cache
+            print(f"{algorithm:>10} {label:>12} {rate(SecurityUtils.decode_token, tokens, args.seconds):>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
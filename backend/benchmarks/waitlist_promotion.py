@@ -0,0 +1,118 @@
+"""
+Latency benchmark for waitlist promotion on a single hot screening.
+
+Run from the backend directory against a database at the latest revision:
+
+    DATABASE_URL=... python -m benchmarks.waitlist_promotion [--waiters 1000 10000 50000] [--rounds 50]
+
+For each queue length a sold-out screening gets that many waiters (asking
+for 1-4 seats), then reservations are cancelled one by one and the time to
+cancel and promote is measured, as ReservationService does it: lock the
+screening, release the seats, hand them to the queue. The queue is read
+through a partial index of waiting entries, so the figures should not move
+with the queue length. Everything runs in one transaction that is rolled
+back, so the database is left as it was.
+"""
+from datetime import datetime, timedelta, timezone
+from sqlmodel import Session, select
+from sqlalchemy import insert, text
+import argparse
+import statistics
+import time
+
+from app.core import settings
+from app.database import Database
+from app.models import (
+    User, UserRole, Movie, Theatre, Auditorium, Seat, Screening, Reservation, ReservationSeat,
+    ReservationStatus, WaitlistEntry, WaitlistStatus
+)
+from app.services import WaitlistPromoter
+
+SEATS: int = 200
+
+
+def seed_sold_out_screening(session: Session, tag: str) -> tuple[Screening, list[Reservation]]:
+    """A screening whose seats are all booked, one seat per reservation."""
+    theatre = Theatre(name=f"Benchmark theatre {tag}")
+    session.add(theatre)
+    session.flush()
+    auditorium = Auditorium(name="Benchmark", capacity=SEATS, theatre_id=theatre.id) # type: ignore
+    movie = Movie(title="Benchmark", description="", duration_minutes=120)
+    session.add_all([auditorium, movie])
+    session.flush()
+    seats = [Seat(row_label=f"R{i // 20}", seat_number=i % 20 + 1, auditorium_id=auditorium.id) for i in range(SEATS)] # type: ignore
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    screening = Screening(
+        movie_id=movie.id, auditorium_id=auditorium.id, start_time=start, # type: ignore
+        end_time=start + timedelta(hours=2), base_price=10, available_seats=0 # type: ignore
+    )
+    buyer = User(username=f"buyer{tag}", email=f"buyer{tag}@example.com", hashed_password="x", role=UserRole.USER)
+    session.add_all([*seats, screening, buyer])
+    session.flush()
+    reservations = [
+        Reservation(
+            user_id=buyer.id, screening_id=screening.id, total_price=10, # type: ignore
+            seats=[ReservationSeat(seat_id=seat.id, price_paid=10)] # type: ignore
+        )
+        for seat in seats
+    ]
+    session.add_all(reservations)
+    session.flush()
+    return screening, reservations
+
+
+def seed_waiters(session: Session, screening_id: int, waiters: int, tag: str) -> None:
+    users = session.execute(insert(User.__table__).returning(User.__table__.c.id), [ # type: ignore
+        dict(
+            username=f"w{tag}_{i}", email=f"w{tag}_{i}@example.com", hashed_password="x", role=UserRole.USER.name,
+            is_active=True, created_at=datetime.now(timezone.utc), updated_at=datetime.now(timezone.utc),
+        )
+        for i in range(waiters)
+    ]).scalars().all()
+    now = datetime.now(timezone.utc)
+    session.execute(insert(WaitlistEntry.__table__), [ # type: ignore
+        dict(
+            screening_id=screening_id, user_id=user_id, seats_requested=i % 4 + 1, held_seat_ids=[],
+            status=WaitlistStatus.WAITING.name, created_at=now, updated_at=now,
+        )
+        for i, user_id in enumerate(users)
+    ])
+    session.execute(text("ANALYZE waitlistentry"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--waiters", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    Database.connect(settings.DATABASE_URL)
+    with Session(Database.get_engine()) as session:
+        print(f"{'waiters':>8} {'median ms':>10} {'p95 ms':>8} {'promoted':>9}")
+        for waiters in args.waiters:
+            screening, reservations = seed_sold_out_screening(session, str(waiters))
+            seed_waiters(session, screening.id, waiters, str(waiters)) # type: ignore
+
+            samples: list[float] = []
+            promoted = 0
+            for reservation in reservations[:args.rounds]:
+                started = time.perf_counter()
+                session.exec(select(Screening).where(Screening.id == screening.id).with_for_update()).one()
+                reservation.cancel()
+                screening.available_seats += 1
+                promoted += len(WaitlistPromoter.promote(session, screening))
+                session.flush()
+                samples.append(time.perf_counter() - started)
+            assert reservations[0].status == ReservationStatus.CANCELLED
+
+            samples.sort()
+            print(
+                f"{waiters:>8} {statistics.median(samples) * 1000:>10.2f} "
+                f"{samples[int(len(samples) * 0.95) - 1] * 1000:>8.2f} {promoted:>9}"
+            )
+        session.rollback()
+    Database.disconnect()
+
+
+if __name__ == "__main__":
+    main()